@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de rendimiento reproducible.
+
+Mide evaluaciones/s, generaciones/s, tiempo hasta el objetivo (OptDistance,
+cuando se conoce) y memoria pico para cada backend (serial, pool de procesos,
+MPI con distinto número de procesos y MPI híbrido, con hilos en cada esclavo)
+sobre instancias de tamaño creciente.
+Cada caso se ejecuta en un proceso independiente para que la memoria pico
+sea comparable entre casos.
+
+Con --import-budget mide el tiempo de importación (-X importtime) de los
+módulos que cargan el maestro y los esclavos al arrancar, y falla si supera
+el presupuesto o si se importa un módulo pesado que esa ruta no necesita.
+
+Uso:
+    python benchmark.py
+    python benchmark.py --sizes 17 100 --backends serial pool mpi:4
+    python benchmark.py --sizes 1000 --backends mpi:5 hybrid:2x4
+    python benchmark.py --baseline benchmark_baseline.json
+    python benchmark.py --save-baseline
+    python benchmark.py --import-budget
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+DEFAULT_SIZES = [17, 100, 1000, 5000]
+DEFAULT_BACKENDS = ["serial", "pool", "mpi:2", "mpi:4", "mpi:8", "mpi:20"]
+DEFAULT_POP_SIZE = 100
+# Generaciones por tamaño de instancia (las grandes se acortan para acotar la duración)
+DEFAULT_GENERATIONS = {17: 200, 100: 100, 1000: 20, 5000: 5}
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_TOLERANCE = 0.10
+
+RESULT_MARKER = "BENCH_RESULT "
+
+# Métricas comparadas con la línea base: nombre -> True si "más alto es mejor"
+COMPARED_METRICS = {
+    "evals_per_sec": True,
+    "gens_per_sec": True,
+    "time_to_target": False,
+    "peak_memory_kb": False,
+    "children_peak_kb": False,
+}
+
+# Presupuestos de importación por ruta de arranque: módulos propios importados,
+# tiempo acumulado máximo (ms, sin contar mpi4py) y paquetes que no deben cargarse
+IMPORT_BUDGETS = {
+    "esclavo": {
+        "modules": ["utils.logger", "models.mpi_handler"],
+        "budget_ms": 150,
+        "forbidden": ["numpy", "deap", "matplotlib", "tkinter", "mysql", "Core"],
+    },
+    "maestro": {
+        "modules": ["views.gui", "controllers.app_controller"],
+        "budget_ms": 1500,
+        "forbidden": ["deap", "mysql", "Core"],
+    },
+}
+IMPORT_REPEATS = 3
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def load_instance(num_cities):
+    """
+    Carga o genera una instancia del tamaño indicado.
+
+    La instancia de 17 ciudades es data/distancias.json (con OptDistance);
+    el resto se genera con una semilla igual al tamaño para ser reproducible.
+
+    Args:
+        num_cities: Número de ciudades
+
+    Returns:
+        Tupla (matriz, distancia_optima o None)
+    """
+    from config.config import DISTANCIAS_FILE
+    from utils.matrix_loader import create_random_matrix
+
+    if os.path.exists(DISTANCIAS_FILE):
+        with open(DISTANCIAS_FILE, 'r') as f:
+            data = json.load(f)
+        if data.get("TotalCiudades", len(data["Distancias"])) == num_cities:
+            return data["Distancias"], data.get("OptDistance")
+
+    return create_random_matrix(num_cities, seed=num_cities), None
+
+
+def parse_backend(spec):
+    """
+    Interpreta una especificación de backend.
+
+    Args:
+        spec: "serial", "pool", "pool:N", "mpi:N" o "hybrid:NxT" (N procesos
+              MPI, T hilos por esclavo; sin T, uno por CPU)
+
+    Returns:
+        Tupla (nombre_backend, procesos, hilos por esclavo o None)
+    """
+    name, _, count = spec.partition(":")
+    if name not in ("serial", "pool", "mpi", "hybrid"):
+        raise ValueError(f"Backend desconocido: {spec}")
+    if name in ("mpi", "hybrid") and not count:
+        raise ValueError("El backend MPI requiere número de procesos (ej: mpi:4, hybrid:2x4)")
+    count, _, threads = count.partition("x")
+    processes = int(count) if count else (1 if name == "serial" else os.cpu_count())
+    if name == "hybrid":
+        return name, processes, int(threads) if threads else 0
+    return name, processes, None
+
+
+def _peak_memory_kb(children=False):
+    """
+    Memoria residente pico en KB.
+
+    Args:
+        children: Si es True, el pico del mayor hijo terminado y esperado
+                  (RUSAGE_CHILDREN: no es la suma de los hijos ni incluye
+                  al proceso); si es False, el del propio proceso
+    """
+    import resource
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # macOS reporta bytes
+    return peak
+
+
+def run_case(case):
+    """
+    Ejecuta un caso de benchmark en este proceso (o en este mundo MPI).
+
+    En MPI, los esclavos entran al bucle de esclavo y solo el maestro
+    imprime el resultado.
+
+    Args:
+        case: Diccionario con size, backend, processes, pop_size, generations
+    """
+    backend = case["backend"]
+
+    handler = None
+    distributed = backend in ("mpi", "hybrid")
+    if distributed:
+        from models.mpi_handler import MPIHandler
+        handler = MPIHandler()
+        if handler.is_slave():
+            handler.run_slave_loop()
+            handler.comm.gather(_peak_memory_kb(), root=0)
+            return
+
+    from models.genetic_algorithm import GeneticAlgorithmTSP
+
+    dist_matrix, opt_distance = load_instance(case["size"])
+
+    if backend == "pool":
+        from models.pool_handler import PoolHandler
+        handler = PoolHandler(case["processes"])
+        base_map = handler.create_pool_map(dist_matrix)
+    elif distributed:
+        # Híbrido: un bloque por esclavo y generación, repartido entre sus hilos
+        base_map = handler.create_mpi_map(dist_matrix, 0 if backend == "hybrid" else 1)
+    else:
+        base_map = map
+
+    evaluations = [0]
+
+    def counting_map(func, tasks):
+        """Mapper que cuenta las evaluaciones antes de delegar."""
+        tasks = list(tasks)
+        evaluations[0] += len(tasks)
+        return base_map(func, tasks)
+
+    ga = GeneticAlgorithmTSP(
+        dist_matrix=dist_matrix,
+        pop_size=case["pop_size"],
+        num_generations=case["generations"],
+        mpi_map=counting_map
+    )
+
+    start_time = time.perf_counter()
+    time_to_target = [None]
+
+    def target_callback(generation, best, worst, avg, std_dev, timings=None):
+        """Registra el primer instante en que se alcanza la distancia óptima."""
+        if time_to_target[0] is None and opt_distance is not None and best <= opt_distance:
+            time_to_target[0] = time.perf_counter() - start_time
+
+    ga.set_callback(target_callback)
+    best_route, best_distance, total_time, stats_list = ga.run()
+    elapsed = time.perf_counter() - start_time
+
+    peak_memory = _peak_memory_kb()
+    children_peak = None
+    comm_metrics = None
+    if backend == "pool":
+        # Los trabajadores solo cuentan en RUSAGE_CHILDREN cuando han terminado
+        handler.close()
+        children_peak = _peak_memory_kb(children=True)
+    elif distributed:
+        from models.mpi_metrics import summarize_cluster
+        comm_metrics = summarize_cluster(handler.gather_metrics())
+        handler.shutdown_slaves()
+        slave_peaks = handler.comm.gather(peak_memory, root=0)
+        peak_memory = max(slave_peaks)
+
+    result = dict(case)
+    result.update({
+        "status": "ok",
+        "best_distance": best_distance,
+        "opt_distance": opt_distance,
+        "elapsed": elapsed,
+        "evaluations": evaluations[0],
+        "evals_per_sec": evaluations[0] / elapsed if elapsed > 0 else None,
+        "gens_per_sec": case["generations"] / elapsed if elapsed > 0 else None,
+        "time_to_target": time_to_target[0],
+        "peak_memory_kb": peak_memory,
+        "children_peak_kb": children_peak,
+        "phase_totals": ga.phase_totals,
+        "comm_metrics": comm_metrics,
+    })
+    if case.get("timings_dir"):
+        from utils.phase_timer import export_timings_csv
+        os.makedirs(case["timings_dir"], exist_ok=True)
+        filename = f"timings_{case['size']}_{backend}_{case['processes']}{_threads_suffix(case)}.csv"
+        export_timings_csv(stats_list, os.path.join(case["timings_dir"], filename))
+    print(RESULT_MARKER + json.dumps(result))
+    sys.stdout.flush()
+
+
+def launch_case(case, args):
+    """
+    Lanza un caso en un proceso hijo (mpirun para MPI) y recoge el resultado.
+
+    Args:
+        case: Diccionario del caso
+        args: Argumentos de línea de comandos de la suite
+
+    Returns:
+        Diccionario con el resultado (status distinto de "ok" si falla)
+    """
+    cmd = [sys.executable, os.path.abspath(__file__), "--run-case", json.dumps(case)]
+    env = None
+    if case["backend"] in ("mpi", "hybrid"):
+        if shutil.which("mpirun") is None:
+            return dict(case, status="skipped", reason="mpirun no disponible")
+        mpi_cmd = ["mpirun", "-np", str(case["processes"])]
+        if args.hostfile:
+            mpi_cmd += ["--hostfile", os.path.abspath(args.hostfile)]
+        if case["backend"] == "hybrid":
+            env = dict(os.environ, TSP_MPI_HYBRID="1", TSP_MPI_THREADS=str(case["threads"]))
+            mpi_cmd += ["--bind-to", "none", "-x", "TSP_MPI_HYBRID", "-x", "TSP_MPI_THREADS"]
+        mpi_cmd += args.mpirun_args.split()
+        cmd = mpi_cmd + cmd
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=args.timeout, cwd=BASE_DIR,
+                              env=env)
+    except subprocess.TimeoutExpired:
+        return dict(case, status="timeout")
+
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+
+    stderr_tail = proc.stderr.strip().splitlines()[-5:]
+    return dict(case, status="error", returncode=proc.returncode, reason=" | ".join(stderr_tail))
+
+
+def _git_commit():
+    """Retorna el commit actual del repositorio o None."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=BASE_DIR)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _threads_suffix(case):
+    """Sufijo "xT" de los casos híbridos con hilos explícitos."""
+    return f"x{case['threads']}" if case.get("threads") else ""
+
+
+def case_key(result):
+    """Clave que identifica un caso para compararlo con la línea base."""
+    return f"{result['size']}/{result['backend']}:{result['processes']}{_threads_suffix(result)}"
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Compara resultados con una línea base y detecta regresiones.
+
+    Args:
+        results: Lista de resultados actuales
+        baseline: Lista de resultados de la línea base
+        tolerance: Empeoramiento relativo permitido (0.10 = 10%)
+
+    Returns:
+        Lista de cadenas describiendo cada regresión
+    """
+    baseline_by_key = {case_key(r): r for r in baseline if r.get("status") == "ok"}
+    regressions = []
+
+    for result in results:
+        if result.get("status") != "ok":
+            continue
+        reference = baseline_by_key.get(case_key(result))
+        if reference is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            current, previous = result.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+            change = (current - previous) / previous
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append(f"{case_key(result)} {metric}: {previous:.4g} -> {current:.4g} "
+                                   f"({change:+.1%})")
+    return regressions
+
+
+def measure_imports(modules):
+    """
+    Importa módulos en un intérprete nuevo con -X importtime.
+
+    mpi4py se importa antes (si está instalado) y se informa aparte: su coste
+    es el de inicializar MPI, no el del código del proyecto.
+
+    Args:
+        modules: Módulos a importar, en orden
+
+    Returns:
+        Tupla (ms acumulados por módulo, ms de mpi4py, conjunto de módulos cargados)
+    """
+    code = "try:\n    import mpi4py.MPI\nexcept ImportError:\n    pass\n"
+    code += "".join(f"import {module}\n" for module in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BASE_DIR,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    timings = {}
+    mpi_ms = 0.0
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        loaded.add(name)
+        if indent:
+            continue
+        if name in modules:
+            timings[name] = cumulative_us / 1000
+        elif name == "mpi4py.MPI":
+            mpi_ms = cumulative_us / 1000
+    return timings, mpi_ms, loaded
+
+
+def check_import_budgets(repeats=IMPORT_REPEATS):
+    """
+    Comprueba los presupuestos de importación de IMPORT_BUDGETS.
+
+    Cada ruta se mide `repeats` veces y se toma la medición más rápida.
+
+    Returns:
+        Lista de descripciones de los presupuestos incumplidos
+    """
+    failures = []
+    header = f"{'ruta':<10}{'total (ms)':>12}{'presupuesto':>13}{'mpi4py (ms)':>13}  detalle"
+    print(header)
+    print("-" * len(header))
+    for path, spec in IMPORT_BUDGETS.items():
+        runs = [measure_imports(spec["modules"]) for _ in range(repeats)]
+        timings, mpi_ms, loaded = min(runs, key=lambda run: sum(run[0].values()))
+        total = sum(timings.values())
+        detail = ", ".join(f"{module}={ms:.1f}" for module, ms in timings.items())
+        print(f"{path:<10}{total:>12.1f}{spec['budget_ms']:>13}{mpi_ms:>13.1f}  {detail}")
+
+        if total > spec["budget_ms"]:
+            failures.append(f"{path}: {total:.1f} ms > {spec['budget_ms']} ms")
+        heavy = sorted({name.split(".")[0] for name in loaded} & set(spec["forbidden"]))
+        if heavy:
+            failures.append(f"{path}: importa {', '.join(heavy)} al arrancar")
+    return failures
+
+
+def print_table(results):
+    """Imprime una tabla resumen de los resultados."""
+    header = f"{'caso':<18}{'estado':<9}{'evals/s':>12}{'gens/s':>10}{'t->obj (s)':>12}{'mem (MB)':>10}{'hijo (MB)':>11}{'mejor':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if r.get("status") != "ok":
+            print(f"{case_key(r):<18}{r['status']:<9}  {r.get('reason', '')}")
+            continue
+        ttt = f"{r['time_to_target']:.3f}" if r["time_to_target"] is not None else "-"
+        child = f"{r['children_peak_kb'] / 1024:.1f}" if r.get("children_peak_kb") else "-"
+        print(f"{case_key(r):<18}{'ok':<9}{r['evals_per_sec']:>12.1f}{r['gens_per_sec']:>10.2f}"
+              f"{ttt:>12}{r['peak_memory_kb'] / 1024:>10.1f}{child:>11}{r['best_distance']:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento del AG TSP")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Tamaños de instancia (número de ciudades)")
+    parser.add_argument("--backends", nargs="+", default=DEFAULT_BACKENDS,
+                        help="Backends: serial, pool[:N], mpi:N, hybrid:N[xT]")
+    parser.add_argument("--pop-size", type=int, default=DEFAULT_POP_SIZE)
+    parser.add_argument("--generations", type=int, default=None,
+                        help="Generaciones para todos los tamaños (por defecto depende del tamaño)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", default=None, help="Línea base con la que comparar")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Guardar los resultados como línea base ({DEFAULT_BASELINE})")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Empeoramiento relativo tolerado antes de marcar regresión")
+    parser.add_argument("--hostfile", default=None, help="Hostfile para los casos MPI")
+    parser.add_argument("--mpirun-args", default="", help="Argumentos extra para mpirun (ej: --oversubscribe)")
+    parser.add_argument("--export-timings", default=None, metavar="DIR",
+                        help="Exportar tiempos por fase de cada generación como CSV en DIR")
+    parser.add_argument("--timeout", type=float, default=3600, help="Tiempo máximo por caso (s)")
+    parser.add_argument("--import-budget", action="store_true",
+                        help="Solo comprobar los presupuestos de tiempo de importación")
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        run_case(json.loads(args.run_case))
+        return 0
+
+    if args.import_budget:
+        failures = check_import_budgets()
+        if failures:
+            print(f"\n[BENCH] ✗ {len(failures)} presupuestos de importación incumplidos:")
+            for line in failures:
+                print(f"  - {line}")
+            return 1
+        print("\n[BENCH] ✓ Importaciones dentro del presupuesto")
+        return 0
+
+    results = []
+    for size in args.sizes:
+        generations = args.generations or DEFAULT_GENERATIONS.get(size, 10)
+        for spec in args.backends:
+            backend, processes, threads = parse_backend(spec)
+            case = {"size": size, "backend": backend, "processes": processes,
+                    "pop_size": args.pop_size, "generations": generations}
+            if threads is not None:
+                case["threads"] = threads
+            if args.export_timings:
+                case["timings_dir"] = os.path.abspath(args.export_timings)
+            print(f"[BENCH] Ejecutando {case_key(case)} ({generations} generaciones)...")
+            sys.stdout.flush()
+            results.append(launch_case(case, args))
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Resultados guardados en {args.output}\n")
+    print_table(results)
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, DEFAULT_BASELINE)
+        print(f"\n[BENCH] Línea base actualizada: {DEFAULT_BASELINE}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n[BENCH] ✗ {len(regressions)} regresiones (tolerancia {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n[BENCH] ✓ Sin regresiones respecto a {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,21 +11,80 @@ DB_CONFIG = {
     "database": os.getenv("DB_NAME", "base_de_datos_replicacion"),
     "port": int(os.getenv("DB_PORT", "3306"))
 }
+DB_BACKEND = os.getenv("DB_BACKEND", "auto")  # auto | mysql | sqlite | none
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "2"))
 
 # Configuración de MPI
 MPI_ENABLED = True  # Se detectará automáticamente si mpi4py está disponible
+MPI_TASK_TIMEOUT = float(os.getenv("TSP_MPI_TASK_TIMEOUT", "30"))  # Segundos sin respuesta antes de descartar un esclavo (0 = sin límite)
+MPI_POLL_INTERVAL = float(os.getenv("TSP_MPI_POLL", "0.001"))  # Pausa máxima entre sondeos (Iprobe) del maestro
+MPI_SLAVE_MAX_ERRORS = int(os.getenv("TSP_MPI_SLAVE_ERRORS", "5"))  # Errores seguidos tras los que un esclavo sale de su bucle
+MPI_HYBRID = os.getenv("TSP_MPI_HYBRID", "0") == "1"  # Un rank esclavo por nodo que reparte cada bloque entre hilos
+MPI_WORKER_THREADS = int(os.getenv("TSP_MPI_THREADS", "0"))  # Hilos por esclavo en modo híbrido (0 = uno por CPU)
 
 # Rutas de archivos
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 DISTANCIAS_FILE = os.path.join(DATA_DIR, "distancias.json")
+PROFILES_DIR = os.path.join(BASE_DIR, "profiles")
+RUN_CACHE_DIR = os.path.join(DATA_DIR, "run_cache")
+STATS_STREAM_DIR = os.path.join(DATA_DIR, "stats")
+SQLITE_DB_FILE = os.getenv("SQLITE_DB_FILE", os.path.join(DATA_DIR, "resultados.db"))
 
 # Configuración por defecto del algoritmo
 DEFAULT_POP_SIZE = 50
 DEFAULT_CROSSOVER_RATE = 0.8
 DEFAULT_MUTATION_RATE = 0.1
 DEFAULT_GENERATIONS = 100
+DEFAULT_SEED = 42
+CROSSOVER_OPERATOR = os.getenv("TSP_CROSSOVER", "ox")  # Recombinación: ox | erx | eax
+ADAPTIVE_OPERATORS = os.getenv("TSP_ADAPTIVE", "0") == "1"  # Operadores, tasas y torneo adaptativos
+REPLACEMENT_STRATEGY = os.getenv("TSP_REPLACEMENT", "generational")  # Reemplazo: generational | elitist | plus | comma | age
+REPLACEMENT_ELITES = int(os.getenv("TSP_ELITES", "2"))  # Padres conservados con reemplazo elitista
+REPLACEMENT_LAMBDA_RATIO = float(os.getenv("TSP_LAMBDA_RATIO", "2"))  # Hijos por padre (λ/μ) en plus, comma y age
+REPLACEMENT_MAX_AGE = int(os.getenv("TSP_MAX_AGE", "5"))  # Generaciones máximas de un individuo con reemplazo por edad
 
+# Versión del motor de resolución: cambiarla invalida la caché de resultados
+ENGINE_VERSION = "1"
 
+# Búsqueda local iterada (motor alternativo al algoritmo genético)
+ILS_KICKS_PER_ROUND = int(os.getenv("TSP_ILS_KICKS", "20"))  # Perturbaciones double-bridge por cadena y ronda
+ILS_NEIGHBORS = int(os.getenv("TSP_ILS_NEIGHBORS", "10"))  # Vecinos más cercanos revisados por ciudad
+ILS_CHAINS = int(os.getenv("TSP_ILS_CHAINS", "0"))  # Cadenas en modo local (0 = una por CPU)
 
+# Descomposición espacial (instancias muy grandes): clústeres resueltos por separado y unidos
+DECOMPOSITION_CLUSTER_SIZE = int(os.getenv("TSP_DECOMP_CLUSTER", "200"))  # Ciudades objetivo por clúster
+DECOMPOSITION_BOUNDARY_WINDOW = int(os.getenv("TSP_DECOMP_WINDOW", "25"))  # Ciudades a cada lado de una frontera en la mejora final
 
+# Autoajuste: elegir serie, pool o MPI, esclavos y rutas por mensaje con micro-benchmarks al inicio
+AUTOTUNE_ENABLED = os.getenv("TSP_AUTOTUNE", "0") == "1"
+AUTOTUNE_FILE = os.getenv("TSP_AUTOTUNE_FILE", os.path.join(DATA_DIR, "autotune.json"))  # Decisiones por instancia y cluster
+AUTOTUNE_REPEATS = int(os.getenv("TSP_AUTOTUNE_REPEATS", "5"))  # Repeticiones de cada medición
+
+# Caché de resultados (ejecuciones idénticas no se recalculan)
+RUN_CACHE_ENABLED = os.getenv("TSP_RUN_CACHE", "1") != "0"
+RUN_CACHE_MAX_ENTRIES = int(os.getenv("TSP_RUN_CACHE_MAX", "200"))
+
+# Arranque en caliente: sembrar la población con rutas guardadas de la misma instancia
+WARM_START_TOP_K = int(os.getenv("TSP_WARM_START_K", "5"))  # Mejores rutas históricas a inyectar
+WARM_START_WITH_POPULATION = os.getenv("TSP_WARM_START_POPULATION", "1") != "0"  # Añadir la última población final
+
+# Instrumentación del bucle generacional
+PHASE_TIMING_ENABLED = os.getenv("TSP_PHASE_TIMING", "1") != "0"  # Tiempos por fase (perf_counter_ns)
+MPI_METRICS_ENABLED = os.getenv("TSP_MPI_METRICS", "1") != "0"  # Mensajes, bytes y latencias por rank
+MPI_METRICS_GATHER_EVERY = int(os.getenv("TSP_MPI_METRICS_EVERY", "0"))  # Recoger cada N generaciones (0 = solo al final)
+PROFILING_ENABLED = os.getenv("TSP_PROFILE", "0") == "1"  # cProfile en todos los ranks (informe combinado)
+MEMORY_PROFILING_ENABLED = os.getenv("TSP_MEMORY_PROFILE", "0") == "1"  # tracemalloc y RSS por generación en todos los ranks
+MEMORY_TOP_SITES = int(os.getenv("TSP_MEMORY_TOP", "15"))  # Puntos de reserva por rank en el informe
+MEMORY_TRACE_FRAMES = int(os.getenv("TSP_MEMORY_FRAMES", "1"))  # Marcos de pila por reserva de tracemalloc
+
+# Estadísticas por generación en disco (archivo columnar en STATS_STREAM_DIR, memoria constante)
+STATS_STREAM_ENABLED = os.getenv("TSP_STATS_STREAM", "0") == "1"
+STATS_STREAM_BLOCK = int(os.getenv("TSP_STATS_STREAM_BLOCK", "1024"))  # Registros por bloque escrito
+STATS_MAX_POINTS = int(os.getenv("TSP_STATS_MAX_POINTS", "2000"))  # Puntos máximos en la gráfica y en el resultado
+
+# Exportador de métricas en vivo (Prometheus por HTTP local y/o instantáneas JSON)
+METRICS_PORT = int(os.getenv("TSP_METRICS_PORT", "0"))  # Puerto de /metrics (0 = sin servidor)
+METRICS_HOST = os.getenv("TSP_METRICS_HOST", "127.0.0.1")
+METRICS_SNAPSHOT_FILE = os.getenv("TSP_METRICS_FILE") or None  # Archivo JSON reescrito periódicamente
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("TSP_METRICS_INTERVAL", "5"))  # Segundos entre instantáneas
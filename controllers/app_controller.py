@@ -2,19 +2,36 @@
 Controlador: App Controller
 Orquesta la comunicación entre modelos y vistas.
 """
+import bisect
 import sys
 import os
 import threading
+import time
 
 # Agregar ruta para importar desde raíz
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
-from models.genetic_algorithm import GeneticAlgorithmTSP
 from models.mpi_handler import MPIHandler
 from models.database import DatabaseManager
-from utils.matrix_loader import MatrixLoader, create_random_matrix
+from models.mpi_metrics import summarize_cluster, format_cluster_metrics
+from models.run_cache import RunCache
+from models.job_scheduler import JobScheduler
+from utils.matrix_loader import MatrixLoader, create_random_matrix, matrix_hash
 from utils.mpi_config import MPIConfig
-from config.config import DB_CONFIG, DEFAULT_POP_SIZE, DEFAULT_CROSSOVER_RATE, DEFAULT_MUTATION_RATE, DEFAULT_GENERATIONS
+from utils.metrics_exporter import create_metrics_exporter
+from utils.memory_profiler import create_memory_tracker
+from utils.logger import get_logger
+from config.config import (DB_CONFIG, DEFAULT_POP_SIZE, DEFAULT_CROSSOVER_RATE, DEFAULT_MUTATION_RATE,
+                           DEFAULT_GENERATIONS, PHASE_TIMING_ENABLED, MPI_METRICS_GATHER_EVERY,
+                           PROFILING_ENABLED, MEMORY_PROFILING_ENABLED, PROFILES_DIR, DEFAULT_SEED, RUN_CACHE_ENABLED,
+                           WARM_START_TOP_K, WARM_START_WITH_POPULATION, ILS_KICKS_PER_ROUND, ILS_CHAINS,
+                           CROSSOVER_OPERATOR, ADAPTIVE_OPERATORS, STATS_STREAM_ENABLED, STATS_STREAM_DIR,
+                           AUTOTUNE_ENABLED, DECOMPOSITION_CLUSTER_SIZE, MPI_HYBRID, REPLACEMENT_STRATEGY,
+                           REPLACEMENT_ELITES, REPLACEMENT_LAMBDA_RATIO, REPLACEMENT_MAX_AGE, ILS_NEIGHBORS,
+                           DECOMPOSITION_BOUNDARY_WINDOW)
+
+
+logger = get_logger("controller")
 
 
 class AppController:
@@ -30,14 +47,11 @@ class AppController:
         self.view = view
         self.dist_matrix = None
         self.mpi_handler = MPIHandler()
-        self.db_manager = None
         
-        # Inicializar base de datos si está disponible
-        try:
-            self.db_manager = DatabaseManager(DB_CONFIG)
-        except Exception as e:
-            print(f"[ADVERTENCIA] No se pudo inicializar la base de datos: {e}")
-            self.db_manager = None
+        # La base de datos se inicializa en el primer uso (ver db_manager)
+        self._db_manager = None
+        self._db_initialized = False
+        self._db_lock = threading.Lock()
         
         # Actualizar información del cluster
         self._update_cluster_info()
@@ -48,9 +62,55 @@ class AppController:
         # Configuración de MPI
         self.mpi_config = MPIConfig()
         self.current_hostfile = None
+        
+        # Caché de resultados de ejecuciones idénticas
+        self.run_cache = RunCache() if RUN_CACHE_ENABLED else None
+        
+        # Métricas en vivo (TSP_METRICS_PORT / TSP_METRICS_FILE)
+        self.metrics = create_metrics_exporter()
+        
+        # Cola de trabajos concurrentes; el cerrojo evita que un lote y una
+        # ejecución normal usen el cluster a la vez
+        self.cluster_lock = threading.Lock()
+        self.scheduler = JobScheduler(self.mpi_handler, lock=self.cluster_lock,
+                                      on_progress=self._on_job_progress, on_result=self._on_job_result)
     
-    def _update_cluster_info(self):
-        """Actualiza la información del cluster en la vista."""
+    @property
+    def db_manager(self):
+        """
+        Gestor de base de datos, creado en el primer uso.
+        
+        Importar Core.db y el conector de MySQL es costoso; así no retrasa la
+        aparición de la ventana.
+        
+        Returns:
+            DatabaseManager o None si no se pudo inicializar
+        """
+        with self._db_lock:
+            if not self._db_initialized:
+                self._db_initialized = True
+                try:
+                    self._db_manager = DatabaseManager(DB_CONFIG)
+                except Exception as e:
+                    logger.warning("⚠ No se pudo inicializar la base de datos: %s", e)
+        return self._db_manager
+    
+    def shutdown(self):
+        """Completa las escrituras pendientes en BD y libera a los esclavos MPI."""
+        if self._db_manager:
+            self._db_manager.close()
+        self.metrics.close()
+        if self.mpi_handler.is_available and self.mpi_handler.get_size() > 1:
+            with self.cluster_lock:  # Esperar al lote de trabajos en curso
+                self.mpi_handler.shutdown_slaves()
+    
+    def _update_cluster_info(self, metrics_summary=None):
+        """
+        Actualiza la información del cluster en la vista.
+        
+        Args:
+            metrics_summary: Resumen de métricas MPI de la última ejecución (opcional)
+        """
         if self.mpi_handler.is_available:
             if self.mpi_handler.is_master():
                 info = f"Modo: Cluster MPI\nNodo: Maestro (Rank {self.mpi_handler.get_rank()})\nProcesos: {self.mpi_handler.get_size()}\nEsclavos: {self.mpi_handler.get_size() - 1}"
@@ -59,6 +119,9 @@ class AppController:
         else:
             info = "Modo: Local\nProcesos: 1"
         
+        if metrics_summary:
+            info += "\n\n" + format_cluster_metrics(metrics_summary)
+        
         self.view.update_cluster_info(info)
     
     def configure_cluster(self, num_nodes, cores_per_node, use_localhost=True):
@@ -98,7 +161,7 @@ class AppController:
             
             return hostfile_path
         except Exception as e:
-            print(f"[ERROR] Error configurando cluster: {e}")
+            logger.error("✗ Error configurando cluster: %s", e)
             return None
     
     def load_default_matrix(self):
@@ -107,9 +170,9 @@ class AppController:
         if matrix:
             self.dist_matrix = matrix
             self.view.num_cities_var.set(str(num_cities))
-            print(f"[INFO] Matriz cargada: {num_cities} ciudades")
+            logger.info("Matriz cargada: %d ciudades", num_cities)
         else:
-            print("[ADVERTENCIA] No se pudo cargar la matriz por defecto")
+            logger.warning("⚠ No se pudo cargar la matriz por defecto")
     
     def load_matrix(self, filepath):
         """
@@ -123,7 +186,7 @@ class AppController:
             if matrix:
                 self.dist_matrix = matrix
                 self.view.num_cities_var.set(str(num_cities))
-                print(f"[INFO] Matriz cargada desde JSON: {num_cities} ciudades")
+                logger.info("Matriz cargada desde JSON: %d ciudades", num_cities)
             else:
                 self.view.show_error("Error cargando matriz desde JSON")
         else:
@@ -131,17 +194,262 @@ class AppController:
             if matrix:
                 self.dist_matrix = matrix
                 self.view.num_cities_var.set(str(len(matrix)))
-                print(f"[INFO] Matriz cargada desde archivo: {len(matrix)} ciudades")
+                logger.info("Matriz cargada desde archivo: %d ciudades", len(matrix))
             else:
                 self.view.show_error("Error cargando matriz desde archivo")
     
+    def _write_profile_report(self, profiler, use_mpi):
+        """
+        Detiene el perfilado, recoge los perfiles de los esclavos y escribe el informe.
+        
+        Args:
+            profiler: cProfile.Profile activo en el hilo del algoritmo
+            use_mpi: Si True, también se recogen los perfiles de los esclavos
+        """
+        from utils.profiling import RankProfile, write_cluster_report
+        
+        profiler.disable()
+        profiles = [RankProfile.from_profiler(profiler, self.mpi_handler.get_rank(), self.mpi_handler.host)]
+        if use_mpi:
+            profiles += self.mpi_handler.collect_profiles()
+        
+        prof_path, txt_path = write_cluster_report(profiles, PROFILES_DIR)
+        logger.info("Perfil del cluster (%d ranks) guardado en %s y %s", len(profiles), txt_path, prof_path)
+    
+    def _write_memory_report(self, report, use_mpi):
+        """
+        Recoge los informes de memoria de los esclavos y escribe el informe del cluster.
+        
+        Args:
+            report: MemoryReport del maestro
+            use_mpi: Si True, también se recogen los informes de los esclavos
+            
+        Returns:
+            Lista de resúmenes por rank (ver MemoryReport.summary)
+        """
+        from utils.memory_profiler import write_memory_report
+        
+        reports = [report]
+        if use_mpi:
+            reports += self.mpi_handler.collect_memory_reports()
+        
+        txt_path, csv_path = write_memory_report(reports, PROFILES_DIR)
+        summaries = [r.summary() for r in sorted(reports, key=lambda r: r.rank)]
+        peaks = ", ".join(f"{s['rank']}={s['rss_peak'] / (1024 * 1024):.1f}MB" for s in summaries)
+        logger.info("Pico de memoria residente por rank: %s", peaks)
+        logger.info("Informe de memoria (%d ranks) guardado en %s y %s", len(reports), txt_path, csv_path)
+        return summaries
+    
+    def _show_cached_result(self, cached, num_generations):
+        """
+        Muestra en la vista un resultado recuperado de la caché.
+        
+        Args:
+            cached: Entrada de RunCache (best_route, best_distance, total_time, stats)
+            num_generations: Total de generaciones de la ejecución
+        """
+        logger.info("Resultado recuperado de la caché (mejor distancia: %.2f). "
+                    "Marque 'Forzar recálculo' para ejecutar de nuevo.", cached['best_distance'])
+        for entry in cached['stats']:
+            self.view.post_progress(entry['generation'], entry['best'], entry['worst'], entry['avg'],
+                                    entry['std'], num_generations, entry.get('timings'))
+        self.view.root.after(0, self.view.show_final_results,
+                             cached['best_route'], cached['best_distance'], cached['total_time'])
+    
+    def enqueue_job(self, params):
+        """
+        Encola una ejecución en el planificador de trabajos concurrentes.
+        
+        Args:
+            params: Diccionario con parámetros del algoritmo (como en execute_algorithm)
+        """
+        if self.dist_matrix is None:
+            self.dist_matrix = create_random_matrix(params.get('num_cities', 17))
+        job = {key: params[key] for key in ('pop_size', 'crossover_rate', 'mutation_rate', 'generations', 'seed',
+                                            'engine', 'crossover_operator', 'adaptive', 'replacement',
+                                            'elites', 'lambda_ratio', 'max_age') if key in params}
+        job['dist_matrix'] = self.dist_matrix
+        job_id = self.scheduler.submit(job)
+        self.view.add_job(job_id, len(self.dist_matrix))
+        logger.info("Trabajo %s encolado (%d en cola)", job_id, self.scheduler.pending())
+        self.scheduler.start()
+    
+    def _on_job_progress(self, job_id, generation, best, num_generations):
+        """Progreso de un trabajo del planificador (hilo del planificador)."""
+        self.metrics.observe_job(job_id, generation, best, num_generations)
+        self.view.root.after(0, self.view.update_job, job_id, generation, num_generations, best)
+    
+    def _on_job_result(self, job, result):
+        """Resultado de un trabajo del planificador: se guarda en BD y se muestra."""
+        self.metrics.observe_job_result(job, result)
+        if 'error' not in result and self.db_manager and self.db_manager.is_available():
+            execution_params = {
+                'pop_size': job.get('pop_size', DEFAULT_POP_SIZE),
+                'crossover_rate': job.get('crossover_rate', DEFAULT_CROSSOVER_RATE),
+                'mutation_rate': job.get('mutation_rate', DEFAULT_MUTATION_RATE),
+                'num_generations': job.get('generations', DEFAULT_GENERATIONS),
+                'num_cities': len(job['dist_matrix']),
+                'seed': job.get('seed', DEFAULT_SEED),
+                'engine': job.get('engine', 'ga'),
+                'job_id': job['job_id'],
+                'ranks': result['ranks']
+            }
+            self.db_manager.save_execution(result['best_route'], result['best_distance'], execution_params,
+                                           result['stats'], instance_hash=matrix_hash(job['dist_matrix']))
+        self.view.root.after(0, self.view.finish_job, job['job_id'], result)
+    
     def execute_algorithm(self, params):
         """
         Ejecuta el algoritmo genético con los parámetros dados.
         
+        Espera a que termine el lote de trabajos en curso, si lo hay.
+        
         Args:
             params: Diccionario con parámetros del algoritmo
         """
+        with self.cluster_lock:
+            self._execute_algorithm(params)
+    
+    @staticmethod
+    def result_params(params, chains=1):
+        """
+        Parámetros que determinan el resultado de una ejecución (clave de caché y registro en BD).
+        
+        Args:
+            params: Parámetros de execute_algorithm
+            chains: Cadenas de la búsqueda local iterada (ranks MPI o procesos locales)
+            
+        Returns:
+            Diccionario con los parámetros del motor elegido en params['engine']
+        """
+        engine = params.get('engine', 'ga')
+        num_generations = params.get('generations', DEFAULT_GENERATIONS)
+        if engine == 'ils':
+            return {
+                'engine': engine,
+                'kicks_per_round': ILS_KICKS_PER_ROUND,
+                'chains': chains,
+                'neighbors': params.get('neighbors', ILS_NEIGHBORS),
+                'num_generations': num_generations
+            }
+        if engine == 'decomp':
+            return {
+                'engine': engine,
+                'pop_size': params.get('pop_size', DEFAULT_POP_SIZE),
+                'num_generations': num_generations,
+                'cluster_size': params.get('cluster_size', DECOMPOSITION_CLUSTER_SIZE),
+                'crossover_operator': params.get('crossover_operator', CROSSOVER_OPERATOR),
+                'neighbors': params.get('neighbors', ILS_NEIGHBORS),
+                'boundary_window': params.get('boundary_window', DECOMPOSITION_BOUNDARY_WINDOW)
+            }
+        return {
+            'pop_size': params.get('pop_size', DEFAULT_POP_SIZE),
+            'crossover_rate': params.get('crossover_rate', DEFAULT_CROSSOVER_RATE),
+            'mutation_rate': params.get('mutation_rate', DEFAULT_MUTATION_RATE),
+            'num_generations': num_generations,
+            'crossover_operator': params.get('crossover_operator', CROSSOVER_OPERATOR),
+            'adaptive': params.get('adaptive', ADAPTIVE_OPERATORS),
+            'replacement': params.get('replacement', REPLACEMENT_STRATEGY),
+            'elites': params.get('elites', REPLACEMENT_ELITES),
+            'lambda_ratio': params.get('lambda_ratio', REPLACEMENT_LAMBDA_RATIO),
+            'max_age': params.get('max_age', REPLACEMENT_MAX_AGE)
+        }
+    
+    def _create_engine(self, params, mpi_map, use_mpi, initial_individuals):
+        """
+        Crea el motor de resolución elegido en params['engine'].
+        
+        Args:
+            params: Parámetros de execute_algorithm
+            mpi_map: Mapper de evaluación (MPI o pool) del algoritmo genético (o None)
+            use_mpi: Si hay esclavos MPI disponibles
+            initial_individuals: Rutas del arranque en caliente (o None)
+            
+        Returns:
+            GeneticAlgorithmTSP, IteratedLocalSearchTSP o DecompositionTSP (mismo contrato de run y callback)
+        """
+        num_generations = params.get('generations', DEFAULT_GENERATIONS)
+        seed = params.get('seed', DEFAULT_SEED)
+        
+        if params.get('engine') == 'ils':
+            from models.local_search import IteratedLocalSearchTSP
+            ils_params = {
+                'num_generations': num_generations,
+                'kicks_per_round': ILS_KICKS_PER_ROUND,
+                'seed': seed,
+                'initial_individuals': initial_individuals,
+                'neighbors': params.get('neighbors', ILS_NEIGHBORS)
+            }
+            if use_mpi:
+                # Una cadena por rank: los esclavos salen de su bucle hasta el final de la búsqueda
+                self.mpi_handler.start_local_search(dict(ils_params, dist_matrix=self.dist_matrix))
+                return IteratedLocalSearchTSP(self.dist_matrix, comm=self.mpi_handler.comm, **ils_params)
+            chains = ILS_CHAINS or os.cpu_count() or 1
+            return IteratedLocalSearchTSP(self.dist_matrix, chains=chains, processes=chains, **ils_params)
+        
+        if params.get('engine') == 'decomp':
+            # Un subproblema por clúster: repartidos entre los esclavos o en un pool local
+            from models.decomposition import DecompositionTSP
+            return DecompositionTSP(
+                dist_matrix=self.dist_matrix,
+                pop_size=params.get('pop_size', DEFAULT_POP_SIZE),
+                num_generations=num_generations,
+                cluster_size=params.get('cluster_size', DECOMPOSITION_CLUSTER_SIZE),
+                crossover_operator=params.get('crossover_operator', CROSSOVER_OPERATOR),
+                seed=seed,
+                mpi_handler=self.mpi_handler if use_mpi else None,
+                processes=os.cpu_count() or 1,
+                neighbors=params.get('neighbors', ILS_NEIGHBORS),
+                boundary_window=params.get('boundary_window', DECOMPOSITION_BOUNDARY_WINDOW)
+            )
+        
+        # Estadísticas por generación en disco (ejecuciones largas con memoria constante)
+        stats_file = None
+        if params.get('stats_stream', STATS_STREAM_ENABLED):
+            stats_file = os.path.join(STATS_STREAM_DIR, f"run-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.tspstats")
+            logger.info("Estadísticas por generación en %s", stats_file)
+        
+        from models.genetic_algorithm import GeneticAlgorithmTSP
+        return GeneticAlgorithmTSP(
+            dist_matrix=self.dist_matrix,
+            pop_size=params.get('pop_size', DEFAULT_POP_SIZE),
+            crossover_rate=params.get('crossover_rate', DEFAULT_CROSSOVER_RATE),
+            mutation_rate=params.get('mutation_rate', DEFAULT_MUTATION_RATE),
+            num_generations=num_generations,
+            mpi_map=mpi_map,
+            phase_timing=params.get('phase_timing', PHASE_TIMING_ENABLED),
+            seed=seed,
+            initial_individuals=initial_individuals,
+            crossover_operator=params.get('crossover_operator', CROSSOVER_OPERATOR),
+            adaptive=params.get('adaptive', ADAPTIVE_OPERATORS),
+            stats_file=stats_file,
+            replacement=params.get('replacement', REPLACEMENT_STRATEGY),
+            elites=params.get('elites', REPLACEMENT_ELITES),
+            lambda_ratio=params.get('lambda_ratio', REPLACEMENT_LAMBDA_RATIO),
+            max_age=params.get('max_age', REPLACEMENT_MAX_AGE)
+        )
+    
+    @staticmethod
+    def _attach_comm_snapshots(stats, comm_snapshots):
+        """
+        Añade a las estadísticas las métricas MPI recogidas durante la ejecución.
+        
+        Con estadísticas en disco cada registro resume un grupo de generaciones
+        (ver StatsStream.downsample): la métrica de una generación va al registro
+        del grupo que la contiene y, si hay varias, queda la última (acumulada).
+        
+        Args:
+            stats: Estadísticas retornadas por run (ordenadas por generación)
+            comm_snapshots: Diccionario generación -> resumen de summarize_cluster
+        """
+        generations = [entry['generation'] for entry in stats]
+        for generation in sorted(comm_snapshots):
+            index = bisect.bisect_left(generations, generation)
+            if index < len(stats):
+                stats[index]['comm'] = comm_snapshots[generation]
+    
+    def _execute_algorithm(self, params):
+        """Cuerpo de execute_algorithm (con el cluster reservado)."""
         try:
             # Obtener configuración de cluster (solo informativo, no generar hostfile)
             num_nodes = params.get('num_nodes', 1)
@@ -155,61 +463,178 @@ class AppController:
                 # Crear matriz aleatoria si no hay una cargada
                 num_cities = params.get('num_cities', 17)
                 self.dist_matrix = create_random_matrix(num_cities)
-                print(f"[INFO] Matriz aleatoria creada: {num_cities} ciudades")
+                logger.info("Matriz aleatoria creada: %d ciudades", num_cities)
             
             # Obtener parámetros
             pop_size = params.get('pop_size', DEFAULT_POP_SIZE)
-            crossover_rate = params.get('crossover_rate', DEFAULT_CROSSOVER_RATE)
-            mutation_rate = params.get('mutation_rate', DEFAULT_MUTATION_RATE)
             num_generations = params.get('generations', DEFAULT_GENERATIONS)
+            seed = params.get('seed', DEFAULT_SEED)
+            engine = params.get('engine', 'ga')
+            use_mpi = self.mpi_handler.is_available and bool(self.mpi_handler.live_slaves())
+            if use_mpi and engine == 'ils' and self.mpi_handler.failed_ranks:
+                # Las cadenas se sincronizan con operaciones colectivas: necesitan todos los ranks
+                logger.warning("⚠ Hay esclavos descartados: la búsqueda local se ejecuta en modo local")
+                use_mpi = False
             
-            # Crear mapper MPI si está disponible
-            mpi_map = None
-            if self.mpi_handler.is_available and self.mpi_handler.get_size() > 1:
-                mpi_map = self.mpi_handler.create_mpi_map(self.dist_matrix)
-                print(f"[INFO] Usando MPI con {self.mpi_handler.get_size()} procesos")
-            else:
-                print("[INFO] Ejecutando en modo secuencial")
-                if num_nodes > 1 or cores_per_node > 1:
-                    print("[ADVERTENCIA] La configuración de cluster se generó, pero la aplicación")
-                    print("              está ejecutándose en modo local. Para usar el cluster,")
-                    print("              reinicie la aplicación con mpirun usando el hostfile generado.")
-            
-            # Crear algoritmo genético
-            ga = GeneticAlgorithmTSP(
-                dist_matrix=self.dist_matrix,
-                pop_size=pop_size,
-                crossover_rate=crossover_rate,
-                mutation_rate=mutation_rate,
-                num_generations=num_generations,
-                mpi_map=mpi_map
-            )
+            # Parámetros que determinan el resultado (clave de caché y registro en BD)
+            chains = self.mpi_handler.get_size() if use_mpi else (ILS_CHAINS or os.cpu_count() or 1)
+            result_params = self.result_params(params, chains)
+            
+            instance_hash = matrix_hash(self.dist_matrix)
+            db_available = self.db_manager is not None and self.db_manager.is_available()
+            
+            # Arranque en caliente: sembrar con las mejores rutas guardadas de esta instancia
+            initial_individuals = None
+            if params.get('warm_start') and db_available:
+                initial_individuals = self.db_manager.get_warm_start_routes(
+                    instance_hash, WARM_START_TOP_K, WARM_START_WITH_POPULATION)
+                logger.info("Arranque en caliente: %d rutas guardadas para esta instancia", len(initial_individuals))
+            
+            # Ejecución idéntica ya calculada: devolver el resultado guardado
+            # (no aplica al arranque en caliente: el resultado depende del historial)
+            cache_key = None
+            if self.run_cache is not None and not initial_individuals:
+                cache_key = RunCache.make_key(instance_hash, result_params, seed)
+                if not params.get('force_recompute'):
+                    cached = self.run_cache.get(cache_key)
+                    self.metrics.observe_cache(self.run_cache)
+                    if cached is not None:
+                        self._show_cached_result(cached, num_generations)
+                        return
             
-            # Configurar callback para actualizar la vista
-            def update_callback(generation, best, worst, avg, std_dev):
-                """Callback para actualizar la vista después de cada generación."""
-                self.view.root.after(0, self.view.update_progress, 
-                                   generation, best, worst, avg, std_dev, num_generations)
+            # Perfilado de memoria: tracemalloc y RSS por generación en todos los ranks
+            # (antes del envío de la matriz para que su copia en cada esclavo cuente)
+            memory = create_memory_tracker(params.get('memory_profile', MEMORY_PROFILING_ENABLED))
+            profiler = None
+            pool_handler = None
+            memory_summary = None
+            memory.start()
+            # Los esclavos salen del modo de perfilado y de memoria aunque la ejecución falle
+            try:
+                if use_mpi and memory.enabled:
+                    self.mpi_handler.start_memory_tracking()
+                
+                # Autoajuste: serie, pool o MPI, esclavos y rutas por mensaje según micro-benchmarks (o la caché)
+                tuning = None
+                if engine == 'ga' and params.get('autotune', AUTOTUNE_ENABLED):
+                    from models.autotuner import Autotuner, format_decision
+                    tuning = Autotuner(self.dist_matrix, pop_size, num_generations,
+                                       self.mpi_handler if use_mpi else None).decide()
+                    logger.info("Autoajuste: %s", format_decision(tuning))
+                
+                # Crear mapper MPI si está disponible (la búsqueda local reparte cadenas y la
+                # descomposición subproblemas, no evaluaciones)
+                mpi_map = None
+                eval_map = None
+                if tuning is not None and tuning['backend'] == 'pool':
+                    from models.pool_handler import PoolHandler
+                    pool_handler = PoolHandler(tuning['processes'])
+                    eval_map = pool_handler.create_pool_map(self.dist_matrix, tuning['chunk_size'])
+                    logger.info("Evaluando en un pool de %d procesos", tuning['processes'])
+                elif tuning is not None and tuning['backend'] == 'serial':
+                    logger.info("Ejecutando en modo secuencial")
+                elif use_mpi:
+                    if engine == 'ga':
+                        if tuning is not None:
+                            mpi_map = self.mpi_handler.create_mpi_map(self.dist_matrix, tuning['chunk_size'],
+                                                                      tuning['workers'])
+                        else:
+                            # Modo híbrido: un bloque por esclavo (nodo) y generación, repartido entre sus hilos
+                            mpi_map = self.mpi_handler.create_mpi_map(self.dist_matrix, 0 if MPI_HYBRID else 1)
+                        eval_map = mpi_map
+                    logger.info("Usando MPI con %d procesos", self.mpi_handler.get_size())
+                else:
+                    logger.info("Ejecutando en modo secuencial")
+                    if num_nodes > 1 or cores_per_node > 1:
+                        logger.warning("⚠ La configuración de cluster se generó, pero la aplicación está "
+                                       "ejecutándose en modo local. Para usar el cluster, reinicie la "
+                                       "aplicación con mpirun usando el hostfile generado.")
+                
+                # Modo de perfilado: cProfile en este hilo y en el bucle de cada esclavo
+                if params.get('profile') or PROFILING_ENABLED:
+                    import cProfile
+                    if use_mpi:
+                        self.mpi_handler.start_profiling()
+                    profiler = cProfile.Profile()
+                    profiler.enable()
+                
+                # Crear motor de resolución (algoritmo genético, búsqueda local iterada o descomposición)
+                ga = self._create_engine(params, eval_map, use_mpi, initial_individuals)
+                
+                # Métricas MPI recogidas durante la ejecución: generación -> resumen
+                comm_snapshots = {}
+                
+                # Configurar callback para actualizar la vista
+                def update_callback(generation, best, worst, avg, std_dev, timings=None):
+                    """Callback para actualizar la vista después de cada generación."""
+                    self.view.post_progress(generation, best, worst, avg, std_dev, num_generations, timings)
+                    self.metrics.observe_generation(generation, best, avg, ga.evaluations)
+                    memory.sample(generation)
+                    # El callback corre en el hilo del AG entre generaciones: los esclavos están libres
+                    # (no en la búsqueda local, donde cada esclavo ejecuta su cadena)
+                    if mpi_map is not None and MPI_METRICS_GATHER_EVERY and generation and generation % MPI_METRICS_GATHER_EVERY == 0:
+                        comm_snapshots[generation] = summarize_cluster(self.mpi_handler.gather_metrics())
+                        self.metrics.observe_cluster(comm_snapshots[generation])
+                
+                ga.set_callback(update_callback)
+                
+                # Ejecutar algoritmo
+                logger.info({'ils': "Iniciando búsqueda local iterada...",
+                             'decomp': "Iniciando descomposición espacial..."}.get(
+                                 engine, "Iniciando algoritmo genético..."))
+                self.metrics.observe_run_start(num_generations, len(self.dist_matrix))
+                best_route, best_distance, total_time, stats = ga.run()
+            finally:
+                if pool_handler is not None:
+                    pool_handler.close()
+                if profiler is not None:
+                    self._write_profile_report(profiler, use_mpi)
+                memory_report = memory.stop(self.mpi_handler.get_rank(), self.mpi_handler.host)
+                if memory_report:
+                    memory_summary = self._write_memory_report(memory_report, use_mpi)
+            self.metrics.observe_run_end(best_distance, total_time)
             
-            ga.set_callback(update_callback)
+            # Métricas de comunicación de toda la ejecución
+            metrics_summary = None
+            if mpi_map is not None:
+                metrics_summary = summarize_cluster(self.mpi_handler.gather_metrics())
+                self._attach_comm_snapshots(stats, comm_snapshots)
+                self.metrics.observe_cluster(metrics_summary)
+                if metrics_summary:
+                    logger.info("Métricas MPI: %d mensajes, %.1f KB, espera del maestro %.2f s",
+                                metrics_summary['messages'], metrics_summary['bytes'] / 1024,
+                                metrics_summary['master_wait_time'])
             
-            # Ejecutar algoritmo
-            print("[INFO] Iniciando algoritmo genético...")
-            best_route, best_distance, total_time, stats = ga.run()
+            if self.mpi_handler.failed_ranks:
+                logger.warning("⚠ Esclavos descartados en esta sesión (sin respuesta): ranks %s",
+                               sorted(self.mpi_handler.failed_ranks))
+            logger.info("Algoritmo completado. Mejor distancia: %.2f", best_distance)
+            logger.info("Tiempo total: %.2f segundos", total_time)
+            if ga.phase_totals:
+                breakdown = ", ".join(f"{phase}={seconds:.3f}s" for phase, seconds in ga.phase_totals.items() if seconds)
+                logger.info("Tiempo por fase: %s", breakdown)
+            if getattr(ga, 'adaptation', None) is not None:
+                summary = ga.adaptation.summary()
+                logger.info("Operadores adaptativos: cruce %s, mutación %s", summary['crossover'], summary['mutation'])
             
-            print(f"[INFO] Algoritmo completado. Mejor distancia: {best_distance:.2f}")
-            print(f"[INFO] Tiempo total: {total_time:.2f} segundos")
+            if cache_key is not None:
+                self.run_cache.put(cache_key, best_route, best_distance, total_time, stats)
             
             # Guardar en base de datos si está disponible
-            if self.db_manager and self.db_manager.is_available():
-                execution_params = {
-                    'pop_size': pop_size,
-                    'crossover_rate': crossover_rate,
-                    'mutation_rate': mutation_rate,
-                    'num_generations': num_generations,
-                    'num_cities': len(self.dist_matrix)
-                }
-                self.db_manager.save_execution(best_route, best_distance, execution_params)
+            if db_available:
+                execution_params = dict(result_params, num_cities=len(self.dist_matrix), seed=seed,
+                                        warm_start=len(initial_individuals or []))
+                if metrics_summary:
+                    execution_params['mpi_metrics'] = metrics_summary
+                if memory_summary:
+                    execution_params['memory'] = memory_summary
+                if tuning is not None:
+                    execution_params['autotune'] = {key: tuning[key] for key in
+                                                    ('backend', 'workers', 'processes', 'chunk_size')}
+                # Escritura diferida: el hilo del algoritmo no espera a la BD
+                self.db_manager.save_execution(best_route, best_distance, execution_params, stats,
+                                               instance_hash=instance_hash,
+                                               final_population=ga.final_population)
             
             # NO enviar señal de terminación - los esclavos deben permanecer activos
             # para permitir múltiples ejecuciones
@@ -219,11 +644,11 @@ class AppController:
             # Mostrar resultados finales en la vista
             self.view.root.after(0, self.view.show_final_results, 
                                best_route, best_distance, total_time)
+            if metrics_summary:
+                self.view.root.after(0, self._update_cluster_info, metrics_summary)
         
         except Exception as e:
-            print(f"[ERROR] Error ejecutando algoritmo: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("✗ Error ejecutando algoritmo: %s", e)
             self.view.root.after(0, self.view.show_error, f"Error ejecutando algoritmo: {str(e)}")
 
 
@@ -3,14 +3,21 @@ Punto de entrada principal de la aplicación.
 Sistema de Algoritmo Genético TSP con Cluster Beowulf (MPI)
 Arquitectura MVC
 """
+import time
+_START = time.perf_counter()  # Inicio del proceso, para medir el tiempo de arranque de cada rank
+
 import sys
 import os
-import subprocess
+
 
 def check_and_relaunch_with_mpi():
     """
     Verifica si existe el archivo hosts y relanza automáticamente con MPI.
     Busca el archivo hosts en el directorio actual o en /clusterdir/distribuidos/
+    
+    El número de procesos es la suma de los slots declarados en el hostfile
+    (se puede forzar con la variable de entorno TSP_MPI_NP). Con TSP_MPI_HYBRID=1
+    se lanza un esclavo por nodo (más el maestro) que evalúa con hilos.
     """
     # Buscar archivo hosts en posibles ubicaciones
     hosts_path = None
@@ -29,12 +36,30 @@ def check_and_relaunch_with_mpi():
         # No hay archivo hosts, ejecutar en modo local
         return False
     
-    # Relanzar con mpirun usando el comando exacto especificado
+    # Relanzar con mpirun con un proceso por slot del hostfile
     try:
+        import subprocess
+        from utils.mpi_config import MPIConfig
+        
         script_path = os.path.abspath(__file__)
         # Usar ruta absoluta del archivo hosts
         hosts_abs_path = os.path.abspath(hosts_path)
-        cmd = ["mpirun", "-np", "20", "--hostfile", hosts_abs_path, 
+        info = MPIConfig.get_hostfile_info(hosts_abs_path)
+        extra_args = []
+        if os.getenv("TSP_MPI_HYBRID") == "1" and info and info['nodes']:
+            # Modo híbrido: un rank por nodo (el primero también aloja al maestro)
+            hosts_abs_path = MPIConfig.generate_hybrid_hostfile(
+                [node['name'] for node in info['nodes']],
+                os.path.join(os.path.dirname(script_path), "mpi_hostfile_hybrid"))
+            info = MPIConfig.get_hostfile_info(hosts_abs_path) if hosts_abs_path else None
+            extra_args = MPIConfig.hybrid_mpirun_args()
+        num_processes = int(os.getenv("TSP_MPI_NP", "0")) or (info['total_slots'] if info else 0)
+        if num_processes < 1:
+            print(f"[ADVERTENCIA] {hosts_abs_path} no declara slots, ejecutando en modo local")
+            return False
+        print(f"[INFO] Relanzando con MPI: {num_processes} procesos "
+              f"({info['num_nodes'] if info else '?'} nodos en {hosts_abs_path})")
+        cmd = ["mpirun", "-np", str(num_processes), "--hostfile", hosts_abs_path] + extra_args + [
                sys.executable, script_path] + sys.argv[1:]
         
         # Ejecutar y esperar
@@ -59,107 +84,124 @@ except ImportError:
     size = 1
     comm = None
 
+# Logging con prefijo de rank y escritura asíncrona (nivel: TSP_LOG_LEVEL)
+from utils.logger import setup_logging
+logger = setup_logging(rank)
+
 # Verificar y relanzar con MPI si es necesario (solo si no estamos ya en MPI)
 if __name__ == "__main__":
     if not MPI_AVAILABLE:
         check_and_relaunch_with_mpi()
 
+
+def report_startup(reports):
+    """
+    Registra los tiempos de arranque recogidos en la barrera de arranque.
+    
+    Args:
+        reports: Lista de (rank, host, segundos) retornada por MPIHandler.handshake
+    """
+    slaves = [report for report in reports if report[0] != 0]
+    for report_rank, host, seconds in sorted(reports):
+        logger.debug("Rank %d@%s listo en %.3f s", report_rank, host, seconds)
+    if slaves:
+        slowest = max(slaves, key=lambda report: report[2])
+        logger.info("✓ %d esclavos listos (arranque medio %.2f s, más lento rank %d@%s: %.2f s)",
+                    len(slaves), sum(report[2] for report in slaves) / len(slaves),
+                    slowest[0], slowest[1], slowest[2])
+
+
 # Si somos esclavo, no importar tkinter
 if MPI_AVAILABLE and rank != 0:
-    # ESCLAVO: Entrar en bucle de procesamiento
-    import sys
-    sys.stdout.flush()  # Asegurar que los mensajes se muestren inmediatamente
-    print(f"[ESCLAVO Rank {rank}/{size-1}] ===== INICIANDO PROCESO ESCLAVO =====")
-    print(f"[ESCLAVO Rank {rank}] Total de procesos MPI: {size}")
-    print(f"[ESCLAVO Rank {rank}] Proceso esclavo activo y listo para recibir trabajo")
-    sys.stdout.flush()
+    # ESCLAVO: solo lo necesario para el bucle de evaluación
+    logger.info("===== INICIANDO PROCESO ESCLAVO (%d/%d) =====", rank, size - 1)
+    logger.debug("Total de procesos MPI: %d", size)
     
     try:
         from models.mpi_handler import MPIHandler
         mpi_handler = MPIHandler()
         
-        print(f"[ESCLAVO Rank {rank}] MPIHandler inicializado correctamente")
-        sys.stdout.flush()
-        
-        # Variable para almacenar la matriz de distancias
-        dist_matrix = None
+        logger.debug("MPIHandler inicializado correctamente")
         
-        # Función de evaluación local
-        def eval_tsp_local(individual):
-            """Evalúa un individuo usando la matriz de distancias recibida."""
-            if dist_matrix is None:
-                return float('inf'),
-            distance = dist_matrix[individual[-1]][individual[0]]
-            for gene1, gene2 in zip(individual[0:-1], individual[1:]):
-                distance += dist_matrix[gene1][gene2]
-            return distance,
+        # Avisar al maestro de que este rank está listo
+        mpi_handler.handshake(time.perf_counter() - _START)
         
         # Bucle principal de esclavo
-        print(f"[ESCLAVO Rank {rank}] Entrando en bucle de espera de mensajes del maestro...")
-        print(f"[ESCLAVO Rank {rank}] Esperando mensajes (tag 100: matriz, tag 1: tareas, tag 99: terminación)")
-        sys.stdout.flush()
-        task_count = 0
-        
-        while True:
-            try:
-                status = MPI.Status()
-                message = comm.recv(source=0, tag=MPI.ANY_TAG, status=status)
-                tag_received = status.Get_tag()
-                
-                if tag_received == 99:
-                    # Señal de terminación - NO terminar, solo continuar esperando
-                    print(f"[ESCLAVO Rank {rank}] Recibida señal de terminación, esperando siguiente ejecución...")
-                    continue
-                elif tag_received == 100:
-                    # Matriz de distancias
-                    dist_matrix = message
-                    print(f"[ESCLAVO Rank {rank}] ✓ Matriz recibida: {len(dist_matrix)}x{len(dist_matrix)}")
-                    sys.stdout.flush()
-                    continue
-                elif tag_received == 1:
-                    # Tarea
-                    if isinstance(message, tuple) and len(message) == 2:
-                        task_idx, task = message
-                        if task_idx == -1 and task is None:
-                            # Fin de lote - continuar esperando siguiente ejecución
-                            print(f"[ESCLAVO Rank {rank}] Fin de lote recibido. Total tareas procesadas: {task_count}. Esperando siguiente ejecución...")
-                            sys.stdout.flush()
-                            task_count = 0  # Resetear contador para siguiente ejecución
-                            continue
-                        
-                        if dist_matrix is None:
-                            print(f"[ESCLAVO Rank {rank}] ⚠ ADVERTENCIA: Recibida tarea pero matriz no disponible")
-                            comm.send((task_idx, (float('inf'),)), dest=0, tag=2)
-                            sys.stdout.flush()
-                            continue
-                        
-                        # Procesar tarea
-                        print(f"[ESCLAVO Rank {rank}] Procesando tarea {task_idx}...")
-                        sys.stdout.flush()
-                        result = eval_tsp_local(task)
-                        comm.send((task_idx, result), dest=0, tag=2)
-                        task_count += 1
-                        if task_count % 10 == 0:  # Mostrar cada 10 tareas
-                            print(f"[ESCLAVO Rank {rank}] Procesadas {task_count} tareas hasta ahora...")
-                            sys.stdout.flush()
-            
-            except Exception as e:
-                import traceback
-                print(f"[ESCLAVO Rank {rank}] ✗ ERROR en bucle principal: {e}")
-                traceback.print_exc()
-                sys.stdout.flush()
-                break
+        task_count = mpi_handler.run_slave_loop()
         
-        print(f"[ESCLAVO Rank {rank}] ===== FINALIZANDO PROCESO ESCLAVO =====")
-        print(f"[ESCLAVO Rank {rank}] Total de tareas procesadas: {task_count}")
-        sys.stdout.flush()
+        logger.info("===== FINALIZANDO PROCESO ESCLAVO (tareas del último lote: %d) =====", task_count)
     
     except KeyboardInterrupt:
-        print(f"[ESCLAVO Rank {rank}] Interrumpido por el usuario")
+        logger.warning("Interrumpido por el usuario")
     except Exception as e:
-        print(f"[ESCLAVO Rank {rank}] Error crítico: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error crítico: %s", e)
+
+elif "--jobs" in sys.argv:
+    # MAESTRO sin interfaz: ejecutar los trabajos de un archivo JSON Lines
+    if __name__ == "__main__":
+        from models.mpi_handler import MPIHandler
+        from models.job_scheduler import run_jobs_file
+        from utils.metrics_exporter import create_metrics_exporter
+        
+        jobs_file = sys.argv[sys.argv.index("--jobs") + 1]
+        mpi_handler = MPIHandler()
+        report_startup(mpi_handler.handshake(time.perf_counter() - _START))
+        metrics = create_metrics_exporter()
+        try:
+            results = run_jobs_file(jobs_file, mpi_handler, on_result=metrics.observe_job_result,
+                                    on_progress=metrics.observe_job)
+            for result in results:
+                if 'error' in result:
+                    logger.info("%s: ERROR %s", result['job_id'], result['error'])
+                else:
+                    logger.info("%s: distancia %.2f (%d ranks, %.2f s)", result['job_id'],
+                                result['best_distance'], result['ranks'], result['total_time'])
+        finally:
+            metrics.close()
+            # Liberar a los esclavos para que mpirun termine
+            if mpi_handler.is_available and mpi_handler.get_size() > 1:
+                mpi_handler.shutdown_slaves()
+
+elif "--decompose" in sys.argv:
+    # MAESTRO sin interfaz: descomposición espacial de una instancia de coordenadas
+    if __name__ == "__main__":
+        from models.mpi_handler import MPIHandler
+        from models.decomposition import DecompositionTSP
+        from utils.matrix_loader import MatrixLoader
+
+        coords_file = sys.argv[sys.argv.index("--decompose") + 1]
+        out_file = sys.argv[sys.argv.index("--out") + 1] if "--out" in sys.argv else None
+        mpi_handler = MPIHandler()
+        report_startup(mpi_handler.handshake(time.perf_counter() - _START))
+        try:
+            coords = MatrixLoader.load_coordinates(coords_file)
+            if coords is not None:
+                use_mpi = mpi_handler.is_available and mpi_handler.get_size() > 1
+                solver = DecompositionTSP(coords=coords, mpi_handler=mpi_handler if use_mpi else None,
+                                          processes=os.cpu_count() or 1)
+                logged = set()
+
+                def log_progress(generation, best, *_, **__):
+                    # Una línea por décima parte del trabajo
+                    step = generation * 10 // solver.num_generations
+                    if step not in logged:
+                        logged.add(step)
+                        logger.info("Progreso %d%%: longitud %.2f", step * 10, best)
+
+                solver.set_callback(log_progress)
+                route, distance, total_time, _ = solver.run()
+                logger.info("%s: %d ciudades, %d clústeres, distancia %.2f (%.2f s)", coords_file,
+                            len(coords), solver.num_clusters, distance, total_time)
+                logger.info("Tiempo por fase: %s", ", ".join(
+                    f"{phase}={seconds:.2f}s" for phase, seconds in solver.phase_totals.items()))
+                if out_file:
+                    with open(out_file, 'w') as f:
+                        f.write("\n".join(str(city) for city in route) + "\n")
+                    logger.info("Recorrido guardado en %s", out_file)
+        finally:
+            # Liberar a los esclavos para que mpirun termine
+            if mpi_handler.is_available and mpi_handler.get_size() > 1:
+                mpi_handler.shutdown_slaves()
 
 else:
     # MAESTRO o modo local: Ejecutar interfaz gráfica
@@ -169,14 +211,13 @@ else:
     
     if __name__ == "__main__":
         if MPI_AVAILABLE:
-            print(f"[MAESTRO Rank {rank}] ===== INICIANDO APLICACIÓN =====")
-            print(f"[MAESTRO Rank {rank}] Total de procesos MPI: {size}")
-            print(f"[MAESTRO Rank {rank}] Número de esclavos: {size - 1}")
-            print(f"[MAESTRO Rank {rank}] Esperando a que los esclavos se inicialicen...")
-            import time
-            time.sleep(1)  # Dar tiempo a que los esclavos muestren sus mensajes
+            logger.info("===== INICIANDO APLICACIÓN =====")
+            logger.info("Total de procesos MPI: %d (%d esclavos)", size, size - 1)
+            # Las importaciones de la interfaz ya se solaparon con el arranque de los esclavos
+            from models.mpi_handler import MPIHandler
+            report_startup(MPIHandler().handshake(time.perf_counter() - _START))
         else:
-            print("[MAESTRO] Iniciando aplicación en modo local...")
+            logger.info("Iniciando aplicación en modo local...")
         
         # Crear ventana principal
         root = tk.Tk()
@@ -192,6 +233,9 @@ else:
         
         # Ejecutar interfaz
         root.mainloop()
+        
+        # Guardar resultados pendientes y liberar a los esclavos para que mpirun termine
+        controller.shutdown()
 
 
 
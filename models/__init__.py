@@ -1,12 +1,30 @@
 """
 Módulo de modelos - Lógica de negocio.
+
+Las clases se importan en el primer acceso (PEP 562): importar un submódulo
+ligero, como models.mpi_handler en los esclavos, no carga DEAP, NumPy ni la
+capa de base de datos.
 """
-from .genetic_algorithm import GeneticAlgorithmTSP
-from .mpi_handler import MPIHandler
-from .database import DatabaseManager
+import importlib
+
+_EXPORTS = {
+    'GeneticAlgorithmTSP': '.genetic_algorithm',
+    'MPIHandler': '.mpi_handler',
+    'PoolHandler': '.pool_handler',
+    'DatabaseManager': '.database',
+    'RunCache': '.run_cache',
+}
 
-__all__ = ['GeneticAlgorithmTSP', 'MPIHandler', 'DatabaseManager']
+__all__ = list(_EXPORTS)
 
 
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
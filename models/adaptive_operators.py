@@ -0,0 +1,178 @@
+"""
+Modelo: Adaptive Operators
+Selección adaptativa de operadores y tasas durante una ejecución del AG.
+
+Cada decisión (operador de cruce, operador de mutación, tasa de cruce, tasa
+de mutación y tamaño de torneo) es un bandido con búsqueda adaptativa
+(adaptive pursuit): cada brazo tiene una calidad estimada, media exponencial
+de los créditos que recibe, y las probabilidades se desplazan hacia el mejor
+brazo sin bajar nunca de P_MIN.
+
+Crédito de un hijo: mejora relativa frente a su referencia (el mejor de sus
+padres al cruzar, o el propio individuo antes de mutar), max(0, (ref - f) / ref).
+Los operadores reciben el crédito de los hijos que producen; las tasas y el
+torneo, elegidos una vez por generación, reciben el crédito medio de la
+generación.
+"""
+import random
+
+from deap import tools
+
+# Brazos de cada decisión
+ARMS = {
+    'crossover': ('ox', 'erx', 'eax'),
+    'mutation': ('shuffle', 'inversion', 'insertion'),
+    'crossover_rate': (0.6, 0.8, 0.95),
+    'mutation_rate': (0.05, 0.1, 0.2, 0.4),
+    'tournament_size': (2, 3, 5),
+}
+
+# Decisiones que se toman una vez por generación (el resto, en cada aplicación)
+PER_GENERATION = ('crossover_rate', 'mutation_rate', 'tournament_size')
+
+P_MIN = 0.05   # Probabilidad mínima de cada brazo
+ALPHA = 0.3    # Tasa de aprendizaje de la calidad de cada brazo
+BETA = 0.3     # Velocidad con la que las probabilidades persiguen al mejor brazo
+
+# Probabilidad por gen de mutShuffleIndexes (la del operador fijo)
+SHUFFLE_INDPB = 0.05
+
+
+def mut_inversion(individual):
+    """Invierte un tramo aleatorio del recorrido (movimiento 2-opt aleatorio)."""
+    i, j = sorted(random.sample(range(len(individual)), 2))
+    individual[i:j + 1] = individual[i:j + 1][::-1]
+    return individual,
+
+
+def mut_insertion(individual):
+    """Mueve una ciudad aleatoria a otra posición aleatoria."""
+    i, j = random.sample(range(len(individual)), 2)
+    individual.insert(j, individual.pop(i))
+    return individual,
+
+
+MUTATIONS = {
+    'shuffle': lambda individual: tools.mutShuffleIndexes(individual, indpb=SHUFFLE_INDPB),
+    'inversion': mut_inversion,
+    'insertion': mut_insertion,
+}
+
+
+class PursuitBandit:
+    """Bandido de búsqueda adaptativa sobre un conjunto discreto de brazos."""
+
+    def __init__(self, arms, p_min=P_MIN, alpha=ALPHA, beta=BETA):
+        """
+        Args:
+            arms: Valores posibles (operadores o tasas)
+            p_min: Probabilidad mínima de cada brazo
+            alpha: Tasa de aprendizaje de la calidad
+            beta: Velocidad de persecución del mejor brazo
+        """
+        self.arms = list(arms)
+        k = len(self.arms)
+        self.p_min = min(p_min, 1.0 / k)
+        self.p_max = 1.0 - (k - 1) * self.p_min
+        self.alpha = alpha
+        self.beta = beta
+        self.quality = [0.0] * k
+        self.probabilities = [1.0 / k] * k
+        self._credits = [[] for _ in range(k)]
+
+    def select(self):
+        """Elige un brazo según las probabilidades actuales."""
+        return random.choices(self.arms, self.probabilities)[0]
+
+    def reward(self, arm, credit):
+        """Acumula el crédito de una aplicación del brazo."""
+        self._credits[self.arms.index(arm)].append(credit)
+
+    def update(self):
+        """Actualiza calidades y probabilidades con los créditos de la generación."""
+        for index, credits in enumerate(self._credits):
+            if credits:
+                mean = sum(credits) / len(credits)
+                self.quality[index] += self.alpha * (mean - self.quality[index])
+                credits.clear()
+        best = max(range(len(self.arms)), key=self.quality.__getitem__)
+        for index in range(len(self.arms)):
+            target = self.p_max if index == best else self.p_min
+            self.probabilities[index] += self.beta * (target - self.probabilities[index])
+
+    def summary(self):
+        """Probabilidades actuales por brazo."""
+        return {str(arm): round(p, 4) for arm, p in zip(self.arms, self.probabilities)}
+
+
+class AdaptiveOperators:
+    """Bandidos de todas las decisiones y asignación de crédito de una ejecución."""
+
+    def __init__(self, arms=None):
+        """
+        Args:
+            arms: Diccionario decisión -> brazos (por defecto ARMS)
+        """
+        self.bandits = {slot: PursuitBandit(values) for slot, values in (arms or ARMS).items()}
+        self.current = {}
+        self._records = []  # (individuo, decisión, brazo, fitness de referencia)
+        self._references = {}  # id(hijo cruzado) -> fitness del mejor padre
+
+    def start_generation(self):
+        """
+        Elige las tasas y el torneo de la generación.
+
+        Returns:
+            Diccionario crossover_rate, mutation_rate y tournament_size
+        """
+        self.current = {slot: self.bandits[slot].select() for slot in PER_GENERATION}
+        self._records = []
+        self._references = {}
+        return self.current
+
+    def choose(self, slot):
+        """Elige un operador ('crossover' o 'mutation') para una aplicación."""
+        return self.bandits[slot].select()
+
+    def reference(self, individual):
+        """Fitness de referencia antes de mutar: el propio o, si se acaba de cruzar, el del mejor padre."""
+        if individual.fitness.valid:
+            return individual.fitness.values[0]
+        return self._references.get(id(individual))
+
+    def track(self, individual, slot, arm, reference):
+        """Registra una aplicación de operador para asignarle crédito tras la evaluación."""
+        if slot == 'crossover':
+            self._references[id(individual)] = reference
+        if reference is not None:
+            self._records.append((individual, slot, arm, reference))
+
+    def end_generation(self):
+        """
+        Asigna créditos con los hijos ya evaluados y actualiza los bandidos.
+
+        Returns:
+            Registro de la generación para stats_list: tasas elegidas y
+            probabilidades de los operadores
+        """
+        credits = []
+        for individual, slot, arm, reference in self._records:
+            credit = max(0.0, (reference - individual.fitness.values[0]) / reference) if reference > 0 else 0.0
+            self.bandits[slot].reward(arm, credit)
+            credits.append(credit)
+        generation_credit = sum(credits) / len(credits) if credits else 0.0
+        for slot in PER_GENERATION:
+            self.bandits[slot].reward(self.current[slot], generation_credit)
+        for bandit in self.bandits.values():
+            bandit.update()
+        self._records = []
+        self._references = {}
+
+        entry = dict(self.current)
+        entry.update({slot: bandit.summary() for slot, bandit in self.bandits.items()
+                      if slot not in PER_GENERATION})
+        return entry
+
+    def summary(self):
+        """Probabilidades finales de todas las decisiones."""
+        return {slot: bandit.summary() for slot, bandit in self.bandits.items()}
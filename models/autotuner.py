@@ -0,0 +1,282 @@
+"""
+Modelo: Autotuner
+Elige al inicio de una ejecución cómo evaluar la población: en serie, en un
+pool de procesos local o repartida por MPI, con cuántos esclavos y cuántas
+rutas por mensaje.
+
+Micro-benchmarks: coste de evaluar una ruta en este proceso, tiempo de ida y
+vuelta a cada esclavo de un mensaje vacío y de uno con PROBE_ROUTES rutas
+(modelo lineal: latencia + coste por ruta) y, sin MPI, un pool.map real con
+cada tamaño de bloque candidato. Con esas medidas se estima el tiempo total
+de cada configuración y se elige el menor. Las decisiones se guardan en un
+JSON por número de ciudades, tamaño de población y disposición del cluster.
+"""
+import json
+import math
+import os
+import pickle
+import random
+import time
+from collections import Counter
+
+from config.config import AUTOTUNE_FILE, AUTOTUNE_REPEATS
+
+# Tamaños de bloque (rutas por mensaje) considerados
+CHUNK_SIZES = (1, 2, 4, 8, 16, 32, 64)
+
+# Rutas del mensaje de prueba para estimar el coste por ruta de MPI
+PROBE_ROUTES = 32
+
+# Tiempo mínimo de la medición del coste de evaluación (segundos)
+MIN_EVAL_TIME = 0.02
+
+# Decisiones conservadas en el archivo de caché
+MAX_ENTRIES = 100
+
+
+def _route_length(dist_matrix, route):
+    """Distancia de una ruta cerrada (igual que la evaluación del algoritmo genético)."""
+    distance = dist_matrix[route[-1]][route[0]]
+    for gene1, gene2 in zip(route[0:-1], route[1:]):
+        distance += dist_matrix[gene1][gene2]
+    return distance
+
+
+def measure_eval_cost(dist_matrix, routes):
+    """
+    Segundos por evaluación de ruta en este proceso.
+
+    Repite la evaluación de las rutas hasta acumular MIN_EVAL_TIME.
+    """
+    evaluated = 0
+    start = time.perf_counter()
+    while True:
+        for route in routes:
+            _route_length(dist_matrix, route)
+        evaluated += len(routes)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_EVAL_TIME:
+            return elapsed / evaluated
+
+
+def estimate_mpi(num_tasks, eval_cost, latency, per_route, workers, chunk_size):
+    """
+    Tiempo estimado de evaluar una generación por MPI.
+
+    Cada esclavo atiende un mensaje cada vez: el tiempo lo marcan las rondas
+    de mensajes por esclavo o, con muchos mensajes pequeños, el maestro, que
+    envía y recibe todos (se le asigna la mitad del tiempo de ida y vuelta).
+
+    Args:
+        num_tasks: Rutas a evaluar
+        eval_cost: Segundos por evaluación
+        latency: Ida y vuelta de un mensaje vacío (segundos)
+        per_route: Segundos adicionales de ida y vuelta por ruta del mensaje
+        workers: Esclavos usados
+        chunk_size: Rutas por mensaje
+
+    Returns:
+        Segundos por generación
+    """
+    messages = math.ceil(num_tasks / chunk_size)
+    round_trip = latency + chunk_size * per_route
+    slaves = math.ceil(messages / workers) * (chunk_size * eval_cost + round_trip)
+    master = messages * round_trip / 2
+    return max(slaves, master)
+
+
+class Autotuner:
+    """Elección de backend, esclavos y tamaño de bloque para una instancia."""
+
+    def __init__(self, dist_matrix, pop_size, num_generations, mpi_handler=None,
+                 processes=None, cache_file=AUTOTUNE_FILE):
+        """
+        Args:
+            dist_matrix: Matriz de distancias de la ejecución
+            pop_size: Tamaño de población (rutas evaluadas por generación)
+            num_generations: Generaciones (para amortizar el arranque del pool y el envío de la matriz)
+            mpi_handler: MPIHandler del maestro (None o un solo rank = sin MPI)
+            processes: Procesos del pool local (por defecto, número de CPUs)
+            cache_file: Archivo JSON de decisiones (None = sin caché)
+        """
+        self.dist_matrix = dist_matrix
+        self.num_cities = len(dist_matrix)
+        self.pop_size = pop_size
+        self.num_generations = num_generations
+        self.mpi_handler = mpi_handler
+        self.processes = processes or os.cpu_count() or 1
+        self.cache_file = cache_file
+        self.mpi_workers = len(mpi_handler.live_slaves()) if mpi_handler is not None and mpi_handler.is_available else 0
+
+    def _layout(self):
+        """Disposición del cluster: CPUs locales y esclavos por host (un ping vacío a cada uno)."""
+        layout = f"{self.processes}cpu"
+        if self.mpi_workers:
+            hosts = Counter(str(host) for _, host, _ in self.mpi_handler.ping_slaves())
+            layout += "|" + ",".join(f"{host}:{count}" for host, count in sorted(hosts.items()))
+        return layout
+
+    def _cache_key(self):
+        return f"{self.num_cities}x{self.pop_size}|{self._layout()}"
+
+    def _load_cache(self):
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        if not self.cache_file:
+            return
+        while len(cache) > MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+        temp_path = f"{self.cache_file}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(cache, f, indent=1)
+        os.replace(temp_path, self.cache_file)
+
+    def decide(self, force=False):
+        """
+        Decisión para esta instancia: de la caché o midiendo.
+
+        Args:
+            force: Si True, mide aunque haya una decisión guardada
+
+        Returns:
+            Diccionario con backend, workers, processes, chunk_size, estimates
+            (segundos totales por backend), measurements y cached
+        """
+        key = self._cache_key()
+        cache = self._load_cache()
+        if not force and key in cache:
+            return dict(cache[key], cached=True)
+
+        decision = self._measure()
+        cache.pop(key, None)
+        cache[key] = decision
+        self._save_cache(cache)
+        return dict(decision, cached=False)
+
+    def _measure(self):
+        """Ejecuta los micro-benchmarks y elige la configuración más rápida."""
+        rng = random.Random(0)
+        cities = list(range(self.num_cities))
+        routes = [rng.sample(cities, self.num_cities) for _ in range(min(self.pop_size, PROBE_ROUTES))]
+        num_tasks = self.pop_size
+        generations = max(1, self.num_generations)
+
+        eval_cost = measure_eval_cost(self.dist_matrix, routes)
+        measurements = {'eval_cost': eval_cost}
+        candidates = [{'backend': 'serial', 'workers': 0, 'processes': 1, 'chunk_size': 1,
+                       'total': num_tasks * eval_cost * generations}]
+
+        if self.mpi_workers:
+            latency, per_route = self._measure_mpi(routes)
+            # Envío de la matriz a cada esclavo al inicio de la ejecución (~9 bytes por distancia)
+            route_bytes = len(pickle.dumps(routes[0]))
+            matrix_cost = per_route * (9 * self.num_cities ** 2) / route_bytes
+            measurements.update(latency=latency, per_route=per_route)
+            for workers in range(1, self.mpi_workers + 1):
+                for chunk_size in CHUNK_SIZES:
+                    if chunk_size > 1 and chunk_size > math.ceil(num_tasks / workers):
+                        break
+                    per_generation = estimate_mpi(num_tasks, eval_cost, latency, per_route, workers, chunk_size)
+                    candidates.append({'backend': 'mpi', 'workers': workers, 'processes': 1,
+                                       'chunk_size': chunk_size,
+                                       'total': workers * matrix_cost + per_generation * generations})
+        elif self.processes > 1:
+            startup, per_chunk = self._measure_pool(routes, num_tasks)
+            measurements['pool_startup'] = startup
+            for chunk_size, per_generation in per_chunk.items():
+                candidates.append({'backend': 'pool', 'workers': 0, 'processes': self.processes,
+                                   'chunk_size': chunk_size, 'total': startup + per_generation * generations})
+
+        estimates = {}
+        for candidate in candidates:
+            backend = candidate['backend']
+            estimates[backend] = min(estimates.get(backend, math.inf), candidate['total'])
+        best = min(candidates, key=lambda candidate: candidate['total'])
+        return {
+            'backend': best['backend'],
+            'workers': best['workers'],
+            'processes': best['processes'],
+            'chunk_size': best['chunk_size'],
+            'estimates': estimates,
+            'measurements': measurements,
+        }
+
+    def _measure_mpi(self, routes):
+        """
+        Latencia de ida y vuelta de un mensaje vacío y coste adicional por ruta.
+
+        Returns:
+            Tupla (latencia, segundos_por_ruta), medianas entre esclavos
+        """
+        def median(values):
+            values = sorted(values)
+            return values[len(values) // 2]
+
+        empty = median([rtt for _, _, rtt in self.mpi_handler.ping_slaves(None, AUTOTUNE_REPEATS)])
+        loaded = median([rtt for _, _, rtt in self.mpi_handler.ping_slaves(routes, AUTOTUNE_REPEATS)])
+        return empty, max(0.0, loaded - empty) / len(routes)
+
+    def _measure_pool(self, routes, num_tasks):
+        """
+        Arranque del pool y tiempo de un pool.map de num_tasks rutas por tamaño de bloque.
+
+        Returns:
+            Tupla (segundos_de_arranque, {chunk_size: segundos_por_generacion})
+        """
+        from models.pool_handler import PoolHandler, _eval_route
+
+        tasks = (routes * math.ceil(num_tasks / len(routes)))[:num_tasks]
+        handler = PoolHandler(self.processes)
+        try:
+            start = time.perf_counter()
+            pool_map = handler.create_pool_map(self.dist_matrix)
+            pool_map(None, tasks[:self.processes])  # Espera a que todos los procesos estén listos
+            startup = time.perf_counter() - start
+
+            per_chunk = {}
+            for chunk_size in CHUNK_SIZES:
+                if chunk_size > 1 and chunk_size > math.ceil(num_tasks / self.processes):
+                    break
+                times = []
+                for _ in range(AUTOTUNE_REPEATS):
+                    start = time.perf_counter()
+                    handler.pool.map(_eval_route, tasks, chunk_size)
+                    times.append(time.perf_counter() - start)
+                per_chunk[chunk_size] = min(times)
+            return startup, per_chunk
+        finally:
+            handler.close()
+
+
+def _duration(seconds):
+    """Segundos en ms o s según su magnitud."""
+    return f"{seconds * 1000:.1f} ms" if seconds < 1 else f"{seconds:.2f} s"
+
+
+def format_decision(decision):
+    """Texto de una decisión para el log del maestro."""
+    measurements = decision['measurements']
+    parts = [f"evaluación {measurements['eval_cost'] * 1e6:.1f} µs/ruta"]
+    if 'latency' in measurements:
+        parts.append(f"latencia MPI {measurements['latency'] * 1e6:.0f} µs + "
+                     f"{measurements['per_route'] * 1e6:.2f} µs/ruta")
+    if 'pool_startup' in measurements:
+        parts.append(f"arranque del pool {measurements['pool_startup'] * 1000:.0f} ms")
+    estimates = ", ".join(f"{backend} {_duration(seconds)}" for backend, seconds in decision['estimates'].items())
+
+    if decision['backend'] == 'mpi':
+        choice = f"mpi con {decision['workers']} esclavos, {decision['chunk_size']} rutas por mensaje"
+    elif decision['backend'] == 'pool':
+        choice = f"pool de {decision['processes']} procesos, {decision['chunk_size']} rutas por bloque"
+    else:
+        choice = "serial"
+    origin = " (caché)" if decision.get('cached') else ""
+    return f"{choice}{origin}; {'; '.join(parts)}; estimado total: {estimates}"
@@ -0,0 +1,329 @@
+"""
+Modelo: Crossover
+Operadores de recombinación que conservan aristas de los padres.
+
+- ERX (edge recombination): el hijo se construye recorriendo la tabla de
+  aristas de ambos padres, prefiriendo las aristas comunes y las ciudades con
+  menos vecinos pendientes.
+- EAX (edge assembly, versión simplificada): se descompone la unión de las
+  aristas de los padres en ciclos AB, se aplica un ciclo AB al padre A y los
+  subtours resultantes se unen con el intercambio 2-opt más barato entre
+  vecinos cercanos. Si el hijo es más largo que ambos padres se prueba otro
+  ciclo AB (hasta EAX_TRIALS) y, si ninguno sirve, el hijo es el padre A.
+
+Ambos trabajan sobre tablas de adyacencia en arrays. Cada operador tiene una
+forma DEAP (cx_erx, cx_eax: modifican los dos individuos) y una forma por
+lotes sobre arrays de permutaciones (erx_batch, eax_batch: un hijo por par).
+Por defecto usan el módulo random, de modo que la semilla del algoritmo
+genético los hace reproducibles.
+"""
+import random
+
+import numpy as np
+
+# Operadores disponibles (configuración: TSP_CROSSOVER)
+CROSSOVER_OPERATORS = ('ox', 'erx', 'eax')
+
+# Vecinos más cercanos considerados al unir subtours en EAX
+EAX_NEIGHBORS = 10
+
+# Ciclos AB probados en EAX antes de quedarse con el padre A
+EAX_TRIALS = 5
+
+
+def adjacency(parents):
+    """
+    Tabla de adyacencia de un lote de recorridos.
+
+    Args:
+        parents: Array (m, n) de permutaciones
+
+    Returns:
+        Array (m, n, 2) con el sucesor y el predecesor de cada ciudad
+    """
+    parents = np.asarray(parents)
+    m, n = parents.shape
+    table = np.empty((m, n, 2), dtype=parents.dtype)
+    rows = np.arange(m)[:, np.newaxis]
+    table[rows, parents, 0] = np.roll(parents, -1, axis=1)
+    table[rows, parents, 1] = np.roll(parents, 1, axis=1)
+    return table
+
+
+def _erx_child(edges, start, rng):
+    """
+    Construye un hijo ERX a partir de la tabla de aristas de ambos padres.
+
+    Args:
+        edges: Lista por ciudad con sus 4 vecinos (sucesor y predecesor en A y en B)
+        start: Ciudad inicial
+        rng: Generador (random o random.Random)
+
+    Returns:
+        Recorrido como lista
+    """
+    n = len(edges)
+    neighbors = [set(row) for row in edges]
+    pending = [len(row) for row in neighbors]  # Vecinos aún no visitados
+    visited = bytearray(n)
+    unvisited = list(range(n))  # Para saltos aleatorios: borrado O(1) por intercambio
+    index = list(range(n))
+
+    def visit(city):
+        visited[city] = 1
+        last = unvisited.pop()
+        if last != city:
+            unvisited[index[city]] = last
+            index[last] = index[city]
+        for other in neighbors[city]:
+            pending[other] -= 1
+
+    tour = [start]
+    visit(start)
+    current = start
+    for _ in range(n - 1):
+        row = edges[current]
+        candidates = [city for city in neighbors[current] if not visited[city]]
+        if candidates:
+            common = [city for city in candidates if row.count(city) > 1]
+            if common:
+                candidates = common
+            fewest = min(pending[city] for city in candidates)
+            candidates = [city for city in candidates if pending[city] == fewest]
+            current = candidates[0] if len(candidates) == 1 else rng.choice(candidates)
+        else:
+            current = unvisited[rng.randrange(len(unvisited))]
+        tour.append(current)
+        visit(current)
+    return tour
+
+
+def erx_batch(parents_a, parents_b, rng=random):
+    """
+    ERX por lotes: un hijo por par de padres, empezando en la primera ciudad de A.
+
+    Args:
+        parents_a: Array (m, n) de permutaciones
+        parents_b: Array (m, n) de permutaciones
+        rng: Generador aleatorio
+
+    Returns:
+        Array (m, n) de hijos
+    """
+    parents_a = np.asarray(parents_a)
+    union = np.concatenate((adjacency(parents_a), adjacency(parents_b)), axis=2).tolist()
+    return np.array([_erx_child(edges, int(parent[0]), rng) for edges, parent in zip(union, parents_a)],
+                    dtype=parents_a.dtype)
+
+
+def cx_erx(ind1, ind2, rng=random):
+    """
+    ERX para DEAP: cada individuo se sustituye por un hijo que empieza en su primera ciudad.
+
+    Returns:
+        Tupla (ind1, ind2) modificados
+    """
+    union = np.concatenate(adjacency([ind1, ind2]), axis=1).tolist()
+    child1 = _erx_child(union, ind1[0], rng)
+    child2 = _erx_child(union, ind2[0], rng)
+    ind1[:], ind2[:] = child1, child2
+    return ind1, ind2
+
+
+def _ab_cycles(adj_a, adj_b, rng):
+    """
+    Descompone las aristas no comunes de A y B en ciclos AB.
+
+    Un ciclo AB alterna aristas de A y de B. Se recorre un camino alterno al
+    azar y cada vez que vuelve a una ciudad en la misma fase se extrae el
+    ciclo cerrado.
+
+    Args:
+        adj_a: Vecinos de cada ciudad en A (lista de pares)
+        adj_b: Vecinos de cada ciudad en B (lista de pares)
+        rng: Generador aleatorio
+
+    Returns:
+        Lista de ciclos; cada ciclo es una lista de aristas (u, v, 0 para A / 1 para B)
+    """
+    n = len(adj_a)
+    remaining = ([list(row) for row in adj_a], [list(row) for row in adj_b])
+    for u in range(n):
+        for v in adj_a[u]:
+            if v in adj_b[u]:
+                remaining[0][u].remove(v)
+                remaining[1][u].remove(v)
+
+    cycles = []
+    starts = [u for u in range(n) if remaining[0][u]]
+    rng.shuffle(starts)
+    for start in starts:
+        while remaining[0][start]:
+            path, kinds = [start], []
+            marks = {(start, 0): 0}  # (ciudad, tipo de la siguiente arista) -> posición en el camino
+            current, kind = start, 0
+            while True:
+                options = remaining[kind][current]
+                if not options:
+                    break
+                nxt = options.pop(rng.randrange(len(options)))
+                remaining[kind][nxt].remove(current)
+                kinds.append(kind)
+                path.append(nxt)
+                current, kind = nxt, 1 - kind
+                position = marks.get((current, kind))
+                if position is None:
+                    marks[(current, kind)] = len(path) - 1
+                    continue
+                cycles.append([(path[k], path[k + 1], kinds[k]) for k in range(position, len(kinds))])
+                for k in range(position + 1, len(path) - 1):  # El último es path[position]
+                    marks.pop((path[k], kinds[k]), None)
+                del path[position + 1:]
+                del kinds[position:]
+                if len(path) == 1 and not remaining[kind][current]:
+                    break
+    return cycles
+
+
+def _components(adj):
+    """Etiqueta de subtour de cada ciudad y lista de ciudades de cada subtour."""
+    n = len(adj)
+    label = [-1] * n
+    members = []
+    for start in range(n):
+        if label[start] != -1:
+            continue
+        component = []
+        prev, current = -1, start
+        while label[current] == -1:
+            label[current] = len(members)
+            component.append(current)
+            a, b = adj[current]
+            prev, current = current, (b if a == prev else a)
+        members.append(component)
+    return label, members
+
+
+def _replace(adj, u, old, new):
+    """Sustituye el vecino old de u por new."""
+    row = adj[u]
+    row[row.index(old)] = new
+
+
+def _merge_subtours(adj, dist, neighbors):
+    """
+    Une los subtours del grafo de grado 2 con intercambios 2-opt baratos (modifica adj).
+
+    Para el subtour más pequeño se elige el par de aristas (u, u') propia y
+    (v, v') de otro subtour, con v vecino cercano de u, que menos alarga el
+    recorrido al cambiarlas por (u, v) y (u', v') o por (u, v') y (u', v).
+    """
+    label, members = _components(adj)
+    alive = {index: component for index, component in enumerate(members)}
+    while len(alive) > 1:
+        small = min(alive, key=lambda index: len(alive[index]))
+        best = None
+        for u in alive[small]:
+            candidates = [v for v in neighbors[u] if label[v] != small]
+            if not candidates and best is None:
+                candidates = [v for v in range(len(adj)) if label[v] != small]
+            for u2 in adj[u]:
+                removed_u = dist[u][u2]
+                for v in candidates:
+                    for v2 in adj[v]:
+                        base = removed_u + dist[v][v2]
+                        for a, b in ((v, v2), (v2, v)):
+                            delta = dist[u][a] + dist[u2][b] - base
+                            if best is None or delta < best[0]:
+                                best = (delta, u, u2, v, v2, a, b)
+        _, u, u2, v, v2, a, b = best
+        _replace(adj, u, u2, a)
+        _replace(adj, u2, u, b)
+        _replace(adj, v, v2, u if a == v else u2)
+        _replace(adj, v2, v, u if a == v2 else u2)
+        target = label[v]
+        for city in alive[small]:
+            label[city] = target
+        alive[target].extend(alive.pop(small))
+
+
+def _tour_from_adjacency(adj, start):
+    """Recorrido que sigue la tabla de adyacencia (un solo ciclo) desde start."""
+    tour = [start]
+    prev, current = start, adj[start][0]
+    while current != start:
+        tour.append(current)
+        a, b = adj[current]
+        prev, current = current, (b if a == prev else a)
+    return tour
+
+
+def _adjacency_length(adj, dist):
+    """Longitud del recorrido de una tabla de adyacencia (cada arista aparece dos veces)."""
+    return sum(dist[u][v] for u, row in enumerate(adj) for v in row) / 2
+
+
+def _eax_child(adj_a, adj_b, start, dist, neighbors, rng):
+    """
+    Hijo EAX de un solo ciclo AB aplicado al padre A.
+
+    Se prueban ciclos AB al azar (hasta EAX_TRIALS) y se acepta el primer hijo
+    que no sea más largo que el más largo de los padres.
+
+    Returns:
+        Recorrido como lista (el de A si los padres son iguales o ningún ciclo sirve)
+    """
+    cycles = _ab_cycles(adj_a, adj_b, rng)
+    rng.shuffle(cycles)
+    limit = max(_adjacency_length(adj_a, dist), _adjacency_length(adj_b, dist))
+    for cycle in cycles[:EAX_TRIALS]:
+        # Conjunto E: se quitan las aristas de A del ciclo y se añaden las de B
+        adj = [list(row) for row in adj_a]
+        for u, v, kind in cycle:
+            if kind == 0:
+                _replace(adj, u, v, None)
+                _replace(adj, v, u, None)
+        for u, v, kind in cycle:
+            if kind == 1:
+                _replace(adj, u, None, v)
+                _replace(adj, v, None, u)
+        _merge_subtours(adj, dist, neighbors)
+        if _adjacency_length(adj, dist) <= limit + 1e-9:
+            return _tour_from_adjacency(adj, start)
+    return _tour_from_adjacency([list(row) for row in adj_a], start)
+
+
+def eax_batch(parents_a, parents_b, dist, neighbors, rng=random):
+    """
+    EAX por lotes: un hijo por par de padres (A con un ciclo AB de B).
+
+    Args:
+        parents_a: Array (m, n) de permutaciones
+        parents_b: Array (m, n) de permutaciones
+        dist: Matriz de distancias (lista de listas)
+        neighbors: Vecinos más cercanos de cada ciudad (ver local_search.neighbor_lists)
+        rng: Generador aleatorio
+
+    Returns:
+        Array (m, n) de hijos
+    """
+    parents_a = np.asarray(parents_a)
+    table_a = adjacency(parents_a).tolist()
+    table_b = adjacency(parents_b).tolist()
+    return np.array([_eax_child(adj_a, adj_b, int(parent[0]), dist, neighbors, rng)
+                     for adj_a, adj_b, parent in zip(table_a, table_b, parents_a)],
+                    dtype=parents_a.dtype)
+
+
+def cx_eax(ind1, ind2, dist, neighbors, rng=random):
+    """
+    EAX para DEAP: ind1 recibe un ciclo AB de ind2 y viceversa.
+
+    Returns:
+        Tupla (ind1, ind2) modificados
+    """
+    table_1, table_2 = adjacency([ind1, ind2]).tolist()
+    child1 = _eax_child(table_1, table_2, ind1[0], dist, neighbors, rng)
+    child2 = _eax_child(table_2, table_1, ind2[0], dist, neighbors, rng)
+    ind1[:], ind2[:] = child1, child2
+    return ind1, ind2
@@ -1,98 +1,524 @@
 """
 Modelo: Database Manager
 Maneja todas las operaciones de base de datos.
+
+Las escrituras se encolan y las realiza un hilo de fondo (write-behind), de
+modo que el hilo del algoritmo nunca espera a la base de datos. Si Core.db
+(MySQL) no está disponible se usa una base SQLite local como sustituto.
+
+Cada ejecución registra también su mejor ruta indexada por el hash de la
+instancia (rutas_elite) y la población final de la última ejecución de cada
+instancia (poblaciones_finales), usadas para el arranque en caliente.
 """
 import json
+import queue
+import sqlite3
 import sys
 import os
+import threading
+import time
+from contextlib import contextmanager
 
 # Agregar ruta para importar desde Core
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'Core'))
 
-try:
-    from Core.db import (
-        get_connection, init_db, guardar_resultado, 
-        obtener_historial, set_db_config
-    )
-    CORE_DB_AVAILABLE = True
-except ImportError:
-    # Si no está disponible, crear versión simplificada
-    CORE_DB_AVAILABLE = False
+from config.config import DB_BACKEND, DB_POOL_SIZE, SQLITE_DB_FILE
+from utils.logger import get_logger
+
+logger = get_logger("db")
+
+# Filas de estadísticas por llamada a executemany
+STATS_BATCH_SIZE = 1000
+
+STATS_COLUMNS = ("ejecucion_id", "generacion", "mejor", "peor", "promedio", "desv", "tiempos")
+
+_core_db = None
+
+
+def load_core_db():
+    """
+    Importa Core.db (y con él el conector de MySQL) en el primer uso.
+
+    Returns:
+        Módulo Core.db o None si no está disponible (se usa el backend SQLite local)
+    """
+    global _core_db
+    if _core_db is None:
+        try:
+            from Core import db
+            _core_db = db
+        except ImportError:
+            _core_db = False
+    return _core_db or None
+
+
+class ConnectionPool:
+    """Pool de conexiones reutilizables de tamaño fijo."""
+
+    def __init__(self, factory, size):
+        """
+        Inicializa el pool creando todas las conexiones.
+
+        Args:
+            factory: Función sin argumentos que crea una conexión
+            size: Número de conexiones del pool
+        """
+        self._connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(factory())
+
+    @contextmanager
+    def connection(self):
+        """Presta una conexión del pool y la devuelve al terminar."""
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    def close(self):
+        """Cierra todas las conexiones del pool."""
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+def _stats_rows(ejecucion_id, stats):
+    """Convierte la lista de estadísticas por generación en filas para executemany."""
+    for entry in stats:
+        timings = entry.get('timings')
+        yield (ejecucion_id, entry['generation'], entry['best'], entry['worst'],
+               entry['avg'], entry['std'], json.dumps(timings) if timings else None)
+
+
+def _distinct_routes(fetch_page, limit):
+    """
+    Primeras rutas distintas de las filas de rutas_elite ordenadas por distancia.
+
+    Recorre el índice (instancia, distancia) por páginas y descarta repetidas
+    en Python, sin agrupar ni comparar en la base de datos las rutas completas.
+
+    Args:
+        fetch_page: Función (offset, count) -> filas (ruta,) ordenadas por distancia
+        limit: Número de rutas distintas
+
+    Returns:
+        Lista de hasta limit rutas
+    """
+    routes, seen, offset = [], set(), 0
+    while len(routes) < limit:
+        rows = fetch_page(offset, limit)
+        for (route,) in rows:
+            if route not in seen:
+                seen.add(route)
+                routes.append(json.loads(route))
+                if len(routes) == limit:
+                    break
+        if len(rows) < limit:
+            break
+        offset += len(rows)
+    return routes
+
+
+def _batches(rows, size):
+    """Agrupa un iterable de filas en listas de como mucho `size` elementos."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SQLiteBackend:
+    """Almacén local SQLite (sustituto cuando MySQL/Core.db no está disponible)."""
+
+    name = "sqlite"
+
+    def __init__(self, db_file, pool_size=DB_POOL_SIZE):
+        """
+        Inicializa el backend y crea las tablas si no existen.
+
+        Args:
+            db_file: Ruta del archivo SQLite
+            pool_size: Número de conexiones del pool
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        self.db_file = db_file
+        self.pool = ConnectionPool(
+            lambda: sqlite3.connect(db_file, check_same_thread=False, timeout=30), pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS ejecuciones (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fecha TEXT NOT NULL,
+                    distancia REAL NOT NULL,
+                    ruta TEXT NOT NULL,
+                    parametros TEXT
+                );
+                CREATE TABLE IF NOT EXISTS estadisticas_generacion (
+                    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id),
+                    generacion INTEGER NOT NULL,
+                    mejor REAL, peor REAL, promedio REAL, desv REAL,
+                    tiempos TEXT,
+                    PRIMARY KEY (ejecucion_id, generacion)
+                );
+                CREATE TABLE IF NOT EXISTS rutas_elite (
+                    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id),
+                    instancia TEXT NOT NULL,
+                    distancia REAL NOT NULL,
+                    ruta TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_rutas_elite_instancia ON rutas_elite (instancia, distancia);
+                CREATE TABLE IF NOT EXISTS poblaciones_finales (
+                    instancia TEXT PRIMARY KEY,
+                    ejecucion_id INTEGER NOT NULL,
+                    poblacion TEXT NOT NULL
+                );
+            """)
+            conn.commit()
+
+    def save_execution(self, best_route, best_distance, parameters, stats,
+                       instance_hash=None, final_population=None):
+        """
+        Guarda una ejecución, sus estadísticas y su ruta elite en una transacción.
+
+        Returns:
+            ID de la ejecución guardada
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO ejecuciones (fecha, distancia, ruta, parametros) VALUES (?, ?, ?, ?)",
+                (time.strftime("%Y-%m-%d %H:%M:%S"), best_distance, json.dumps(best_route),
+                 json.dumps(parameters, default=str)))
+            ejecucion_id = cursor.lastrowid
+            insert = (f"INSERT INTO estadisticas_generacion ({', '.join(STATS_COLUMNS)}) "
+                      f"VALUES ({', '.join('?' * len(STATS_COLUMNS))})")
+            for batch in _batches(_stats_rows(ejecucion_id, stats or []), STATS_BATCH_SIZE):
+                conn.executemany(insert, batch)
+            if instance_hash:
+                conn.execute(
+                    "INSERT INTO rutas_elite (ejecucion_id, instancia, distancia, ruta) VALUES (?, ?, ?, ?)",
+                    (ejecucion_id, instance_hash, best_distance, json.dumps(best_route)))
+                if final_population:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO poblaciones_finales (instancia, ejecucion_id, poblacion) "
+                        "VALUES (?, ?, ?)", (instance_hash, ejecucion_id, json.dumps(final_population)))
+            conn.commit()
+        return ejecucion_id
+
+    def get_elite_tours(self, instance_hash, limit):
+        """Mejores rutas distintas guardadas para la instancia, de menor a mayor distancia."""
+        with self.pool.connection() as conn:
+            return _distinct_routes(lambda offset, count: conn.execute(
+                "SELECT ruta FROM rutas_elite WHERE instancia = ? ORDER BY distancia LIMIT ? OFFSET ?",
+                (instance_hash, count, offset)).fetchall(), limit)
+
+    def get_last_population(self, instance_hash):
+        """Población final de la última ejecución guardada para la instancia (o None)."""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT poblacion FROM poblaciones_finales WHERE instancia = ?",
+                               (instance_hash,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_history(self, limit):
+        """Últimas ejecuciones guardadas, más recientes primero."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, fecha, distancia, ruta, parametros FROM ejecuciones ORDER BY id DESC LIMIT ?",
+                (limit,)).fetchall()
+        return [{'id': r[0], 'fecha': r[1], 'distancia': r[2], 'ruta': json.loads(r[3]),
+                 'parametros': json.loads(r[4]) if r[4] else {}} for r in rows]
+
+    def close(self):
+        """Cierra las conexiones del pool."""
+        self.pool.close()
+
+
+class MySQLBackend:
+    """Backend MySQL: registro principal vía Core.db y estadísticas por lotes con un pool propio."""
+
+    name = "mysql"
+
+    def __init__(self, config, pool_size=DB_POOL_SIZE):
+        """
+        Inicializa el backend con Core.db y crea la tabla de estadísticas.
+
+        Args:
+            config: Diccionario con configuración de BD (host, user, password, database, port)
+            pool_size: Número de conexiones del pool
+        """
+        self.config = config
+        self.core_db = load_core_db()
+        self.core_db.set_db_config(self.config)
+        self.core_db.init_db(self.config)
+
+        from mysql.connector import pooling
+        self.pool = pooling.MySQLConnectionPool(pool_name="tsp_writer", pool_size=pool_size, **config)
+        conn = self.pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS estadisticas_generacion (
+                    ejecucion_id INT NOT NULL,
+                    generacion INT NOT NULL,
+                    mejor DOUBLE, peor DOUBLE, promedio DOUBLE, desv DOUBLE,
+                    tiempos TEXT,
+                    PRIMARY KEY (ejecucion_id, generacion)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rutas_elite (
+                    ejecucion_id INT NOT NULL,
+                    instancia CHAR(64) NOT NULL,
+                    distancia DOUBLE NOT NULL,
+                    ruta MEDIUMTEXT NOT NULL,
+                    INDEX idx_rutas_elite_instancia (instancia, distancia)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS poblaciones_finales (
+                    instancia CHAR(64) PRIMARY KEY,
+                    ejecucion_id INT NOT NULL,
+                    poblacion LONGTEXT NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()  # Devuelve la conexión al pool
+
+    def save_execution(self, best_route, best_distance, parameters, stats,
+                       instance_hash=None, final_population=None):
+        """
+        Guarda la ejecución con Core.db y sus estadísticas y ruta elite con executemany.
+
+        Returns:
+            ID de la ejecución guardada o None si falla
+        """
+        mejor_individuo = {
+            "ruta": best_route,
+            "distancia": best_distance
+        }
+        ejecucion_id = self.core_db.guardar_resultado(mejor_individuo, best_distance, parameters, self.config)
+        if not ejecucion_id or not (stats or instance_hash):
+            return ejecucion_id
+
+        insert = (f"INSERT INTO estadisticas_generacion ({', '.join(STATS_COLUMNS)}) "
+                  f"VALUES ({', '.join(['%s'] * len(STATS_COLUMNS))})")
+        conn = self.pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            for batch in _batches(_stats_rows(ejecucion_id, stats or []), STATS_BATCH_SIZE):
+                cursor.executemany(insert, batch)
+            if instance_hash:
+                cursor.execute(
+                    "INSERT INTO rutas_elite (ejecucion_id, instancia, distancia, ruta) VALUES (%s, %s, %s, %s)",
+                    (ejecucion_id, instance_hash, best_distance, json.dumps(best_route)))
+                if final_population:
+                    cursor.execute(
+                        "REPLACE INTO poblaciones_finales (instancia, ejecucion_id, poblacion) VALUES (%s, %s, %s)",
+                        (instance_hash, ejecucion_id, json.dumps(final_population)))
+            conn.commit()
+        finally:
+            conn.close()
+        return ejecucion_id
+
+    def _fetch(self, query, args):
+        """Ejecuta una consulta con una conexión del pool y retorna todas las filas."""
+        conn = self.pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, args)
+            return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def get_elite_tours(self, instance_hash, limit):
+        """Mejores rutas distintas guardadas para la instancia, de menor a mayor distancia."""
+        return _distinct_routes(lambda offset, count: self._fetch(
+            "SELECT ruta FROM rutas_elite WHERE instancia = %s ORDER BY distancia LIMIT %s OFFSET %s",
+            (instance_hash, count, offset)), limit)
+
+    def get_last_population(self, instance_hash):
+        """Población final de la última ejecución guardada para la instancia (o None)."""
+        rows = self._fetch("SELECT poblacion FROM poblaciones_finales WHERE instancia = %s",
+                           (instance_hash,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_history(self, limit):
+        """Historial de ejecuciones vía Core.db."""
+        return self.core_db.obtener_historial(limit, self.config)
+
+    def close(self):
+        """Las conexiones del pool de mysql.connector se cierran al salir."""
+
+
+class ResultWriter:
+    """Hilo de fondo que ejecuta las escrituras encoladas en orden."""
+
+    def __init__(self):
+        """Inicializa la cola y arranca el hilo escritor."""
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, on_done=None):
+        """
+        Encola una escritura.
+
+        Args:
+            func: Función a ejecutar en el hilo escritor
+            *args: Argumentos de la función
+            on_done: Callback opcional con el valor retornado por func
+        """
+        self._queue.put((func, args, on_done))
+
+    def _run(self):
+        """Bucle del hilo escritor."""
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                func, args, on_done = job
+                try:
+                    result = func(*args)
+                    if on_done:
+                        on_done(result)
+                except Exception as e:
+                    logger.exception("✗ Error en escritura diferida: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Espera a que se completen todas las escrituras encoladas."""
+        self._queue.join()
+
+    def close(self):
+        """Completa las escrituras pendientes y detiene el hilo."""
+        self._queue.put(None)
+        self._thread.join()
 
 
 class DatabaseManager:
     """Gestor de base de datos para el sistema."""
-    
-    def __init__(self, config):
+
+    def __init__(self, config, backend=DB_BACKEND):
         """
         Inicializa el gestor de base de datos.
-        
+
         Args:
             config: Diccionario con configuración de BD (host, user, password, database, port)
+            backend: "auto" (MySQL si Core.db está disponible, si no SQLite), "mysql", "sqlite" o "none"
         """
         self.config = config
         self.ejecucion_id = None
-        
-        if CORE_DB_AVAILABLE:
+        self.backend = None
+        self.writer = None
+
+        if backend in ("auto", "mysql") and load_core_db() is not None:
             # Configurar y inicializar BD usando Core.db
-            set_db_config(self.config)
-            init_db(self.config)
+            self.backend = MySQLBackend(self.config)
+        elif backend in ("auto", "sqlite"):
+            if backend == "auto":
+                logger.warning("⚠ Core.db no disponible, usando SQLite local: %s", SQLITE_DB_FILE)
+            self.backend = SQLiteBackend(SQLITE_DB_FILE)
         else:
-            print("[ADVERTENCIA] Core.db no disponible, base de datos deshabilitada")
-    
-    def save_execution(self, best_route, best_distance, parameters):
+            logger.warning("⚠ Base de datos deshabilitada")
+
+        if self.backend is not None:
+            self.writer = ResultWriter()
+
+    def save_execution(self, best_route, best_distance, parameters, stats=None,
+                       instance_hash=None, final_population=None):
         """
-        Guarda una ejecución del algoritmo en la base de datos.
-        
+        Encola el guardado de una ejecución del algoritmo y retorna de inmediato.
+
+        La escritura la realiza el hilo de fondo; al completarse se actualiza
+        self.ejecucion_id.
+
         Args:
             best_route: Mejor ruta encontrada
             best_distance: Mejor distancia encontrada
             parameters: Parámetros de la ejecución
-            
+            stats: Estadísticas por generación (incluidos tiempos por fase) a guardar por lotes
+            instance_hash: Hash de la matriz; si se indica, la ruta queda disponible para arranque en caliente
+            final_population: Población final a conservar como punto de control de la instancia
+        """
+        if self.backend is None or self.writer is None:
+            logger.warning("⚠ Base de datos no disponible, no se guardó la ejecución")
+            return
+
+        def on_saved(ejecucion_id):
+            if ejecucion_id:
+                self.ejecucion_id = ejecucion_id
+                logger.info("Ejecución guardada con ID: %s (%d generaciones)", ejecucion_id, len(stats or []))
+
+        self.writer.submit(self.backend.save_execution, list(best_route), best_distance,
+                           dict(parameters), stats, instance_hash, final_population, on_done=on_saved)
+
+    def get_warm_start_routes(self, instance_hash, top_k, include_population=True):
+        """
+        Obtiene rutas guardadas de la instancia para sembrar la población inicial.
+
+        Las escrituras pendientes se completan antes de consultar.
+
+        Args:
+            instance_hash: Hash del contenido de la matriz (ver matrix_hash)
+            top_k: Número de mejores rutas históricas
+            include_population: Si True, añade la población final de la última ejecución
+
         Returns:
-            ID de la ejecución guardada o None si falla
+            Lista de rutas sin duplicados, primero las elite
         """
-        if not CORE_DB_AVAILABLE:
-            print("[ADVERTENCIA] Base de datos no disponible, no se guardó la ejecución")
-            return None
-        
-        mejor_individuo = {
-            "ruta": best_route,
-            "distancia": best_distance
-        }
-        
-        ejecucion_id = guardar_resultado(
-            mejor_individuo, 
-            best_distance, 
-            parameters, 
-            self.config
-        )
-        
-        if ejecucion_id:
-            self.ejecucion_id = ejecucion_id
-            print(f"[BD] Ejecución guardada con ID: {ejecucion_id}")
-        
-        return ejecucion_id
-    
+        if self.backend is None:
+            return []
+
+        self.writer.flush()
+        routes = self.backend.get_elite_tours(instance_hash, top_k)
+        if include_population:
+            routes += self.backend.get_last_population(instance_hash) or []
+
+        seen = set()
+        unique = []
+        for route in routes:
+            if tuple(route) not in seen:
+                seen.add(tuple(route))
+                unique.append(route)
+        return unique
+
     def get_history(self, limit=50):
         """
         Obtiene el historial de ejecuciones.
-        
+
+        Las escrituras pendientes se completan antes de consultar.
+
         Args:
             limit: Número máximo de resultados a retornar
-            
+
         Returns:
             Lista de ejecuciones guardadas
         """
-        if not CORE_DB_AVAILABLE:
+        if self.backend is None:
             return []
-        
-        return obtener_historial(limit, self.config)
-    
-    def is_available(self):
-        """Retorna True si la base de datos está disponible."""
-        return CORE_DB_AVAILABLE
 
+        self.writer.flush()
+        return self.backend.get_history(limit)
 
+    def flush(self):
+        """Espera a que se completen las escrituras pendientes."""
+        if self.writer is not None:
+            self.writer.flush()
 
+    def close(self):
+        """Completa las escrituras pendientes y libera las conexiones."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if self.backend is not None:
+            self.backend.close()
 
+    def is_available(self):
+        """Retorna True si la base de datos está disponible."""
+        return self.backend is not None
@@ -0,0 +1,467 @@
+"""
+Modelo: Decomposition
+Descomposición espacial para instancias muy grandes.
+
+1. Las ciudades se agrupan en clústeres: k-means sobre coordenadas o, si
+   solo hay matriz, k-medoides sobre una muestra (estilo CLARA) y asignación
+   de todas las ciudades al medoide más cercano.
+2. Se resuelve el recorrido entre clústeres (centroides o medoides) con
+   vecino más cercano y 2-opt/Or-opt, y para cada par consecutivo se eligen
+   la ciudad de salida de uno y la de entrada del siguiente.
+3. Cada clúster es un subproblema de GeneticAlgorithmTSP: la arista
+   entrada-salida tiene coste muy negativo, así que el mejor recorrido
+   cerrado la contiene y, al quitarla, queda el camino de la entrada a la
+   salida (pulido después con búsqueda local). Los subproblemas se reparten
+   entre los esclavos MPI o un pool local.
+4. Los caminos se concatenan en el orden de los clústeres y se mejora una
+   ventana de ciudades alrededor de cada frontera con búsqueda local.
+
+Con coordenadas nunca se construye la matriz completa: las distancias se
+calculan al vuelo (CoordinateDistances) y cada subproblema recibe solo su
+submatriz, así que la memoria y el tiempo por rank dependen del tamaño del
+clúster y no del de la instancia.
+"""
+import math
+import multiprocessing
+import time
+
+import numpy as np
+
+from config.config import (DECOMPOSITION_CLUSTER_SIZE, DECOMPOSITION_BOUNDARY_WINDOW, ILS_NEIGHBORS,
+                           CROSSOVER_OPERATOR)
+from models.local_search import neighbor_lists, nearest_neighbor_tour, local_search
+
+# Iteraciones máximas de k-means y de k-medoides
+KMEANS_ITERATIONS = 25
+
+# Ciudades de la muestra de k-medoides por medoide (y mínimo absoluto)
+MEDOID_SAMPLE_PER_CLUSTER = 5
+MEDOID_SAMPLE_MIN = 500
+
+# Filas por bloque al asignar puntos a centros (limita la memoria de la matriz puntos x centros)
+ASSIGN_BLOCK = 4096
+
+
+class _CoordinateRow:
+    """Fila dist[i] de CoordinateDistances."""
+
+    __slots__ = ('xy', 'x', 'y')
+
+    def __init__(self, xy, origin):
+        self.xy = xy
+        self.x, self.y = origin
+
+    def __getitem__(self, j):
+        x, y = self.xy[j]
+        return math.hypot(x - self.x, y - self.y)
+
+
+class CoordinateDistances:
+    """Distancias euclídeas calculadas al vuelo: dist[i][j] sin matriz densa."""
+
+    def __init__(self, coords):
+        """
+        Args:
+            coords: Array (n, 2) de coordenadas
+        """
+        self.coords = np.asarray(coords, dtype=float)
+        self._xy = self.coords.tolist()
+
+    def __len__(self):
+        return len(self._xy)
+
+    def __getitem__(self, i):
+        return _CoordinateRow(self._xy, self._xy[i])
+
+    def submatrix(self, cities):
+        """Matriz densa (lista de listas) entre las ciudades indicadas."""
+        points = self.coords[cities]
+        return np.sqrt(((points[:, np.newaxis, :] - points[np.newaxis, :, :]) ** 2).sum(axis=-1)).tolist()
+
+
+def _assign(points, centers):
+    """Índice del centro más cercano de cada punto (por bloques)."""
+    labels = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), ASSIGN_BLOCK):
+        block = points[start:start + ASSIGN_BLOCK]
+        d = ((block[:, np.newaxis, :] - centers[np.newaxis, :, :]) ** 2).sum(axis=-1)
+        labels[start:start + ASSIGN_BLOCK] = d.argmin(axis=1)
+    return labels
+
+
+def kmeans(coords, k, rng, iterations=KMEANS_ITERATIONS):
+    """
+    k-means (Lloyd) con inicialización k-means++.
+
+    Args:
+        coords: Array (n, 2)
+        k: Número de clústeres
+        rng: numpy.random.Generator
+        iterations: Iteraciones máximas
+
+    Returns:
+        Tupla (etiquetas (n,), centros (k, 2))
+    """
+    n = len(coords)
+    k = max(1, min(k, n))
+    centers = np.empty((k, coords.shape[1]))
+    centers[0] = coords[rng.integers(n)]
+    d2 = ((coords - centers[0]) ** 2).sum(axis=1)
+    for index in range(1, k):
+        total = d2.sum()
+        choice = rng.choice(n, p=d2 / total) if total > 0 else rng.integers(n)
+        centers[index] = coords[choice]
+        d2 = np.minimum(d2, ((coords - centers[index]) ** 2).sum(axis=1))
+
+    labels = None
+    for _ in range(iterations):
+        new_labels = _assign(coords, centers)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        filled = counts > 0
+        for axis in range(coords.shape[1]):
+            sums = np.bincount(labels, weights=coords[:, axis], minlength=k)
+            centers[filled, axis] = sums[filled] / counts[filled]
+    return labels, centers
+
+
+def sample_medoids(matrix, k, rng, iterations=KMEANS_ITERATIONS):
+    """
+    k-medoides sobre una muestra de ciudades y asignación de todas al medoide más cercano.
+
+    Args:
+        matrix: Matriz de distancias (array NumPy n x n)
+        k: Número de clústeres
+        rng: numpy.random.Generator
+        iterations: Iteraciones máximas de k-medoides sobre la muestra
+
+    Returns:
+        Tupla (etiquetas (n,), medoides (k,) como índices de ciudad)
+    """
+    n = len(matrix)
+    k = max(1, min(k, n))
+    sample = rng.choice(n, min(n, max(MEDOID_SAMPLE_MIN, MEDOID_SAMPLE_PER_CLUSTER * k)), replace=False)
+    sub = matrix[np.ix_(sample, sample)]
+
+    # Inicialización k-medoides++ y alternancia asignar / recalcular medoide
+    medoids = [int(rng.integers(len(sample)))]
+    nearest = sub[medoids[0]].copy()
+    for _ in range(1, k):
+        weights = nearest ** 2
+        total = weights.sum()
+        medoids.append(int(rng.choice(len(sample), p=weights / total)) if total > 0
+                       else int(rng.integers(len(sample))))
+        nearest = np.minimum(nearest, sub[medoids[-1]])
+    medoids = np.array(medoids)
+    for _ in range(iterations):
+        labels = sub[:, medoids].argmin(axis=1)
+        updated = medoids.copy()
+        for cluster in range(k):
+            members = np.flatnonzero(labels == cluster)
+            if len(members):
+                updated[cluster] = members[sub[np.ix_(members, members)].sum(axis=1).argmin()]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+
+    medoids = sample[medoids]
+    return matrix[:, medoids].argmin(axis=1), medoids
+
+
+def _path_length(path, dist):
+    """Longitud de un camino abierto."""
+    return sum(dist[a][b] for a, b in zip(path[:-1], path[1:]))
+
+
+def _nearest_neighbor_path(dist, entry, exit_):
+    """Camino greedy de entry a exit_ por todas las ciudades de la submatriz."""
+    m = len(dist)
+    remaining = set(range(m)) - {entry, exit_}
+    path = [entry]
+    while remaining:
+        row = dist[path[-1]]
+        city = min(remaining, key=row.__getitem__)
+        remaining.remove(city)
+        path.append(city)
+    if exit_ != entry:
+        path.append(exit_)
+    return path
+
+
+def _fix_endpoints(route, entry, exit_):
+    """Rota (e invierte si hace falta) un recorrido cerrado con la arista entry-exit_ para que vaya de entry a exit_."""
+    index = route.index(entry)
+    route = route[index:] + route[:index]
+    if len(route) > 1 and route[1] == exit_:
+        route = [entry] + route[1:][::-1]
+    return route
+
+
+def _anchor(matrix, entry, exit_):
+    """Copia de la submatriz con la arista entry-exit_ muy negativa (camino con extremos fijos)."""
+    anchored = [list(row) for row in matrix]
+    if entry != exit_:
+        big = len(matrix) * max(max(row) for row in matrix) + 1.0
+        anchored[entry][exit_] = anchored[exit_][entry] = -big
+    return anchored
+
+
+def solve_subproblem(params):
+    """
+    Camino de la entrada a la salida de un clúster con el algoritmo genético y búsqueda local.
+
+    Se ejecuta en los esclavos (TAG_SUBPROBLEM) o en el pool local.
+
+    Args:
+        params: Diccionario con index, matrix (submatriz), entry y exit (índices
+                locales), pop_size, num_generations, crossover_operator, seed y neighbors
+
+    Returns:
+        Tupla (index, camino en índices locales, evaluaciones)
+    """
+    from models.genetic_algorithm import GeneticAlgorithmTSP
+
+    matrix, entry, exit_ = params['matrix'], params['entry'], params['exit']
+    m = len(matrix)
+    if m <= 3:
+        return params['index'], _nearest_neighbor_path(matrix, entry, exit_), 0
+
+    anchored = _anchor(matrix, entry, exit_)
+    # La ruta greedy contiene la arista ancla: el mejor individuo siempre la conserva
+    start = _nearest_neighbor_path(matrix, entry, exit_)
+    ga = GeneticAlgorithmTSP(anchored, pop_size=params['pop_size'], num_generations=params['num_generations'],
+                             phase_timing=False, seed=params['seed'], initial_individuals=[start],
+                             crossover_operator=params['crossover_operator'])
+    route, _, _, _ = ga.run()
+    route = local_search(list(route), anchored, neighbor_lists(anchored, params['neighbors']))
+    return params['index'], _fix_endpoints(route, entry, exit_), ga.evaluations
+
+
+class DecompositionTSP:
+    """Descomposición espacial con el mismo contrato que GeneticAlgorithmTSP."""
+
+    def __init__(self, dist_matrix=None, coords=None, pop_size=50, num_generations=100,
+                 cluster_size=DECOMPOSITION_CLUSTER_SIZE, crossover_operator=CROSSOVER_OPERATOR,
+                 seed=42, mpi_handler=None, processes=1, neighbors=ILS_NEIGHBORS,
+                 boundary_window=DECOMPOSITION_BOUNDARY_WINDOW):
+        """
+        Inicializa el motor.
+
+        Args:
+            dist_matrix: Matriz de distancias (si no hay coordenadas)
+            coords: Array (n, 2) de coordenadas (instancias sin matriz completa)
+            pop_size: Población del algoritmo genético de cada subproblema
+            num_generations: Generaciones de cada subproblema
+            cluster_size: Ciudades objetivo por clúster
+            crossover_operator: Recombinación de los subproblemas ('ox', 'erx' o 'eax')
+            seed: Semilla (clústeres y subproblemas)
+            mpi_handler: MPIHandler del maestro: los subproblemas se reparten entre los esclavos
+            processes: Procesos del pool local (sin MPI)
+            neighbors: Vecinos por ciudad de la búsqueda local
+            boundary_window: Ciudades a cada lado de una frontera en la mejora final
+        """
+        if coords is None and dist_matrix is None:
+            raise ValueError("Se necesita una matriz de distancias o coordenadas")
+        self.coords = np.asarray(coords, dtype=float) if coords is not None else None
+        self.matrix = np.asarray(dist_matrix, dtype=float) if coords is None else None
+        self.dist = CoordinateDistances(self.coords) if coords is not None else self.matrix.tolist()
+        self.num_cities = len(self.dist)
+        self.pop_size = pop_size
+        self.num_generations = num_generations
+        self.cluster_size = max(2, cluster_size)
+        self.crossover_operator = crossover_operator
+        self.seed = seed
+        self.mpi_handler = mpi_handler
+        self.processes = processes
+        self.neighbors = neighbors
+        self.boundary_window = boundary_window
+        self.callback = None
+
+        # Mismos atributos de resultado que GeneticAlgorithmTSP
+        self.phase_totals = {}
+        self.evaluations = 0
+        self.final_population = None
+        self.num_clusters = 0
+
+    def set_callback(self, callback):
+        """
+        Establece callback para actualizar la UI.
+
+        Args:
+            callback: Función (paso, mejor, peor, media, desviación, timings=None); el
+                      paso va de 0 a num_generations a medida que se resuelven clústeres
+        """
+        self.callback = callback
+
+    def _submatrix(self, cities):
+        if self.coords is not None:
+            return self.dist.submatrix(cities)
+        return self.matrix[np.ix_(cities, cities)].tolist()
+
+    def _partition(self, rng):
+        """Clústeres (listas de ciudades) y sus representantes (centroides o medoides)."""
+        k = math.ceil(self.num_cities / self.cluster_size)
+        if self.coords is not None:
+            labels, centers = kmeans(self.coords, k, rng)
+        else:
+            labels, centers = sample_medoids(self.matrix, k, rng)
+        # Un clúster puede quedar vacío: solo se conservan los que tienen ciudades
+        clusters = [np.flatnonzero(labels == index) for index in range(k)]
+        keep = [index for index, members in enumerate(clusters) if len(members)]
+        clusters = [clusters[index].tolist() for index in keep]
+        if self.coords is not None:
+            return clusters, CoordinateDistances(centers[keep]), [centers[index] for index in keep]
+        medoids = centers[keep]
+        return clusters, self.matrix[np.ix_(medoids, medoids)].tolist(), [int(medoid) for medoid in medoids]
+
+    def _cluster_order(self, representatives):
+        """Recorrido entre clústeres: vecino más cercano y 2-opt/Or-opt sobre sus representantes."""
+        k = len(representatives)
+        if k <= 3:
+            return list(range(k))
+        dist = representatives.submatrix(list(range(k))) if isinstance(representatives, CoordinateDistances) \
+            else representatives
+        tour = nearest_neighbor_tour(dist, 0)
+        return local_search(tour, dist, neighbor_lists(dist, self.neighbors))
+
+    def _closest(self, cities, target, exclude=None):
+        """Ciudad de cities más cercana a target (coordenadas o índice de ciudad)."""
+        candidates = [city for city in cities if city != exclude] or cities
+        if self.coords is not None:
+            point = self.coords[target] if np.isscalar(target) else target
+            d = ((self.coords[candidates] - point) ** 2).sum(axis=1)
+        else:
+            d = self.matrix[candidates, target]
+        return candidates[int(np.argmin(d))]
+
+    def _endpoints(self, clusters, order, targets):
+        """Ciudad de entrada y de salida de cada clúster según el orden de visita."""
+        k = len(order)
+        entries, exits = {}, {}
+        for position, current in enumerate(order):
+            following = order[(position + 1) % k]
+            exits[current] = self._closest(clusters[current], targets[following], entries.get(current))
+            entries[following] = self._closest(clusters[following], exits[current], exits.get(following))
+        return entries, exits
+
+    def _subproblems(self, clusters, entries, exits, seeds):
+        for index, cities in enumerate(clusters):
+            yield {
+                'index': index,
+                'matrix': self._submatrix(cities),
+                'entry': cities.index(entries[index]),
+                'exit': cities.index(exits[index]),
+                'pop_size': self.pop_size,
+                'num_generations': self.num_generations,
+                'crossover_operator': self.crossover_operator,
+                'seed': int(seeds[index]),
+                'neighbors': self.neighbors,
+            }
+
+    def _solve_all(self, subproblems, count):
+        """Resuelve los subproblemas (esclavos MPI, pool local o en serie) y los entrega al terminar."""
+        handler = self.mpi_handler
+        if handler is not None and handler.live_slaves():
+            yield from handler.solve_subproblems(subproblems, count)
+        elif self.processes > 1 and count > 1:
+            with multiprocessing.Pool(min(self.processes, count)) as pool:
+                yield from pool.imap_unordered(solve_subproblem, subproblems)
+        else:
+            for params in subproblems:
+                yield solve_subproblem(params)
+
+    def _report(self, step, total_steps, length, stats_list):
+        """Registra la longitud del recorrido actual y llama al callback."""
+        generation = round(self.num_generations * step / total_steps)
+        entry = {'generation': generation, 'best': length, 'worst': length, 'avg': length, 'std': 0.0}
+        stats_list.append(entry)
+        if self.callback:
+            self.callback(generation, length, length, length, 0.0)
+
+    def _improve_boundaries(self, tour, joints):
+        """
+        Búsqueda local en una ventana alrededor de cada frontera entre clústeres.
+
+        Cada ventana es un camino con extremos fijos: las ciudades cambian de
+        posición solo dentro de la ventana y el resto del recorrido no se toca.
+        """
+        n = len(tour)
+        window = self.boundary_window
+        if window < 2 or 2 * window >= n:
+            return
+        for joint in joints:
+            positions = [(joint - window + 1 + offset) % n for offset in range(2 * window)]
+            cities = [tour[position] for position in positions]
+            anchored = _anchor(self._submatrix(cities), 0, len(cities) - 1)
+            path = list(range(len(cities)))
+            path = local_search(path, anchored, neighbor_lists(anchored, self.neighbors))
+            path = _fix_endpoints(path, 0, len(cities) - 1)
+            for position, local in zip(positions, path):
+                tour[position] = cities[local]
+
+    def _tour_length(self, tour):
+        return _path_length(tour, self.dist) + self.dist[tour[-1]][tour[0]]
+
+    def run(self):
+        """
+        Ejecuta la descomposición.
+
+        Returns:
+            Tupla (mejor_ruta, mejor_distancia, tiempo_total, estadisticas)
+        """
+        start_time = time.time()
+        phase_start = time.perf_counter()
+        phases = {}
+
+        def lap(phase):
+            nonlocal phase_start
+            now = time.perf_counter()
+            phases[phase] = phases.get(phase, 0.0) + now - phase_start
+            phase_start = now
+
+        rng = np.random.default_rng(self.seed)
+        clusters, representatives, targets = self._partition(rng)
+        self.num_clusters = len(clusters)
+        lap('partition')
+        order = self._cluster_order(representatives)
+        entries, exits = self._endpoints(clusters, order, targets)
+        lap('order')
+
+        # Caminos provisionales (entrada, resto en orden, salida) hasta resolver cada clúster
+        paths = {}
+        for index, cities in enumerate(clusters):
+            middle = [city for city in cities if city not in (entries[index], exits[index])]
+            paths[index] = [entries[index]] + middle + ([exits[index]] if exits[index] != entries[index] else [])
+        lengths = {index: _path_length(path, self.dist) for index, path in paths.items()}
+        connections = sum(self.dist[exits[a]][entries[b]] for a, b in zip(order, order[1:] + order[:1]))
+        stats_list = []
+        total_steps = len(clusters) + 1
+        self._report(0, total_steps, sum(lengths.values()) + connections, stats_list)
+
+        seeds = np.random.default_rng(self.seed).integers(0, 2 ** 31, size=len(clusters))
+        subproblems = self._subproblems(clusters, entries, exits, seeds)
+        self.evaluations = 0
+        for solved, (index, local_path, evaluations) in enumerate(self._solve_all(subproblems, len(clusters)), 1):
+            paths[index] = [clusters[index][city] for city in local_path]
+            lengths[index] = _path_length(paths[index], self.dist)
+            self.evaluations += evaluations
+            self._report(solved, total_steps, sum(lengths.values()) + connections, stats_list)
+        lap('solve')
+
+        # Recorrido completo y fronteras (posición de la última ciudad de cada clúster)
+        tour, joints = [], []
+        for index in order:
+            tour.extend(paths[index])
+            joints.append(len(tour) - 1)
+        lap('stitch')
+        self._improve_boundaries(tour, joints)
+        best_distance = self._tour_length(tour)
+        lap('boundary')
+        self._report(total_steps, total_steps, best_distance, stats_list)
+
+        self.phase_totals = phases
+        self.final_population = [tour]
+        total_time = time.time() - start_time
+        return tour, best_distance, total_time, stats_list
@@ -4,14 +4,10 @@ Contiene toda la lógica del algoritmo genético para resolver TSP.
 """
 import random
 import numpy as np
-from deap import algorithms, base, creator, tools
-
-try:
-    from mpi4py import MPI
-    MPI_AVAILABLE = True
-except ImportError:
-    MPI_AVAILABLE = False
-    MPI = None
+from deap import base, creator, tools
+from config.config import (CROSSOVER_OPERATOR, ADAPTIVE_OPERATORS, REPLACEMENT_STRATEGY, REPLACEMENT_ELITES,
+                           REPLACEMENT_LAMBDA_RATIO, REPLACEMENT_MAX_AGE)
+from utils.phase_timer import create_phase_timer
 
 
 # Configurar DEAP solo una vez
@@ -25,7 +21,11 @@ class GeneticAlgorithmTSP:
     """Algoritmo Genético para resolver el problema del Viajero de Comercio (TSP)."""
     
     def __init__(self, dist_matrix, pop_size=50, crossover_rate=0.8, 
-                 mutation_rate=0.1, num_generations=100, mpi_map=None):
+                 mutation_rate=0.1, num_generations=100, mpi_map=None,
+                 phase_timing=True, seed=42, initial_individuals=None, tournament_size=3,
+                 crossover_operator=CROSSOVER_OPERATOR, adaptive=ADAPTIVE_OPERATORS, stats_file=None,
+                 replacement=REPLACEMENT_STRATEGY, elites=REPLACEMENT_ELITES,
+                 lambda_ratio=REPLACEMENT_LAMBDA_RATIO, max_age=REPLACEMENT_MAX_AGE):
         """
         Inicializa el algoritmo genético.
         
@@ -36,6 +36,21 @@ class GeneticAlgorithmTSP:
             mutation_rate: Probabilidad de mutación
             num_generations: Número de generaciones
             mpi_map: Función mapper para MPI (opcional)
+            phase_timing: Si True, mide el tiempo de cada fase de cada generación
+            seed: Semilla del generador aleatorio (misma semilla y parámetros = mismo resultado)
+            initial_individuals: Rutas con las que sembrar la población inicial (arranque en caliente)
+            tournament_size: Número de individuos por torneo de selección
+            crossover_operator: Recombinación 'ox' (orden), 'erx' (aristas) o 'eax' (ensamblado de aristas)
+            adaptive: Si True, operadores, tasas y torneo se eligen durante la ejecución
+                      según la mejora que producen (ver models/adaptive_operators.py)
+            stats_file: Si se indica, las estadísticas por generación se escriben en
+                        este archivo en lugar de acumularse en memoria, y run retorna
+                        una versión reducida (ver utils/stats_stream.py)
+            replacement: Reemplazo 'generational', 'elitist', 'plus' (μ+λ), 'comma' (μ,λ)
+                         o 'age' (ver models/replacement.py)
+            elites: Padres conservados en cada generación con reemplazo 'elitist'
+            lambda_ratio: Hijos por padre (λ/μ) con reemplazo 'plus', 'comma' o 'age'
+            max_age: Generaciones máximas de un individuo con reemplazo 'age'
         """
         self.dist_matrix = dist_matrix
         self.num_cities = len(dist_matrix)
@@ -43,6 +58,17 @@ class GeneticAlgorithmTSP:
         self.crossover_rate = crossover_rate
         self.mutation_rate = mutation_rate
         self.num_generations = num_generations
+        self.phase_timing = phase_timing
+        self.seed = seed
+        self.initial_individuals = initial_individuals or []
+        self.tournament_size = tournament_size
+        self.crossover_operator = crossover_operator
+        self.adaptive = adaptive
+        self.stats_file = stats_file
+        self.replacement = replacement
+        self.elites = elites
+        self.lambda_ratio = lambda_ratio
+        self.max_age = max_age
         
         # Configurar toolbox
         self.toolbox = base.Toolbox()
@@ -50,6 +76,21 @@ class GeneticAlgorithmTSP:
         
         # Estadísticas para callback
         self.callback = None
+        
+        # Tiempos acumulados por fase del último run
+        self.phase_totals = {}
+        
+        # Evaluaciones de fitness del run en curso (leídas por el exportador de métricas)
+        self.evaluations = 0
+        
+        # Selección adaptativa del último run (None si adaptive es False)
+        self.adaptation = None
+        
+        # Mejor individuo encontrado, población final y buffers de estadísticas (se reinician en run)
+        self.best_individual = None
+        self.final_population = None
+        self._fitness_buffer = None
+        self._scratch_buffer = None
     
     def _setup_toolbox(self, mpi_map=None):
         """Configura las operaciones genéticas en el toolbox."""
@@ -59,9 +100,9 @@ class GeneticAlgorithmTSP:
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
         
         # Operadores genéticos
-        self.toolbox.register("mate", tools.cxOrdered)
+        self._register_crossover()
         self.toolbox.register("mutate", tools.mutShuffleIndexes, indpb=0.05)
-        self.toolbox.register("select", tools.selTournament, tournsize=3)
+        self.toolbox.register("select", tools.selTournament, tournsize=self.tournament_size)
         self.toolbox.register("evaluate", self._eval_tsp)
         
         # Mapper (paralelo si hay MPI, secuencial si no)
@@ -70,6 +111,33 @@ class GeneticAlgorithmTSP:
         else:
             self.toolbox.register("map", map)
     
+    def _register_crossover(self):
+        """Registra el operador de recombinación elegido en crossover_operator."""
+        self.toolbox.register("mate", self._crossover_function(self.crossover_operator))
+    
+    def _crossover_function(self, name):
+        """
+        Función de cruce de DEAP para un operador.
+        
+        Args:
+            name: 'ox', 'erx' o 'eax'
+            
+        Returns:
+            Función (ind1, ind2) que modifica ambos individuos
+        """
+        if name == 'ox':
+            return tools.cxOrdered
+        if name == 'erx':
+            from models.crossover import cx_erx
+            return cx_erx
+        if name == 'eax':
+            from functools import partial
+            from models.crossover import cx_eax, EAX_NEIGHBORS
+            from models.local_search import neighbor_lists
+            dist = [list(row) for row in self.dist_matrix]
+            return partial(cx_eax, dist=dist, neighbors=neighbor_lists(dist, EAX_NEIGHBORS))
+        raise ValueError(f"Operador de recombinación desconocido: {name}")
+    
     def _eval_tsp(self, individual):
         """
         Evalúa un individuo calculando la distancia total del recorrido.
@@ -85,117 +153,247 @@ class GeneticAlgorithmTSP:
             distance += self.dist_matrix[gene1][gene2]
         return distance,
     
+    def _seed_population(self, population):
+        """
+        Sustituye los primeros individuos de la población por las rutas iniciales.
+        
+        Se descartan las rutas que no son permutaciones válidas de las ciudades
+        (por ejemplo, guardadas para otra instancia).
+        
+        Args:
+            population: Población aleatoria recién creada
+            
+        Returns:
+            Número de individuos sembrados
+        """
+        cities = list(range(self.num_cities))
+        seeded = 0
+        for route in self.initial_individuals:
+            if seeded >= len(population):
+                break
+            if sorted(route) == cities:
+                population[seeded] = creator.Individual(route)
+                seeded += 1
+        return seeded
+    
     def set_callback(self, callback):
-        """Establece una función callback para actualizar la interfaz después de cada generación."""
+        """
+        Establece una función callback para actualizar la interfaz después de cada generación.
+        
+        El callback recibe (generation, best, worst, avg, std, timings=...), donde
+        timings es un diccionario fase -> segundos o None si la medición está deshabilitada.
+        """
         self.callback = callback
     
-    def run(self):
+    def _compute_stats(self, population):
         """
-        Ejecuta el algoritmo genético.
+        Calcula las estadísticas de la generación en una sola extracción de fitness.
+        
+        Los fitness se copian en un buffer NumPy reutilizado entre generaciones y
+        todos los agregados (mínimo, máximo, media, desviación) salen de ese buffer.
         
+        Args:
+            population: Población evaluada
+            
         Returns:
-            Tupla (mejor_ruta, mejor_distancia, tiempo_total, estadisticas)
+            Tupla (registro, indice_del_mejor) donde registro tiene best, worst, avg y std
         """
-        import time
-        start_time = time.time()
+        n = len(population)
+        if self._fitness_buffer is None or len(self._fitness_buffer) != n:
+            self._fitness_buffer = np.empty(n)
+            self._scratch_buffer = np.empty(n)
+        fits = self._fitness_buffer
+        fits[:] = [ind.fitness.values[0] for ind in population]
         
-        # Inicializar población
-        random.seed(42)
-        population = self.toolbox.population(n=self.pop_size)
+        best_index = int(fits.argmin())
+        mean = fits.sum() / n
+        np.subtract(fits, mean, out=self._scratch_buffer)
+        variance = np.dot(self._scratch_buffer, self._scratch_buffer) / n
         
-        # Configurar estadísticas
-        stats = tools.Statistics(lambda ind: ind.fitness.values)
-        stats.register("avg", np.mean)
-        stats.register("std", np.std)
-        stats.register("min", np.min)
-        stats.register("max", np.max)
+        record = {
+            'best': float(fits[best_index]),
+            'worst': float(fits.max()),
+            'avg': float(mean),
+            'std': float(np.sqrt(variance))
+        }
+        return record, best_index
+    
+    def _end_generation(self, generation, population, timer, stats_list, operators=None):
+        """
+        Registra estadísticas, actualiza el mejor global y llama al callback.
         
-        # Hall of Fame para guardar el mejor
-        hof = tools.HallOfFame(1)
+        Args:
+            generation: Número de generación
+            population: Población evaluada de la generación
+            timer: Temporizador de fases de la generación
+            stats_list: Lista de estadísticas (o StatsStreamWriter) donde añadir el registro
+            operators: Tasas y probabilidades de operadores de la generación (modo adaptativo)
+        """
+        record, best_index = self._compute_stats(population)
+        timer.lap('stats')
         
-        # Logbook para estadísticas
-        logbook = tools.Logbook()
+        # Mejor global: solo se clona cuando mejora
+        if self.best_individual is None or record['best'] < self.best_individual.fitness.values[0]:
+            self.best_individual = self.toolbox.clone(population[best_index])
+        timer.lap('hof')
         
-        # Evaluar población inicial
-        fitnesses = list(self.toolbox.map(self.toolbox.evaluate, population))
-        for ind, fit in zip(population, fitnesses):
-            ind.fitness.values = fit
+        if self.callback:
+            self.callback(generation, record['best'], record['worst'], record['avg'], record['std'],
+                          timings=timer.snapshot())
+        timer.lap('callback')
         
-        # Registrar estadísticas iniciales
-        record = stats.compile(population)
-        logbook.record(gen=0, **record)
+        entry = {'generation': generation}
+        entry.update(record)
+        if operators is not None:
+            entry['operators'] = operators
+        timings = timer.stop()
+        if timings is not None:
+            entry['timings'] = timings
+        stats_list.append(entry)
+    
+    def _open_stats_stream(self):
+        """Crea el escritor de estadísticas en disco, o None si no hay stats_file."""
+        if not self.stats_file:
+            return None
+        from utils.stats_stream import StatsStreamWriter, stats_fields
+        metadata = {
+            'num_cities': self.num_cities,
+            'pop_size': self.pop_size,
+            'num_generations': self.num_generations,
+            'crossover_operator': self.crossover_operator,
+            'adaptive': self.adaptive,
+            'replacement': self.replacement,
+            'elites': self.elites,
+            'lambda_ratio': self.lambda_ratio,
+            'max_age': self.max_age,
+            'seed': self.seed,
+        }
+        return StatsStreamWriter(self.stats_file, stats_fields(self.phase_timing, self.adaptive), metadata)
+    
+    def run(self):
+        """
+        Ejecuta el algoritmo genético.
         
-        # Llamar callback si existe
-        if self.callback:
-            best = min(ind.fitness.values[0] for ind in population)
-            worst = max(ind.fitness.values[0] for ind in population)
-            avg = np.mean([ind.fitness.values[0] for ind in population])
-            std = np.std([ind.fitness.values[0] for ind in population])
-            self.callback(0, best, worst, avg, std)
-        
-        # Evolución generacional
-        for generation in range(1, self.num_generations + 1):
-            # Seleccionar próxima generación
-            offspring = self.toolbox.select(population, len(population))
-            offspring = list(map(self.toolbox.clone, offspring))
-            
-            # Aplicar cruce
-            for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < self.crossover_rate:
-                    self.toolbox.mate(child1, child2)
-                    del child1.fitness.values
-                    del child2.fitness.values
-            
-            # Aplicar mutación
-            for mutant in offspring:
-                if random.random() < self.mutation_rate:
-                    self.toolbox.mutate(mutant)
-                    del mutant.fitness.values
+        Returns:
+            Tupla (mejor_ruta, mejor_distancia, tiempo_total, estadisticas)
+        """
+        import time
+        start_time = time.time()
+        timer = create_phase_timer(self.phase_timing)
+        stream = self._open_stats_stream()
+        stats_list = stream if stream is not None else []
+        self.best_individual = None
+        self._fitness_buffer = None
+        self.evaluations = 0
+        
+        try:
+            # Inicializar población
+            timer.start()
+            random.seed(self.seed)
+            population = self.toolbox.population(n=self.pop_size)
+            if self.initial_individuals:
+                self._seed_population(population)
+            timer.lap('init')
             
-            # Evaluar individuos sin fitness
-            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = list(self.toolbox.map(self.toolbox.evaluate, invalid_ind))
-            for ind, fit in zip(invalid_ind, fitnesses):
+            # Evaluar población inicial
+            fitnesses = list(self.toolbox.map(self.toolbox.evaluate, population))
+            for ind, fit in zip(population, fitnesses):
                 ind.fitness.values = fit
+            self.evaluations += len(population)
+            timer.lap('evaluate')
             
-            # Actualizar población
-            population[:] = offspring
+            # Registrar estadísticas iniciales
+            self._end_generation(0, population, timer, stats_list)
             
-            # Actualizar Hall of Fame
-            hof.update(population)
+            # Selección adaptativa: operadores y tasas elegidos por la mejora que producen
+            adaptation = None
+            if self.adaptive:
+                from models.adaptive_operators import AdaptiveOperators, MUTATIONS, ARMS
+                adaptation = AdaptiveOperators()
+                crossovers = {name: self._crossover_function(name) for name in ARMS['crossover']}
+            self.adaptation = adaptation
+            crossover_rate, mutation_rate = self.crossover_rate, self.mutation_rate
             
-            # Registrar estadísticas
-            record = stats.compile(population)
-            logbook.record(gen=generation, **record)
+            # Selección de supervivientes (con λ hijos por generación en plus, comma y age)
+            from models.replacement import Replacement
+            replacement = Replacement(self.replacement, len(population), self.elites, self.lambda_ratio, self.max_age)
+            replacement.reset(population)
+            num_offspring = replacement.offspring_size
             
-            # Llamar callback si existe
-            if self.callback:
-                best = min(ind.fitness.values[0] for ind in population)
-                worst = max(ind.fitness.values[0] for ind in population)
-                avg = np.mean([ind.fitness.values[0] for ind in population])
-                std = np.std([ind.fitness.values[0] for ind in population])
-                self.callback(generation, best, worst, avg, std)
+            # Evolución generacional
+            for generation in range(1, self.num_generations + 1):
+                timer.start()
+                
+                # Seleccionar próxima generación
+                if adaptation is not None:
+                    rates = adaptation.start_generation()
+                    crossover_rate, mutation_rate = rates['crossover_rate'], rates['mutation_rate']
+                    offspring = self.toolbox.select(population, num_offspring, tournsize=rates['tournament_size'])
+                else:
+                    offspring = self.toolbox.select(population, num_offspring)
+                timer.lap('select')
+                offspring = list(map(self.toolbox.clone, offspring))
+                timer.lap('clone')
+                
+                # Aplicar cruce
+                for child1, child2 in zip(offspring[::2], offspring[1::2]):
+                    if random.random() < crossover_rate:
+                        if adaptation is not None:
+                            operator = adaptation.choose('crossover')
+                            parents_best = min(child1.fitness.values[0], child2.fitness.values[0])
+                            crossovers[operator](child1, child2)
+                            adaptation.track(child1, 'crossover', operator, parents_best)
+                            adaptation.track(child2, 'crossover', operator, parents_best)
+                        else:
+                            self.toolbox.mate(child1, child2)
+                        del child1.fitness.values
+                        del child2.fitness.values
+                timer.lap('mate')
+                
+                # Aplicar mutación
+                for mutant in offspring:
+                    if random.random() < mutation_rate:
+                        if adaptation is not None:
+                            operator = adaptation.choose('mutation')
+                            reference = adaptation.reference(mutant)
+                            MUTATIONS[operator](mutant)
+                            adaptation.track(mutant, 'mutation', operator, reference)
+                        else:
+                            self.toolbox.mutate(mutant)
+                        del mutant.fitness.values
+                timer.lap('mutate')
+                
+                # Evaluar individuos sin fitness
+                invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+                fitnesses = list(self.toolbox.map(self.toolbox.evaluate, invalid_ind))
+                for ind, fit in zip(invalid_ind, fitnesses):
+                    ind.fitness.values = fit
+                self.evaluations += len(invalid_ind)
+                timer.lap('evaluate')
+                
+                # Actualizar población
+                population[:] = replacement.select(population, offspring)
+                timer.lap('replace')
+                
+                # Créditos de los operadores y estadísticas, mejor global y callback
+                operators = adaptation.end_generation() if adaptation is not None else None
+                self._end_generation(generation, population, timer, stats_list, operators)
+        finally:
+            # También ante excepciones (evaluación, MPI, callback): el archivo queda completo hasta aquí
+            if stream is not None:
+                stream.close()
         
         # Obtener mejor solución
-        best_individual = hof[0]
-        best_route = list(best_individual)
-        best_distance = best_individual.fitness.values[0]
+        best_route = list(self.best_individual)
+        best_distance = self.best_individual.fitness.values[0]
+        self.final_population = [list(ind) for ind in population]
         
         total_time = time.time() - start_time
+        self.phase_totals = timer.summary()
         
-        # Convertir estadísticas a lista de diccionarios
-        stats_list = []
-        for entry in logbook:
-            stats_list.append({
-                'generation': entry['gen'],
-                'best': entry['min'],
-                'worst': entry['max'],
-                'avg': entry['avg'],
-                'std': entry['std']
-            })
+        # Estadísticas en disco: se retorna la serie reducida leída del archivo
+        if stream is not None:
+            from utils.stats_stream import StatsStream
+            stats_list = StatsStream(stream.path).to_entries()
         
         return best_route, best_distance, total_time, stats_list
-
-
-
-
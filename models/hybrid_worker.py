@@ -0,0 +1,77 @@
+"""
+Modelo: Hybrid Worker
+Evaluación multihilo de un esclavo en modo híbrido (un rank por nodo).
+
+Cada bloque de rutas recibido del maestro se divide entre los hilos de un
+ThreadPoolExecutor que comparten la matriz del rank (una sola copia por
+nodo). Cada hilo calcula las longitudes de su parte con NumPy, que libera el
+GIL en el indexado y la suma, así que los hilos avanzan en paralelo.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Rutas mínimas por hilo: en bloques pequeños repartir cuesta más que evaluar
+MIN_ROUTES_PER_THREAD = 4
+
+
+def route_lengths(matrix, routes):
+    """
+    Longitud de varias rutas cerradas con la misma longitud.
+
+    Suma las aristas en el mismo orden que GeneticAlgorithmTSP._eval_tsp
+    (primero la de cierre, luego en orden) con una suma acumulada, que a
+    diferencia de sum (por pares) es secuencial: el resultado coincide bit
+    a bit con la evaluación en serie.
+
+    Args:
+        matrix: Matriz de distancias (array NumPy)
+        routes: Array (rutas, ciudades) de índices
+
+    Returns:
+        Array (rutas,) de longitudes
+    """
+    origins = np.concatenate((routes[:, -1:], routes[:, :-1]), axis=1)
+    return np.cumsum(matrix[origins, routes], axis=1)[:, -1]
+
+
+class ThreadedEvaluator:
+    """Reparte cada bloque de rutas entre los hilos de un pool sobre la matriz compartida."""
+
+    def __init__(self, dist_matrix, threads=0):
+        """
+        Args:
+            dist_matrix: Matriz de distancias recibida del maestro
+            threads: Hilos del pool (0 = uno por CPU del nodo)
+        """
+        self.matrix = np.asarray(dist_matrix, dtype=float)
+        self.threads = threads or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(self.threads, thread_name_prefix="eval")
+
+    def _evaluate_part(self, routes):
+        return route_lengths(self.matrix, np.asarray(routes, dtype=np.intp))
+
+    def evaluate(self, routes):
+        """
+        Evalúa un bloque de rutas.
+
+        Args:
+            routes: Lista de rutas (listas de ciudades)
+
+        Returns:
+            Lista de tuplas (distancia,) en el mismo orden, como el bucle de esclavo
+        """
+        parts = min(self.threads, len(routes) // MIN_ROUTES_PER_THREAD)
+        if parts <= 1:
+            lengths = self._evaluate_part(routes).tolist()
+        else:
+            bounds = np.linspace(0, len(routes), parts + 1).astype(int)
+            chunks = [routes[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+            lengths = [length for part in self.executor.map(self._evaluate_part, chunks)
+                       for length in part.tolist()]
+        return [(length,) for length in lengths]
+
+    def close(self):
+        """Detiene los hilos del pool."""
+        self.executor.shutdown(wait=True)
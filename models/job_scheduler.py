@@ -0,0 +1,599 @@
+"""
+Modelo: Job Scheduler
+Planificador de trabajos concurrentes en el rank 0.
+
+Los trabajos (desde la GUI o desde un archivo JSON Lines) se agrupan en
+lotes. En cada lote los esclavos sanos (no descartados por el maestro) se
+reparten en subcomunicadores creados con Create_group, uno por trabajo y de
+tamaño proporcional a su coste; el rank más
+bajo de cada grupo ejecuta el algoritmo genético y usa al resto de su grupo
+como evaluadores, informando del progreso y del resultado al maestro.
+Al terminar el lote los grupos se disuelven y los esclavos vuelven al bucle
+de COMM_WORLD. Si un líder no envía progreso ni resultado en MPI_TASK_TIMEOUT
+segundos, su grupo se descarta y el trabajo termina con error.
+
+Un trabajo con "starts" > 1 es un portafolio multi-arranque: cada rank del
+grupo ejecuta arranques independientes (semillas derivadas de "seed") y el
+mejor recorrido se elige con Allreduce MINLOC. Sin esclavos y con
+processes > 1, los arranques se reparten en el pool de procesos.
+
+Con "engine": "ils" el trabajo usa la búsqueda local iterada
+(models/local_search.py) en lugar del algoritmo genético: cada rank del grupo
+ejecuta una cadena ("generations" son rondas de "kicks_per_round"
+perturbaciones); sin esclavos se ejecutan "chains" cadenas en el proceso.
+
+Sin esclavos, los trabajos se ejecutan en este proceso o, con processes > 1,
+en un pool de procesos.
+
+Formato de una línea del archivo de trabajos (todos los campos son opcionales):
+    {"job_id": "a", "matrix_file": "data/distancias.json", "num_cities": 30,
+     "matrix_seed": 1, "pop_size": 50, "crossover_rate": 0.8,
+     "mutation_rate": 0.1, "tournament_size": 3, "generations": 100,
+     "seed": 42, "target": 2085, "starts": 1, "engine": "ga",
+     "kicks_per_round": 20, "chains": 4, "crossover_operator": "eax", "adaptive": false,
+     "replacement": "plus", "elites": 2, "lambda_ratio": 2, "max_age": 5}
+"""
+import itertools
+import json
+import multiprocessing
+import threading
+import time
+from collections import deque
+
+from config.config import (DEFAULT_POP_SIZE, DEFAULT_CROSSOVER_RATE, DEFAULT_MUTATION_RATE,
+                           DEFAULT_GENERATIONS, DEFAULT_SEED, ILS_KICKS_PER_ROUND, CROSSOVER_OPERATOR,
+                           ADAPTIVE_OPERATORS, REPLACEMENT_STRATEGY, REPLACEMENT_ELITES,
+                           REPLACEMENT_LAMBDA_RATIO, REPLACEMENT_MAX_AGE, MPI_TASK_TIMEOUT)
+from models.mpi_handler import MPIHandler, MPI, TAG_JOB_PROGRESS, TAG_JOB_RESULT
+from utils.logger import get_logger
+from utils.seeds import spawn_seeds
+
+logger = get_logger("scheduler")
+
+# Segundos mínimos entre dos mensajes de progreso de un mismo trabajo
+PROGRESS_INTERVAL = 0.5
+
+
+def load_jobs_file(filepath):
+    """
+    Lee un archivo de trabajos en formato JSON Lines.
+
+    Las líneas vacías y las que empiezan por '#' se ignoran.
+
+    Args:
+        filepath: Ruta al archivo
+
+    Returns:
+        Lista de diccionarios de trabajo
+    """
+    jobs = []
+    with open(filepath, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                jobs.append(json.loads(line))
+    return jobs
+
+
+def resolve_matrix(job):
+    """
+    Obtiene la matriz de distancias de un trabajo.
+
+    Usa, por orden, 'dist_matrix', 'matrix_file' (JSON o texto) o una matriz
+    aleatoria de 'num_cities' ciudades con semilla 'matrix_seed'.
+
+    Args:
+        job: Diccionario de trabajo
+
+    Returns:
+        Matriz de distancias como lista de listas
+    """
+    from utils.matrix_loader import MatrixLoader, create_random_matrix
+
+    if job.get('dist_matrix') is not None:
+        return job['dist_matrix']
+    if job.get('matrix_file'):
+        path = job['matrix_file']
+        if path.endswith('.json'):
+            matrix, _ = MatrixLoader.load_from_json(path)
+        else:
+            matrix = MatrixLoader.load_from_file(path)
+        if matrix is None:
+            raise ValueError(f"No se pudo cargar la matriz de {path}")
+        return matrix
+    return create_random_matrix(job.get('num_cities', 17), seed=job.get('matrix_seed'))
+
+
+def is_collective(job):
+    """Si todos los ranks del grupo ejecutan el trabajo (portafolio o búsqueda local)."""
+    return job.get('starts', 1) > 1 or job.get('engine') == 'ils'
+
+
+def job_cost(job):
+    """Coste relativo de un trabajo: evaluaciones (o perturbaciones) por ciudad en toda la ejecución."""
+    if job.get('engine') == 'ils':
+        per_generation = job.get('kicks_per_round', ILS_KICKS_PER_ROUND) * job.get('chains', 1)
+    else:
+        per_generation = job.get('pop_size', DEFAULT_POP_SIZE)
+    return (len(job['dist_matrix']) * per_generation
+            * (job.get('generations', DEFAULT_GENERATIONS) + 1) * job.get('starts', 1))
+
+
+def _group_limit(job):
+    """Ranks máximos útiles para un trabajo: uno por arranque o cadena, o un evaluador por individuo."""
+    if job.get('starts', 1) > 1:
+        return job['starts']
+    if job.get('engine') == 'ils':
+        return job.get('chains') or float('inf')
+    return job.get('pop_size', DEFAULT_POP_SIZE) + 1
+
+
+def plan_partition(jobs, num_slaves):
+    """
+    Decide cuántos ranks recibe cada trabajo de un lote.
+
+    Cada trabajo recibe un líder y los ranks restantes se asignan de uno en
+    uno al trabajo con mayor coste por rank, sin superar un evaluador por
+    individuo ni un rank por arranque (más no se aprovecharían).
+
+    Args:
+        jobs: Trabajos del lote (como mucho num_slaves)
+        num_slaves: Ranks disponibles
+
+    Returns:
+        Lista con el tamaño del grupo de cada trabajo
+    """
+    costs = [job_cost(job) for job in jobs]
+    limits = [_group_limit(job) for job in jobs]
+    sizes = [1] * len(jobs)
+
+    for _ in range(num_slaves - len(jobs)):
+        candidates = [i for i in range(len(jobs)) if sizes[i] < limits[i]]
+        if not candidates:
+            break
+        i = max(candidates, key=lambda j: costs[j] / sizes[j])
+        sizes[i] += 1
+    return sizes
+
+
+def _create_engine(job, mpi_map=None, comm=None):
+    """Algoritmo genético o búsqueda local iterada según job['engine']."""
+    num_generations = job.get('generations', DEFAULT_GENERATIONS)
+    seed = job.get('seed', DEFAULT_SEED)
+    if job.get('engine') == 'ils':
+        from models.local_search import IteratedLocalSearchTSP
+        return IteratedLocalSearchTSP(
+            dist_matrix=job['dist_matrix'],
+            num_generations=num_generations,
+            kicks_per_round=job.get('kicks_per_round', ILS_KICKS_PER_ROUND),
+            chains=job.get('chains', 1),
+            seed=seed,
+            comm=comm
+        )
+
+    from models.genetic_algorithm import GeneticAlgorithmTSP
+    return GeneticAlgorithmTSP(
+        dist_matrix=job['dist_matrix'],
+        pop_size=job.get('pop_size', DEFAULT_POP_SIZE),
+        crossover_rate=job.get('crossover_rate', DEFAULT_CROSSOVER_RATE),
+        mutation_rate=job.get('mutation_rate', DEFAULT_MUTATION_RATE),
+        num_generations=num_generations,
+        mpi_map=mpi_map,
+        phase_timing=False,
+        seed=seed,
+        tournament_size=job.get('tournament_size', 3),
+        crossover_operator=job.get('crossover_operator', CROSSOVER_OPERATOR),
+        adaptive=job.get('adaptive', ADAPTIVE_OPERATORS),
+        replacement=job.get('replacement', REPLACEMENT_STRATEGY),
+        elites=job.get('elites', REPLACEMENT_ELITES),
+        lambda_ratio=job.get('lambda_ratio', REPLACEMENT_LAMBDA_RATIO),
+        max_age=job.get('max_age', REPLACEMENT_MAX_AGE)
+    )
+
+
+def _run_job(job, mpi_map=None, on_progress=None, comm=None):
+    """
+    Ejecuta el algoritmo de un trabajo.
+
+    Args:
+        job: Diccionario de trabajo con 'dist_matrix'
+        mpi_map: Mapper de evaluación del algoritmo genético (secuencial si es None)
+        on_progress: Función (job_id, generación, mejor, total_generaciones), limitada en frecuencia
+        comm: Comunicador del grupo para la búsqueda local (una cadena por rank)
+
+    Returns:
+        Diccionario con job_id, seed, best_route, best_distance, total_time,
+        time_to_target (None si no se alcanza 'target'), curve (mejor por generación) y stats
+    """
+    num_generations = job.get('generations', DEFAULT_GENERATIONS)
+    seed = job.get('seed', DEFAULT_SEED)
+    engine = _create_engine(job, mpi_map, comm)
+
+    target = job.get('target')
+    time_to_target = [None]
+    last_report = [0.0]
+
+    def job_callback(generation, best, worst, avg, std_dev, timings=None):
+        if time_to_target[0] is None and target is not None and best <= target:
+            time_to_target[0] = time.perf_counter() - start
+        if on_progress is not None:
+            now = time.monotonic()
+            if generation == num_generations or now - last_report[0] >= PROGRESS_INTERVAL:
+                last_report[0] = now
+                on_progress(job['job_id'], generation, best, num_generations)
+
+    engine.set_callback(job_callback)
+
+    start = time.perf_counter()
+    best_route, best_distance, total_time, stats = engine.run()
+    return {
+        'job_id': job['job_id'],
+        'seed': seed,
+        'best_route': best_route,
+        'best_distance': best_distance,
+        'total_time': total_time,
+        'time_to_target': time_to_target[0],
+        'curve': [entry['best'] for entry in stats],
+        'stats': stats
+    }
+
+
+def _run_start(job, on_progress=None):
+    """
+    Ejecuta un arranque de un portafolio (también usado por el pool).
+
+    Returns:
+        Tupla (resultado o None si falla, resumen del arranque)
+    """
+    try:
+        result = _run_job(job, on_progress=on_progress)
+    except Exception as e:
+        # Registrar el fallo sin abandonar las operaciones colectivas del grupo
+        logger.exception("Error en el arranque %d del trabajo %s: %s", job['seed'], job['job_id'], e)
+        return None, {'seed': job['seed'], 'error': str(e)}
+    return result, {key: result[key] for key in ('seed', 'best_distance', 'total_time', 'time_to_target')}
+
+
+def _run_portfolio(job, comm=None, on_progress=None, processes=1):
+    """
+    Ejecuta un trabajo multi-arranque y retorna el mejor recorrido de todos.
+
+    Con comm, todos los ranks del grupo llaman a esta función: cada uno
+    ejecuta una parte de los arranques y el ganador se elige con
+    Allreduce MINLOC sobre (distancia, rank). Sin comm y con processes > 1,
+    cada arranque se ejecuta en un proceso del pool y gana el de menor
+    distancia (el primero en caso de empate, como MINLOC).
+
+    Args:
+        job: Diccionario de trabajo con 'starts'
+        comm: Subcomunicador del grupo (None para ejecutar todo en este proceso)
+        on_progress: Función de progreso (solo se usa en el rank 0 del grupo y sin pool)
+        processes: Procesos del pool sin comm
+
+    Returns:
+        Resultado del mejor arranque con 'starts' y 'runs' (resumen de cada
+        arranque); solo es completo en el rank 0 del grupo
+    """
+    rank, size = (comm.Get_rank(), comm.Get_size()) if comm is not None else (0, 1)
+    seeds = spawn_seeds(job.get('seed', DEFAULT_SEED), job['starts'])
+    starts = [dict(job, seed=seed) for seed in seeds[rank::size]]
+
+    if comm is None and processes > 1:
+        with multiprocessing.Pool(min(processes, len(starts))) as pool:
+            outcomes = pool.map(_run_start, starts)
+    else:
+        outcomes = [_run_start(start, on_progress if rank == 0 else None) for start in starts]
+
+    best = None
+    runs = []
+    for result, run in outcomes:
+        runs.append(run)
+        if result is not None and (best is None or result['best_distance'] < best['best_distance']):
+            best = result
+
+    if comm is not None:
+        local_best = best['best_distance'] if best is not None else float('inf')
+        _, winner = comm.allreduce((local_best, rank), op=MPI.MINLOC)
+        best = comm.bcast(best if rank == winner else None, root=winner)
+        gathered = comm.gather(runs, root=0)
+        runs = [run for part in gathered for run in part] if rank == 0 else runs
+
+    if best is None:
+        raise RuntimeError("Ningún arranque terminó correctamente")
+    return dict(best, job_id=job['job_id'], starts=len(seeds), runs=runs)
+
+
+def _execute_local(job, on_progress=None, processes=1):
+    """
+    Ejecuta un trabajo completo en este proceso (también usado por el pool).
+
+    Args:
+        job: Diccionario de trabajo
+        on_progress: Función de progreso
+        processes: Procesos entre los que repartir los arranques de un portafolio
+                   (1 dentro de un proceso del pool, que no puede crear otro)
+
+    Returns:
+        Resultado del trabajo con ranks y wall_time, o con 'error' si falla
+    """
+    start = time.perf_counter()
+    try:
+        if job.get('starts', 1) > 1:
+            result = _run_portfolio(job, on_progress=on_progress, processes=processes)
+        else:
+            result = _run_job(job, on_progress=on_progress)
+    except Exception as e:
+        result = {'job_id': job['job_id'], 'error': str(e)}
+    result['ranks'] = 1
+    result['wall_time'] = time.perf_counter() - start
+    return result
+
+
+def run_partition(world_handler, assignment):
+    """
+    Lado esclavo de un lote: se une a su grupo y ejecuta su papel hasta que termina.
+
+    El líder del grupo (rank 0 del subcomunicador) ejecuta el trabajo usando al
+    resto del grupo como evaluadores y envía progreso y resultado al maestro.
+    En un portafolio todos los ranks del grupo reciben el trabajo y ejecutan
+    arranques; en una búsqueda local cada rank ejecuta una cadena.
+
+    Args:
+        world_handler: MPIHandler del esclavo sobre COMM_WORLD
+        assignment: Tupla (color, trabajo, ranks del grupo en COMM_WORLD)
+    """
+    color, job, members = assignment
+    world_group = world_handler.comm.Get_group()
+    members_group = world_group.Incl(members)
+    subcomm = world_handler.comm.Create_group(members_group, tag=color)
+    members_group.Free()
+    world_group.Free()
+
+    world = world_handler.comm
+    group = MPIHandler(comm=subcomm)
+    collective = job is not None and is_collective(job)
+    portfolio = collective and job.get('starts', 1) > 1
+    try:
+        if not group.is_master() and not collective:
+            group.run_slave_loop()
+            return
+
+        def send_progress(*progress):
+            world.send(progress, dest=0, tag=TAG_JOB_PROGRESS)
+
+        if group.is_master():
+            logger.info("Líder del trabajo %s con %d %s", job['job_id'], group.get_size() - 1,
+                        "ranks de arranque" if portfolio else "cadenas" if collective else "evaluadores")
+        start = time.perf_counter()
+        try:
+            if portfolio:
+                result = _run_portfolio(job, subcomm, send_progress)
+            elif collective:
+                result = _run_job(job, None, send_progress if group.is_master() else None, subcomm)
+            else:
+                mpi_map = group.create_mpi_map(job['dist_matrix']) if group.get_size() > 1 else None
+                result = _run_job(job, mpi_map, send_progress)
+        except Exception as e:
+            logger.exception("Error ejecutando el trabajo %s: %s", job['job_id'], e)
+            result = {'job_id': job['job_id'], 'error': str(e)}
+        finally:
+            if not collective:
+                group.shutdown_slaves()
+        if not group.is_master():
+            return
+        result['ranks'] = group.get_size()
+        result['wall_time'] = time.perf_counter() - start
+        world.send(result, dest=0, tag=TAG_JOB_RESULT)
+    finally:
+        subcomm.Free()
+
+
+class JobScheduler:
+    """Cola de trabajos del maestro que los ejecuta por lotes concurrentes."""
+
+    def __init__(self, mpi_handler, lock=None, on_progress=None, on_result=None, processes=1):
+        """
+        Inicializa el planificador.
+
+        Args:
+            mpi_handler: MPIHandler del maestro sobre COMM_WORLD
+            lock: Cerrojo compartido con otros usos del cluster (ej. ejecución desde la GUI)
+            on_progress: Función (job_id, generación, mejor, total_generaciones)
+            on_result: Función (trabajo, resultado) al terminar cada trabajo
+            processes: Sin esclavos MPI, trabajos simultáneos en un pool de procesos
+                       (con más de uno no se informa del progreso)
+        """
+        self.mpi_handler = mpi_handler
+        self.processes = processes
+        self.lock = lock or threading.Lock()
+        self.on_progress = on_progress
+        self.on_result = on_result
+        self.results = []
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._thread = None
+
+    def _num_slaves(self):
+        if not self.mpi_handler.is_available:
+            return 0
+        return len(self.mpi_handler.live_slaves())
+
+    def submit(self, job):
+        """
+        Encola un trabajo.
+
+        Args:
+            job: Diccionario de trabajo (ver formato en la cabecera del módulo)
+
+        Returns:
+            Identificador del trabajo
+        """
+        job = dict(job)
+        job.setdefault('job_id', f"job-{next(self._ids)}")
+        job['dist_matrix'] = resolve_matrix(job)
+        with self._condition:
+            self._queue.append(job)
+            self._condition.notify()
+        return job['job_id']
+
+    def pending(self):
+        """Número de trabajos en cola."""
+        with self._condition:
+            return len(self._queue)
+
+    def start(self):
+        """Arranca un hilo de fondo que ejecuta los trabajos según se encolan."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="job-scheduler", daemon=True)
+            self._thread.start()
+
+    def _worker(self):
+        """Bucle del hilo de fondo."""
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+            self.run_pending()
+
+    def _next_batch(self):
+        """Saca de la cola los trabajos del siguiente lote (uno por esclavo o proceso como máximo)."""
+        with self._condition:
+            size = self._num_slaves() or max(1, self.processes)
+            return [self._queue.popleft() for _ in range(min(size, len(self._queue)))]
+
+    def run_pending(self):
+        """Ejecuta todos los trabajos en cola, lote a lote, y retorna los resultados."""
+        results = []
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return results
+            with self.lock:
+                if self._num_slaves() > 0:
+                    results += self._run_batch(batch)
+                else:
+                    results += self._run_local(batch)
+
+    def _finish(self, job, result):
+        """Registra el resultado de un trabajo y avisa al callback."""
+        self.results.append(result)
+        if 'error' in result:
+            logger.error("Trabajo %s fallido: %s", job['job_id'], result['error'])
+        else:
+            logger.info("Trabajo %s completado: distancia %.2f en %.2f s (%d ranks)",
+                        job['job_id'], result['best_distance'], result['total_time'], result.get('ranks', 1))
+        if self.on_result:
+            self.on_result(job, result)
+
+    def _run_local(self, batch):
+        """
+        Sin esclavos: ejecuta los trabajos en un pool de procesos o uno tras otro en este proceso.
+
+        Un trabajo ejecutado en este proceso reparte sus arranques (portafolio) en el pool.
+        """
+        jobs = {job['job_id']: job for job in batch}
+        results = []
+        if self.processes > 1 and len(batch) > 1:
+            with multiprocessing.Pool(min(self.processes, len(batch))) as pool:
+                for result in pool.imap_unordered(_execute_local, batch):
+                    self._finish(jobs[result['job_id']], result)
+                    results.append(result)
+            return results
+
+        for job in batch:
+            result = _execute_local(job, self.on_progress, self.processes)
+            self._finish(job, result)
+            results.append(result)
+        return results
+
+    def _run_batch(self, batch):
+        """
+        Ejecuta un lote de trabajos en grupos de esclavos concurrentes.
+
+        Args:
+            batch: Trabajos del lote
+
+        Returns:
+            Lista de resultados en el orden en que terminaron
+        """
+        slaves = self.mpi_handler.live_slaves()
+        num_slaves = len(slaves)
+        sizes = plan_partition(batch, num_slaves)
+
+        # Ranks contiguos por grupo: con el hostfile, los grupos quedan dentro de un nodo
+        assignments = {}
+        leaders = {}  # Rank líder -> (trabajo, ranks del grupo)
+        next_index = 0
+        for color, (job, group_size) in enumerate(zip(batch, sizes)):
+            group = slaves[next_index:next_index + group_size]
+            assignments[group[0]] = (color, job)
+            leaders[group[0]] = (job, group)
+            member_job = job if is_collective(job) else None  # En un portafolio o ILS todos ejecutan
+            for slave_rank in group[1:]:
+                assignments[slave_rank] = (color, member_job)
+            next_index += group_size
+
+        logger.info("Lote de %d trabajos en %d esclavos: %s", len(batch), num_slaves,
+                    ", ".join(f"{job['job_id']}={n}" for job, n in zip(batch, sizes)))
+
+        start = time.perf_counter()
+        self.mpi_handler.split_for_jobs(assignments)
+
+        # Cada líder debe dar señales (progreso o resultado) al menos cada MPI_TASK_TIMEOUT
+        last_seen = dict.fromkeys(leaders, start)
+        results = []
+        while leaders:
+            deadline = min(last_seen.values()) + MPI_TASK_TIMEOUT if MPI_TASK_TIMEOUT else None
+            received = self.mpi_handler.receive_job_message(deadline)
+            if received is None:
+                now = time.perf_counter()
+                for leader in [rank for rank, seen in last_seen.items() if now - seen > MPI_TASK_TIMEOUT]:
+                    job, group = leaders.pop(leader)
+                    del last_seen[leader]
+                    self.mpi_handler.discard_slaves(group, f"líder del trabajo {job['job_id']} sin respuesta")
+                    result = {'job_id': job['job_id'],
+                              'error': f"el líder (rank {leader}) no respondió en {MPI_TASK_TIMEOUT:g} s",
+                              'ranks': len(group), 'wall_time': now - start}
+                    results.append(result)
+                    self._finish(job, result)
+                continue
+            tag, message, leader = received
+            if leader not in leaders:
+                continue  # Mensaje tardío de un grupo ya descartado
+            last_seen[leader] = time.perf_counter()
+            if tag == TAG_JOB_PROGRESS:
+                if self.on_progress:
+                    self.on_progress(*message)
+            else:
+                job, _ = leaders.pop(leader)
+                del last_seen[leader]
+                results.append(message)
+                self._finish(job, message)
+
+        elapsed = time.perf_counter() - start
+        busy = sum(result['ranks'] * result['wall_time'] for result in results)
+        logger.info("Lote completado en %.2f s: %.1f trabajos/min, utilización de esclavos %.0f%%",
+                    elapsed, 60 * len(results) / elapsed, 100 * busy / (num_slaves * elapsed))
+        return results
+
+
+def run_jobs_file(filepath, mpi_handler, on_result=None, processes=1, on_progress=None):
+    """
+    Ejecuta todos los trabajos de un archivo JSON Lines.
+
+    Args:
+        filepath: Ruta al archivo de trabajos
+        mpi_handler: MPIHandler del maestro
+        on_result: Función (trabajo, resultado) al terminar cada trabajo
+        processes: Procesos locales si no hay esclavos MPI
+        on_progress: Función (job_id, generación, mejor, total_generaciones)
+
+    Returns:
+        Lista de resultados
+    """
+    scheduler = JobScheduler(mpi_handler, on_progress=on_progress, on_result=on_result, processes=processes)
+    for job in load_jobs_file(filepath):
+        scheduler.submit(job)
+    logger.info("%d trabajos leídos de %s", scheduler.pending(), filepath)
+    return scheduler.run_pending()
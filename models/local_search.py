@@ -0,0 +1,434 @@
+"""
+Modelo: Local Search
+Búsqueda local iterada (ILS) para TSP como alternativa al algoritmo genético.
+
+Cada cadena parte de un recorrido del vecino más cercano, lo lleva a un
+óptimo local con movimientos 2-opt y Or-opt (segmentos de 1 a 3 ciudades,
+en ambos sentidos: el subconjunto de movimientos 3-opt que usa Lin-Kernighan)
+restringidos a los vecinos más cercanos de cada ciudad, y después repite:
+perturbación double-bridge, búsqueda local desde las ciudades tocadas y
+aceptación si el recorrido no empeora.
+
+Las cadenas son independientes: una por rank MPI (con comm) o varias en
+este proceso o en un pool de procesos. Una "generación" es una ronda de
+kicks_per_round perturbaciones en cada cadena; al final de cada ronda se
+informa al callback con el mismo contrato que GeneticAlgorithmTSP (mejor
+global y peor/media/desviación de las cadenas).
+
+Los movimientos suponen una matriz simétrica; la longitud aceptada se
+calcula siempre con el recorrido completo.
+"""
+import multiprocessing
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from config.config import ILS_KICKS_PER_ROUND, ILS_NEIGHBORS
+from utils.seeds import spawn_seeds
+
+# Mejora mínima para aplicar un movimiento (evita ciclos por redondeo)
+EPSILON = 1e-9
+
+
+def tour_length(tour, dist):
+    """Longitud del recorrido cerrado (como _eval_tsp del algoritmo genético)."""
+    distance = dist[tour[-1]][tour[0]]
+    for city1, city2 in zip(tour[:-1], tour[1:]):
+        distance += dist[city1][city2]
+    return distance
+
+
+def neighbor_lists(dist_matrix, k):
+    """
+    Vecinos más cercanos de cada ciudad, de más cercano a más lejano.
+
+    Args:
+        dist_matrix: Matriz de distancias
+        k: Vecinos por ciudad
+
+    Returns:
+        Lista de listas de índices
+    """
+    matrix = np.asarray(dist_matrix, dtype=float).copy()
+    n = len(matrix)
+    np.fill_diagonal(matrix, np.inf)
+    k = max(1, min(k, n - 1))
+    nearest = np.argpartition(matrix, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(matrix, nearest, axis=1).argsort(axis=1)
+    return np.take_along_axis(nearest, order, axis=1).tolist()
+
+
+def nearest_neighbor_tour(dist, start):
+    """Recorrido greedy del vecino más cercano desde la ciudad start."""
+    n = len(dist)
+    visited = [False] * n
+    visited[start] = True
+    tour = [start]
+    current = start
+    for _ in range(n - 1):
+        row = dist[current]
+        current = min((city for city in range(n) if not visited[city]), key=row.__getitem__)
+        visited[current] = True
+        tour.append(current)
+    return tour
+
+
+def _reverse(tour, pos, i, j):
+    """
+    Invierte el tramo circular de las posiciones i a j (inclusive).
+
+    Invierte el complementario si es más corto: en un recorrido simétrico
+    el resultado es el mismo ciclo.
+    """
+    n = len(tour)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        length = n - length
+    for _ in range(length // 2):
+        tour[i], tour[j] = tour[j], tour[i]
+        pos[tour[i]] = i
+        pos[tour[j]] = j
+        i = (i + 1) % n
+        j = (j - 1) % n
+
+
+def _two_opt(a, tour, pos, dist, neighbors):
+    """
+    Busca una mejora 2-opt con una arista nueva (a, c), c vecino de a.
+
+    Returns:
+        Ciudades afectadas si se aplicó un movimiento, o None
+    """
+    n = len(tour)
+    i = pos[a]
+    for forward in (True, False):
+        b = tour[(i + 1) % n] if forward else tour[i - 1]
+        d_ab = dist[a][b]
+        for c in neighbors[a]:
+            d_ac = dist[a][c]
+            if d_ac >= d_ab - EPSILON:
+                break
+            d = tour[(pos[c] + 1) % n] if forward else tour[pos[c] - 1]
+            if c == b or d == a:
+                continue
+            if d_ac + dist[b][d] - d_ab - dist[c][d] < -EPSILON:
+                if forward:
+                    _reverse(tour, pos, pos[b], pos[c])  # a b ... c d -> a c ... b d
+                else:
+                    _reverse(tour, pos, pos[a], pos[d])  # d c ... b a -> d b ... c a
+                return (a, b, c, d)
+    return None
+
+
+def _or_opt(a, tour, pos, dist, neighbors):
+    """
+    Busca una mejora Or-opt moviendo el segmento de 1 a 3 ciudades que empieza en a.
+
+    El segmento se reinserta, en cualquier sentido, junto a un vecino de sus extremos.
+
+    Returns:
+        Ciudades afectadas si se aplicó un movimiento, o None
+    """
+    n = len(tour)
+    i = pos[a]
+    for length in (1, 2, 3):
+        if n < length + 3:
+            break
+        segment = [tour[(i + k) % n] for k in range(length)]
+        first, last = segment[0], segment[-1]
+        prev, nxt = tour[i - 1], tour[(i + length) % n]
+        removal_gain = dist[prev][first] + dist[last][nxt] - dist[prev][nxt]
+        if removal_gain <= EPSILON:
+            continue
+        inside = set(segment)
+        for end in (first, last):
+            for c in neighbors[end]:
+                if dist[end][c] >= removal_gain - EPSILON:
+                    break
+                if c in inside:
+                    continue
+                # Aristas candidatas a ambos lados de c, sin tocar el segmento
+                for left, right in ((c, tour[(pos[c] + 1) % n]), (tour[pos[c] - 1], c)):
+                    if left in inside or right in inside:
+                        continue
+                    base = dist[left][right]
+                    for reverse in (False, True):
+                        head, tail = (last, first) if reverse else (first, last)
+                        if dist[left][head] + dist[tail][right] - base - removal_gain < -EPSILON:
+                            rest = [tour[(i + length + k) % n] for k in range(n - length)]
+                            insert_at = rest.index(left) + 1
+                            moved = segment[::-1] if reverse else segment
+                            tour[:] = rest[:insert_at] + moved + rest[insert_at:]
+                            for index, city in enumerate(tour):
+                                pos[city] = index
+                            return (prev, nxt, first, last, left, right)
+    return None
+
+
+def local_search(tour, dist, neighbors, active=None):
+    """
+    Lleva el recorrido a un óptimo local 2-opt/Or-opt (modifica tour).
+
+    Usa bits de "no mirar": solo se revisan las ciudades de la cola, y una
+    ciudad vuelve a la cola cuando un movimiento toca alguna de sus aristas.
+
+    Args:
+        tour: Recorrido (lista de ciudades)
+        dist: Matriz de distancias (lista de listas)
+        neighbors: Listas de vecinos (ver neighbor_lists)
+        active: Ciudades iniciales de la cola (None = todas)
+
+    Returns:
+        El mismo recorrido
+    """
+    n = len(tour)
+    if n < 5:
+        return tour
+    pos = [0] * n
+    for index, city in enumerate(tour):
+        pos[city] = index
+    queue = deque(tour if active is None else active)
+    queued = [False] * n
+    for city in queue:
+        queued[city] = True
+
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        touched = _two_opt(a, tour, pos, dist, neighbors) or _or_opt(a, tour, pos, dist, neighbors)
+        if touched:
+            for city in touched:
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
+    return tour
+
+
+def double_bridge(tour, rng):
+    """
+    Perturbación double-bridge: A B C D -> A C B D (modifica tour).
+
+    Returns:
+        Ciudades en los extremos de los tramos movidos
+    """
+    n = len(tour)
+    if n < 8:
+        i, j = sorted(rng.sample(range(n), 2))
+        tour[i:j + 1] = tour[i:j + 1][::-1]
+        return [tour[i - 1], tour[i], tour[j], tour[(j + 1) % n]]
+    i, j, k = sorted(rng.sample(range(1, n), 3))
+    tour[:] = tour[:i] + tour[j:k] + tour[i:j] + tour[k:]
+    return [tour[index % n] for index in (i - 1, i, j - 1, j, k - 1, k, 0, -1)]
+
+
+class _Chain:
+    """Estado de una cadena ILS (se serializa entre rondas al usar un pool)."""
+
+    def __init__(self, seed, start_tour=None):
+        """
+        Args:
+            seed: Semilla del generador de la cadena
+            start_tour: Recorrido inicial (None = vecino más cercano desde una ciudad al azar)
+        """
+        self.rng = random.Random(seed)
+        self.start_tour = start_tour
+        self.tour = None
+        self.length = None
+        self.best_tour = None
+        self.best_length = None
+        self.kicks = 0
+
+    def advance(self, kicks, dist, neighbors):
+        """
+        Ejecuta kicks perturbaciones (o construye el recorrido inicial si aún no existe).
+
+        Returns:
+            La propia cadena
+        """
+        if self.tour is None:
+            tour = list(self.start_tour) if self.start_tour else nearest_neighbor_tour(
+                dist, self.rng.randrange(len(dist)))
+            self.tour = local_search(tour, dist, neighbors)
+            self.length = tour_length(self.tour, dist)
+            self.best_tour, self.best_length = list(self.tour), self.length
+
+        for _ in range(kicks):
+            candidate = list(self.tour)
+            touched = double_bridge(candidate, self.rng)
+            local_search(candidate, dist, neighbors, touched)
+            length = tour_length(candidate, dist)
+            if length <= self.length + EPSILON:
+                self.tour, self.length = candidate, length
+                if length < self.best_length - EPSILON:
+                    self.best_tour, self.best_length = list(candidate), length
+        self.kicks += kicks
+        return self
+
+
+# Matriz y vecinos de cada proceso del pool (se asignan en el inicializador)
+_worker_dist = None
+_worker_neighbors = None
+
+
+def _init_worker(dist, neighbors):
+    """Inicializador de cada proceso del pool: guarda matriz y vecinos localmente."""
+    global _worker_dist, _worker_neighbors
+    _worker_dist = dist
+    _worker_neighbors = neighbors
+
+
+def _advance_in_worker(args):
+    """Avanza una cadena en un proceso del pool."""
+    chain, kicks = args
+    return chain.advance(kicks, _worker_dist, _worker_neighbors)
+
+
+class IteratedLocalSearchTSP:
+    """Búsqueda local iterada con el mismo contrato que GeneticAlgorithmTSP."""
+
+    def __init__(self, dist_matrix, num_generations=100, kicks_per_round=ILS_KICKS_PER_ROUND,
+                 chains=1, processes=1, seed=42, comm=None, initial_individuals=None,
+                 neighbors=ILS_NEIGHBORS):
+        """
+        Inicializa la búsqueda.
+
+        Args:
+            dist_matrix: Matriz de distancias entre ciudades
+            num_generations: Rondas de perturbaciones
+            kicks_per_round: Perturbaciones de cada cadena por ronda
+            chains: Cadenas independientes (con comm: una por rank y se ignora)
+            processes: Procesos del pool para las cadenas (1 = en este proceso)
+            seed: Semilla de la que se derivan las semillas de las cadenas
+            comm: Comunicador MPI; todos sus ranks deben llamar a run()
+            initial_individuals: Rutas iniciales (arranque en caliente), una por cadena en turno
+            neighbors: Vecinos más cercanos considerados por ciudad
+        """
+        self.dist_matrix = [list(row) for row in dist_matrix]
+        self.num_cities = len(dist_matrix)
+        self.num_generations = num_generations
+        self.kicks_per_round = kicks_per_round
+        self.chains = chains
+        self.processes = processes
+        self.seed = seed
+        self.comm = comm
+        self.initial_individuals = initial_individuals or []
+        self.neighbors = neighbors
+        self.callback = None
+
+        # Mismos atributos de resultado que GeneticAlgorithmTSP
+        self.phase_totals = {}
+        self.evaluations = 0
+        self.final_population = None
+
+    def set_callback(self, callback):
+        """
+        Establece callback para actualizar la UI.
+
+        Args:
+            callback: Función (ronda, mejor, peor, media, desviación, timings=None)
+        """
+        self.callback = callback
+
+    def _create_chains(self):
+        """Cadenas de este proceso, con semillas y rutas iniciales según su índice global."""
+        if self.comm is not None:
+            rank, total = self.comm.Get_rank(), self.comm.Get_size()
+            indices = [rank]
+        else:
+            total = max(1, self.chains)
+            indices = range(total)
+        seeds = spawn_seeds(self.seed, total)
+        warm = [list(route) for route in self.initial_individuals
+                if sorted(route) == list(range(self.num_cities))]
+        return [_Chain(seeds[index], warm[index % len(warm)] if warm else None) for index in indices]
+
+    def run(self):
+        """
+        Ejecuta la búsqueda.
+
+        Returns:
+            Tupla (mejor_ruta, mejor_distancia, tiempo_total, estadisticas); con
+            comm, el resultado es el global en todos los ranks
+        """
+        start_time = time.time()
+        dist = self.dist_matrix
+        neighbors = neighbor_lists(dist, self.neighbors)
+        chains = self._create_chains()
+        comm = self.comm
+        reports = comm is None or comm.Get_rank() == 0
+        stats_list = []
+
+        pool = None
+        if comm is None and self.processes > 1 and len(chains) > 1:
+            pool = multiprocessing.Pool(min(self.processes, len(chains)), initializer=_init_worker,
+                                        initargs=(dist, neighbors))
+        try:
+            for generation in range(self.num_generations + 1):
+                kicks = self.kicks_per_round if generation else 0  # Ronda 0: recorridos iniciales
+                if pool is not None:
+                    chains = pool.map(_advance_in_worker, [(chain, kicks) for chain in chains])
+                else:
+                    for chain in chains:
+                        chain.advance(kicks, dist, neighbors)
+
+                lengths = [chain.length for chain in chains]
+                best = min(chain.best_length for chain in chains)
+                kicks_done = sum(chain.kicks for chain in chains)
+                if comm is not None:
+                    gathered = comm.allgather((lengths, best, kicks_done))
+                    lengths = [length for part in gathered for length in part[0]]
+                    best = min(part[1] for part in gathered)
+                    kicks_done = sum(part[2] for part in gathered)
+                self.evaluations = kicks_done
+
+                current = np.asarray(lengths)
+                entry = {
+                    'generation': generation,
+                    'best': float(best),
+                    'worst': float(current.max()),
+                    'avg': float(current.mean()),
+                    'std': float(current.std())
+                }
+                stats_list.append(entry)
+                if self.callback and reports:
+                    self.callback(generation, entry['best'], entry['worst'], entry['avg'], entry['std'])
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        winner = min(chains, key=lambda chain: chain.best_length)
+        best_route, best_distance = winner.best_tour, winner.best_length
+        elite = [chain.best_tour for chain in chains]
+        if comm is not None:
+            _, winner_rank = comm.allreduce((best_distance, comm.Get_rank()), op=_minloc())
+            best_route, best_distance = comm.bcast((best_route, best_distance) if comm.Get_rank() == winner_rank
+                                                   else None, root=winner_rank)
+            gathered = comm.gather(elite, root=0)
+            elite = [route for part in gathered for route in part] if gathered else elite
+        self.final_population = elite
+
+        total_time = time.time() - start_time
+        return best_route, best_distance, total_time, stats_list
+
+
+def _minloc():
+    """Operación MPI.MINLOC (mpi4py se importa solo al usar un comunicador)."""
+    from mpi4py import MPI
+    return MPI.MINLOC
+
+
+def run_slave_chain(handler, params):
+    """
+    Lado esclavo de una búsqueda local iniciada con MPIHandler.start_local_search.
+
+    Args:
+        handler: MPIHandler del esclavo
+        params: Diccionario con dist_matrix y los argumentos de IteratedLocalSearchTSP
+    """
+    params = dict(params)
+    dist_matrix = params.pop('dist_matrix')
+    IteratedLocalSearchTSP(dist_matrix, comm=handler.comm, **params).run()
@@ -9,21 +9,66 @@ except ImportError:
     MPI_AVAILABLE = False
     MPI = None
 
+import logging
+import time
+from collections import deque
+
+from config.config import (MPI_METRICS_ENABLED, MPI_TASK_TIMEOUT, MPI_POLL_INTERVAL, MPI_SLAVE_MAX_ERRORS,
+                           MPI_HYBRID, MPI_WORKER_THREADS)
+from models.mpi_metrics import create_comm_metrics
+from utils.logger import get_logger, ProgressCounter
+
+logger = get_logger("mpi")
+
+
+# Etiquetas del protocolo maestro-esclavo
+TAG_TASK = 1          # Maestro -> esclavo: (indice, tarea) o (-1, None) fin de lote
+TAG_RESULT = 2        # Esclavo -> maestro: (indice, resultado)
+TAG_SHUTDOWN = 98     # Maestro -> esclavo: salir del bucle de esclavo
+TAG_TERMINATE = 99    # Maestro -> esclavo: fin de ejecución (el esclavo sigue esperando)
+TAG_MATRIX = 100      # Maestro -> esclavo: matriz de distancias
+TAG_METRICS_REQUEST = 101  # Maestro -> esclavo: solicitar métricas (payload: reiniciar tras enviar)
+TAG_METRICS_REPLY = 102    # Esclavo -> maestro: métricas del rank
+TAG_PROFILE_START = 103    # Maestro -> esclavo: activar cProfile en el bucle de esclavo
+TAG_PROFILE_REQUEST = 104  # Maestro -> esclavo: detener el perfilado y enviar estadísticas
+TAG_PROFILE_REPLY = 105    # Esclavo -> maestro: estadísticas de cProfile del rank
+TAG_PARTITION = 106        # Maestro -> esclavo: (color, trabajo, ranks del grupo) antes de Create_group
+TAG_JOB_PROGRESS = 107     # Líder de grupo -> maestro: (job_id, generación, mejor, total_generaciones)
+TAG_JOB_RESULT = 108       # Líder de grupo -> maestro: resultado del trabajo
+TAG_LOCAL_SEARCH = 109     # Maestro -> esclavo: parámetros de una búsqueda local (una cadena por rank)
+TAG_MEMORY_START = 110     # Maestro -> esclavo: activar tracemalloc y muestras de memoria por lote
+TAG_MEMORY_REQUEST = 111   # Maestro -> esclavo: detener el perfilado de memoria y enviar el informe
+TAG_MEMORY_REPLY = 112     # Esclavo -> maestro: informe de memoria del rank
+TAG_TASK_BATCH = 113       # Maestro -> esclavo: (indice inicial, lista de tareas); respuesta por TAG_RESULT
+TAG_PING = 114             # Maestro <-> esclavo: eco de la carga recibida junto con el host (autoajuste)
+TAG_SUBPROBLEM = 115       # Maestro <-> esclavo: subproblema de la descomposición espacial y su camino
+
 
 class MPIHandler:
     """Maneja la comunicación y distribución de tareas usando MPI."""
     
-    def __init__(self):
-        """Inicializa el handler MPI."""
+    def __init__(self, metrics_enabled=MPI_METRICS_ENABLED, comm=None):
+        """
+        Inicializa el handler MPI.
+        
+        Args:
+            metrics_enabled: Si True, registra métricas de comunicación (ver mpi_metrics)
+            comm: Comunicador a usar (por defecto COMM_WORLD; un subcomunicador
+                  para los grupos del planificador de trabajos)
+        """
         self.comm = None
         self.rank = 0
         self.size = 1
+        self.host = None
         self.is_available = MPI_AVAILABLE
+        self.metrics = create_comm_metrics(metrics_enabled and MPI_AVAILABLE)
+        self.failed_ranks = set()  # Esclavos descartados por el maestro (sin respuesta o error de envío)
         
         if MPI_AVAILABLE:
-            self.comm = MPI.COMM_WORLD
+            self.comm = comm if comm is not None else MPI.COMM_WORLD
             self.rank = self.comm.Get_rank()
             self.size = self.comm.Get_size()
+            self.host = MPI.Get_processor_name()
     
     def is_master(self):
         """Retorna True si este proceso es el maestro (rank 0)."""
@@ -46,29 +91,31 @@ class MPIHandler:
         if not self.is_master() or not MPI_AVAILABLE:
             return
         
-        print(f"[MAESTRO] ===== ENVIANDO MATRIZ A ESCLAVOS =====")
-        print(f"[MAESTRO] Tamaño de matriz: {len(dist_matrix)}x{len(dist_matrix)}")
-        print(f"[MAESTRO] Enviando a {self.size - 1} esclavos (ranks 1-{self.size-1})...")
-        import sys
-        sys.stdout.flush()
+        slaves = self.live_slaves()
+        logger.info("Enviando matriz %dx%d a %d esclavos...", len(dist_matrix), len(dist_matrix), len(slaves))
         
-        for slave_rank in range(1, self.size):
+        for slave_rank in slaves:
             try:
-                self.comm.send(dist_matrix, dest=slave_rank, tag=100)
-                print(f"[MAESTRO] ✓ Matriz enviada a esclavo {slave_rank}/{self.size-1}")
-                sys.stdout.flush()
+                self.metrics.send(self.comm, dist_matrix, slave_rank, TAG_MATRIX)
+                logger.debug("✓ Matriz enviada a esclavo %d/%d", slave_rank, self.size - 1)
             except Exception as e:
-                print(f"[MAESTRO] ✗ Error enviando matriz a esclavo {slave_rank}: {e}")
-                import traceback
-                traceback.print_exc()
-                sys.stdout.flush()
+                logger.exception("✗ Error enviando matriz a esclavo %d: %s", slave_rank, e)
+                self._discard_slave(slave_rank, "error enviando la matriz")
     
-    def create_mpi_map(self, dist_matrix):
+    def create_mpi_map(self, dist_matrix, chunk_size=1, workers=None):
         """
         Crea una función mapper personalizada para MPI.
         
+        Tolerante a fallos: cada mensaje en curso tiene un plazo (MPI_TASK_TIMEOUT).
+        Un esclavo que no responde a tiempo o con el que falla el envío se descarta
+        para el resto de la sesión y su bloque se reenvía a otro; sin esclavos sanos,
+        el maestro evalúa lo que queda.
+        
         Args:
             dist_matrix: Matriz de distancias a usar en los esclavos
+            chunk_size: Tareas por mensaje (con más de una se envían por TAG_TASK_BATCH;
+                        0 = un bloque por esclavo en cada llamada, para el modo híbrido)
+            workers: Esclavos que reciben tareas (por defecto todos los sanos; los primeros workers)
             
         Returns:
             Función mapper compatible con DEAP
@@ -79,9 +126,19 @@ class MPIHandler:
         
         comm = self.comm
         rank = self.rank
+        metrics = self.metrics
+        verbose = logger.isEnabledFor(logging.DEBUG)  # Líneas por tarea solo en DEBUG
         
-        # Enviar matriz a esclavos si somos maestro
+        chunk_size = max(0, int(chunk_size))
+        serial_warned = set()  # Esclavos descartados cuando se avisó de la evaluación en el maestro
+        
+        def as_task(task):
+            """Tarea serializable (los individuos de DEAP se envían como listas)."""
+            return list(task) if hasattr(task, '__iter__') and not isinstance(task, (str, bytes)) else task
+        
+        # Enviar matriz a esclavos si somos maestro (inicio de una ejecución)
         if self.is_master():
+            metrics.reset()
             self.send_matrix_to_slaves(dist_matrix)
         
         def mpi_map(func, tasks):
@@ -100,42 +157,103 @@ class MPIHandler:
             if rank == 0:
                 # MAESTRO: Distribuir tareas y recopilar resultados
                 results = [None] * len(tasks)
-                task_index = 0
-                workers_busy = set()
+                outstanding = {}  # worker -> (índice inicial, tareas, instante de envío)
+                idle = self.live_slaves()[:workers or None][::-1]
+                used = set()
+                block = chunk_size or max(1, -(-len(tasks) // max(1, len(idle))))
+                # Bloques por enviar (índice inicial, tareas); los de esclavos descartados vuelven delante
+                pending = deque((start, min(block, len(tasks) - start))
+                                for start in range(0, len(tasks), block))
+                
+                def send_next(worker_rank):
+                    """Envía al esclavo el siguiente bloque pendiente; False si el envío falla."""
+                    start, count = pending.popleft()
+                    try:
+                        if block == 1:
+                            metrics.send(comm, (start, as_task(tasks[start])), worker_rank, TAG_TASK)
+                        else:
+                            chunk = [as_task(task) for task in tasks[start:start + count]]
+                            metrics.send(comm, (start, chunk), worker_rank, TAG_TASK_BATCH)
+                    except Exception as e:
+                        pending.appendleft((start, count))
+                        self._discard_slave(worker_rank, f"error de envío: {e}")
+                        return False
+                    outstanding[worker_rank] = (start, count, time.perf_counter())
+                    used.add(worker_rank)
+                    if verbose:
+                        logger.debug("Tarea %d enviada a esclavo %d", start, worker_rank)
+                    return True
                 
-                # Enviar tareas iniciales a todos los esclavos
-                print(f"[MAESTRO] Distribuyendo {len(tasks)} tareas entre {min(self.size-1, len(tasks))} esclavos...")
-                import sys
-                sys.stdout.flush()
+                def wait_for_result(status):
+                    """
+                    Sondea (Iprobe) hasta que hay un resultado o vence el plazo de algún esclavo.
+                    
+                    Returns:
+                        Rank con un resultado listo, o None si se descartaron esclavos
+                    """
+                    wait_start = time.perf_counter()
+                    delay = 0.0
+                    try:
+                        while not comm.Iprobe(source=MPI.ANY_SOURCE, tag=TAG_RESULT, status=status):
+                            if MPI_TASK_TIMEOUT:
+                                now = time.perf_counter()
+                                expired = [worker_rank for worker_rank, (_, _, sent) in outstanding.items()
+                                           if now - sent > MPI_TASK_TIMEOUT]
+                                for worker_rank in expired:
+                                    start, count, _ = outstanding.pop(worker_rank)
+                                    pending.appendleft((start, count))
+                                    self._discard_slave(worker_rank, f"sin respuesta en {MPI_TASK_TIMEOUT:g} s")
+                                if expired:
+                                    return None
+                            # Espera creciente: respuesta rápida sin ocupar la CPU de los esclavos locales
+                            time.sleep(delay)
+                            delay = min(MPI_POLL_INTERVAL, delay * 2 or 1e-5)
+                        return status.Get_source()
+                    finally:
+                        metrics.add_wait(time.perf_counter() - wait_start)
                 
-                for worker_rank in range(1, min(self.size, len(tasks) + 1)):
-                    if task_index < len(tasks):
-                        task = list(tasks[task_index]) if hasattr(tasks[task_index], '__iter__') and not isinstance(tasks[task_index], (str, bytes)) else tasks[task_index]
-                        comm.send((task_index, task), dest=worker_rank, tag=1)
-                        workers_busy.add(worker_rank)
-                        print(f"[MAESTRO] Tarea {task_index} enviada a esclavo {worker_rank}")
-                        sys.stdout.flush()
-                        task_index += 1
+                if verbose:
+                    logger.debug("Distribuyendo %d tareas (%d mensajes) entre %d esclavos...",
+                                 len(tasks), len(pending), min(len(idle), len(pending)))
                 
-                # Recibir resultados y enviar nuevas tareas
-                while len(workers_busy) > 0:
-                    status = MPI.Status()
-                    result_data = comm.recv(source=MPI.ANY_SOURCE, tag=2, status=status)
-                    worker_rank = status.Get_source()
+                # Enviar bloques a los esclavos libres y recibir resultados hasta completar el lote
+                while pending or outstanding:
+                    while pending and idle:
+                        send_next(idle.pop())
+                    if not outstanding:
+                        # Ningún esclavo sano: el maestro evalúa lo que queda (aviso solo la primera vez)
+                        (logger.debug if self.failed_ranks == serial_warned else logger.warning)(
+                            "⚠ Sin esclavos disponibles: evaluando %d tareas en el maestro",
+                            sum(count for _, count in pending))
+                        serial_warned.update(self.failed_ranks)
+                        for start, count in pending:
+                            results[start:start + count] = [func(task) for task in tasks[start:start + count]]
+                        pending.clear()
+                        break
                     
-                    if isinstance(result_data, tuple) and len(result_data) == 2:
-                        task_idx, result = result_data
+                    status = MPI.Status()
+                    worker_rank = wait_for_result(status)
+                    if worker_rank is None:
+                        continue
+                    result_data = metrics.recv(comm, worker_rank, TAG_RESULT, status)
+                    if worker_rank not in outstanding:
+                        # Respuesta tardía de un esclavo ya descartado: su bloque se reenvió
+                        continue
+                    start, count, sent = outstanding.pop(worker_rank)
+                    metrics.add_latency(time.perf_counter() - sent)
+                    task_idx, result = result_data
+                    if block == 1:
                         results[task_idx] = result
-                        
-                        # Asignar nueva tarea si hay más
-                        if task_index < len(tasks):
-                            task = list(tasks[task_index]) if hasattr(tasks[task_index], '__iter__') and not isinstance(tasks[task_index], (str, bytes)) else tasks[task_index]
-                            comm.send((task_index, task), dest=worker_rank, tag=1)
-                            task_index += 1
-                        else:
-                            workers_busy.remove(worker_rank)
-                            # Enviar señal de fin de lote
-                            comm.send((-1, None), dest=worker_rank, tag=1)
+                    else:
+                        results[task_idx:task_idx + len(result)] = result
+                    idle.append(worker_rank)
+                
+                # Señal de fin de lote a los esclavos que recibieron tareas
+                for worker_rank in sorted(used - self.failed_ranks):
+                    try:
+                        metrics.send(comm, (-1, None), worker_rank, TAG_TASK)
+                    except Exception as e:
+                        self._discard_slave(worker_rank, f"error de envío: {e}")
                 
                 return results
             else:
@@ -146,18 +264,554 @@ class MPIHandler:
         
         return mpi_map
     
+    def live_slaves(self):
+        """Ranks de los esclavos no descartados en esta sesión."""
+        return [slave_rank for slave_rank in range(1, self.size) if slave_rank not in self.failed_ranks]
+    
+    def discard_slaves(self, slave_ranks, reason):
+        """Descarta varios esclavos (ej. todo un grupo de trabajo cuyo líder no responde)."""
+        for slave_rank in slave_ranks:
+            if slave_rank not in self.failed_ranks:
+                self._discard_slave(slave_rank, reason)
+    
+    def _discard_slave(self, slave_rank, reason):
+        """Descarta un esclavo para el resto de la sesión (no recibe más mensajes salvo el apagado)."""
+        self.failed_ranks.add(slave_rank)
+        logger.warning("✗ Esclavo %d descartado (%s); quedan %d esclavos",
+                       slave_rank, reason, len(self.live_slaves()))
+    
+    def _wait_message(self, source, tag, status, deadline):
+        """
+        Sondea (Iprobe) con espera creciente hasta que hay un mensaje o vence el plazo.
+        
+        Args:
+            source: Rank de origen (o MPI.ANY_SOURCE)
+            tag: Etiqueta esperada
+            status: MPI.Status donde queda el origen del mensaje
+            deadline: Instante límite (time.perf_counter) o None sin plazo
+            
+        Returns:
+            True si hay un mensaje listo, False si venció el plazo
+        """
+        delay = 0.0
+        while not self.comm.Iprobe(source=source, tag=tag, status=status):
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(MPI_POLL_INTERVAL, delay * 2 or 1e-5)
+        return True
+    
+    def _request_all(self, slaves, message, tag):
+        """
+        Envía una petición a varios esclavos; los que fallan se descartan.
+        
+        Returns:
+            Ranks a los que se envió la petición
+        """
+        sent = []
+        for slave_rank in slaves:
+            try:
+                self.comm.send(message, dest=slave_rank, tag=tag)
+                sent.append(slave_rank)
+            except Exception as e:
+                self._discard_slave(slave_rank, f"error de envío: {e}")
+        return sent
+    
+    def _collect_replies(self, slaves, tag):
+        """
+        Recibe una respuesta de cada esclavo con un plazo común (MPI_TASK_TIMEOUT).
+        
+        Los que no responden a tiempo se descartan; las respuestas tardías de
+        esclavos ya descartados se leen y se ignoran.
+        
+        Args:
+            slaves: Ranks de los que se espera respuesta
+            tag: Etiqueta de la respuesta
+            
+        Returns:
+            Diccionario rank -> respuesta
+        """
+        waiting = set(slaves)
+        replies = {}
+        deadline = time.perf_counter() + MPI_TASK_TIMEOUT if MPI_TASK_TIMEOUT else None
+        status = MPI.Status()
+        while waiting:
+            if not self._wait_message(MPI.ANY_SOURCE, tag, status, deadline):
+                for slave_rank in sorted(waiting):
+                    self._discard_slave(slave_rank, f"sin respuesta en {MPI_TASK_TIMEOUT:g} s")
+                break
+            source = status.Get_source()
+            message = self.comm.recv(source=source, tag=tag)
+            if source in waiting:
+                waiting.discard(source)
+                replies[source] = message
+        return replies
+    
     def send_termination_signal(self):
         """Envía señal de terminación a todos los esclavos."""
         if not self.is_master() or not MPI_AVAILABLE:
             return
         
-        print(f"[MAESTRO] Enviando señal de terminación a {self.size - 1} esclavos...")
+        logger.info("Enviando señal de terminación a %d esclavos...", len(self.live_slaves()))
+        for slave_rank in self.live_slaves():
+            try:
+                self.comm.send(None, dest=slave_rank, tag=TAG_TERMINATE)
+            except Exception as e:
+                logger.error("Error enviando señal de terminación a esclavo %d: %s", slave_rank, e)
+    
+    def gather_metrics(self, reset=False):
+        """
+        Recoge en el maestro las métricas de comunicación de todos los ranks.
+        
+        Args:
+            reset: Si True, cada rank reinicia sus contadores tras enviarlos
+            
+        Returns:
+            Lista de diccionarios por rank (rank 0 primero, sin los esclavos que
+            no responden a tiempo) o lista vacía
+        """
+        if not self.is_master() or not MPI_AVAILABLE or not self.metrics.enabled:
+            return []
+        
+        slaves = self._request_all(self.live_slaves(), reset, TAG_METRICS_REQUEST)
+        replies = self._collect_replies(slaves, TAG_METRICS_REPLY)
+        per_rank = [self.metrics.to_dict(self.rank, self.host)]
+        per_rank.extend(replies[slave_rank] for slave_rank in sorted(replies))
+        
+        if reset:
+            self.metrics.reset()
+        return per_rank
+    
+    def start_profiling(self):
+        """Activa cProfile en el bucle de todos los esclavos."""
+        if not self.is_master() or not MPI_AVAILABLE:
+            return
+        
+        self._request_all(self.live_slaves(), None, TAG_PROFILE_START)
+    
+    def collect_profiles(self):
+        """
+        Detiene el perfilado de los esclavos y recoge sus estadísticas.
+        
+        Returns:
+            Lista de RankProfile de los esclavos (vacía sin MPI)
+        """
+        from utils.profiling import RankProfile
+        
+        if not self.is_master() or not MPI_AVAILABLE:
+            return []
+        
+        slaves = self._request_all(self.live_slaves(), None, TAG_PROFILE_REQUEST)
+        replies = self._collect_replies(slaves, TAG_PROFILE_REPLY)
+        return [RankProfile.from_message(replies[slave_rank]) for slave_rank in sorted(replies)
+                if replies[slave_rank] is not None]
+    
+    def ping_slaves(self, payload=None, repeats=1, workers=None):
+        """
+        Mide el tiempo de ida y vuelta de un mensaje a cada esclavo.
+        
+        Args:
+            payload: Carga enviada y devuelta por el esclavo
+            repeats: Repeticiones por esclavo (se toma la mediana)
+            workers: Esclavos medidos (por defecto todos los sanos; los primeros workers)
+            
+        Returns:
+            Lista de (rank, host, segundos) por esclavo que responde a tiempo (vacía sin MPI)
+        """
+        if not self.is_master() or not MPI_AVAILABLE:
+            return []
+        
+        measurements = []
+        for slave_rank in self.live_slaves()[:workers or None]:
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                reply = self._collect_replies(self._request_all([slave_rank], payload, TAG_PING), TAG_PING)
+                if slave_rank not in reply:
+                    break  # Descartado: sin medida
+                host, _ = reply[slave_rank]
+                times.append(time.perf_counter() - start)
+            else:
+                times.sort()
+                measurements.append((slave_rank, host, times[len(times) // 2]))
+        return measurements
+    
+    def start_memory_tracking(self):
+        """Activa el perfilado de memoria (tracemalloc y RSS) en todos los esclavos."""
+        if not self.is_master() or not MPI_AVAILABLE:
+            return
+        
+        self._request_all(self.live_slaves(), None, TAG_MEMORY_START)
+    
+    def collect_memory_reports(self):
+        """
+        Detiene el perfilado de memoria de los esclavos y recoge sus informes.
+        
+        Returns:
+            Lista de MemoryReport de los esclavos (vacía sin MPI)
+        """
+        from utils.memory_profiler import MemoryReport
+        
+        if not self.is_master() or not MPI_AVAILABLE:
+            return []
+        
+        slaves = self._request_all(self.live_slaves(), None, TAG_MEMORY_REQUEST)
+        replies = self._collect_replies(slaves, TAG_MEMORY_REPLY)
+        return [MemoryReport.from_message(replies[slave_rank]) for slave_rank in sorted(replies)
+                if replies[slave_rank] is not None]
+    
+    def shutdown_slaves(self):
+        """
+        Indica a todos los esclavos que abandonen su bucle de trabajo.
+        
+        A diferencia de send_termination_signal, los esclavos salen de
+        run_slave_loop y el proceso puede finalizar. También se envía a los
+        descartados, por si solo estaban bloqueados.
+        """
+        if not self.is_master() or not MPI_AVAILABLE:
+            return
+        
         for slave_rank in range(1, self.size):
             try:
-                self.comm.send(None, dest=slave_rank, tag=99)
+                self.comm.send(None, dest=slave_rank, tag=TAG_SHUTDOWN)
             except Exception as e:
-                print(f"[MAESTRO] Error enviando señal de terminación a esclavo {slave_rank}: {e}")
-
-
-
-
+                logger.error("Error enviando señal de apagado a esclavo %d: %s", slave_rank, e)
+    
+    def handshake(self, startup_time):
+        """
+        Barrera de arranque: todos los ranks informan al maestro de que están listos.
+        
+        Sustituye a esperar un tiempo fijo: el maestro continúa en cuanto el
+        último esclavo ha terminado de arrancar. Deben llamarla todos los ranks.
+        
+        Args:
+            startup_time: Segundos desde el inicio del proceso hasta estar listo
+            
+        Returns:
+            En el maestro, lista de (rank, host, segundos) por rank; None en los esclavos
+        """
+        if not MPI_AVAILABLE:
+            return [(0, None, startup_time)]
+        return self.comm.gather((self.rank, self.host, startup_time), root=0)
+    
+    def split_for_jobs(self, assignments):
+        """
+        Reparte los esclavos en grupos, uno por trabajo.
+        
+        Cada esclavo asignado recibe su color, los ranks de su grupo y, si es
+        el líder (el rank más bajo), el trabajo a ejecutar; el grupo crea su
+        subcomunicador con Create_group, que solo involucra a sus miembros.
+        Ni el maestro ni los esclavos libres o descartados participan.
+        
+        Args:
+            assignments: Diccionario rank_esclavo -> (color, trabajo o None);
+                         los ranks ausentes quedan libres durante el lote
+        """
+        if not self.is_master() or not MPI_AVAILABLE:
+            return
+        
+        members = {}
+        for slave_rank, (color, _) in assignments.items():
+            members.setdefault(color, []).append(slave_rank)
+        for slave_rank, (color, job) in sorted(assignments.items()):
+            self.comm.send((color, job, sorted(members[color])), dest=slave_rank, tag=TAG_PARTITION)
+    
+    def start_local_search(self, params):
+        """
+        Pone a todos los esclavos a ejecutar una cadena de búsqueda local.
+        
+        Después el maestro debe ejecutar IteratedLocalSearchTSP con este
+        comunicador: las rondas se sincronizan con operaciones colectivas y
+        los esclavos vuelven a su bucle al terminar.
+        
+        Args:
+            params: Diccionario con dist_matrix y los argumentos de IteratedLocalSearchTSP
+        """
+        if not self.is_master() or not MPI_AVAILABLE:
+            return
+        
+        for slave_rank in range(1, self.size):
+            self.comm.send(params, dest=slave_rank, tag=TAG_LOCAL_SEARCH)
+    
+    def solve_subproblems(self, subproblems, count):
+        """
+        Reparte subproblemas de la descomposición espacial entre los esclavos.
+        
+        Reparto dinámico: cada esclavo recibe un subproblema y, al devolverlo,
+        el siguiente. Los esclavos vuelven a su bucle al terminar. Como en
+        create_mpi_map, un esclavo que no responde en MPI_TASK_TIMEOUT (que
+        debe cubrir el subproblema más lento) se descarta y su subproblema se
+        reenvía; sin esclavos sanos, el maestro resuelve los que quedan.
+        
+        Args:
+            subproblems: Iterable de parámetros de solve_subproblem (se consume bajo demanda)
+            count: Número de subproblemas
+            
+        Yields:
+            Resultados de solve_subproblem en el orden en que llegan
+        """
+        metrics = self.metrics
+        source = iter(subproblems)
+        unsent = [count]  # Subproblemas aún sin leer de source
+        retries = deque()  # Subproblemas de esclavos descartados
+        outstanding = {}  # rank -> (parámetros, instante de envío)
+        idle = self.live_slaves()[::-1]
+        
+        def next_params():
+            if retries:
+                return retries.popleft()
+            unsent[0] -= 1
+            return next(source)
+        
+        done = 0
+        warned = False
+        while done < count:
+            while idle and (retries or unsent[0]):
+                slave_rank = idle.pop()
+                params = next_params()
+                try:
+                    metrics.send(self.comm, params, slave_rank, TAG_SUBPROBLEM)
+                except Exception as e:
+                    retries.appendleft(params)
+                    self._discard_slave(slave_rank, f"error de envío: {e}")
+                    continue
+                outstanding[slave_rank] = (params, time.perf_counter())
+            
+            if not outstanding:
+                # Ningún esclavo sano: el maestro resuelve lo que queda
+                from models.decomposition import solve_subproblem
+                if not warned:
+                    logger.warning("⚠ Sin esclavos disponibles: resolviendo %d subproblemas en el maestro",
+                                   count - done)
+                    warned = True
+                done += 1
+                yield solve_subproblem(next_params())
+                continue
+            
+            status = MPI.Status()
+            deadline = None
+            if MPI_TASK_TIMEOUT:
+                deadline = min(sent for _, sent in outstanding.values()) + MPI_TASK_TIMEOUT
+            if not self._wait_message(MPI.ANY_SOURCE, TAG_SUBPROBLEM, status, deadline):
+                now = time.perf_counter()
+                for slave_rank in [rank for rank, (_, sent) in outstanding.items()
+                                   if now - sent > MPI_TASK_TIMEOUT]:
+                    params, _ = outstanding.pop(slave_rank)
+                    retries.appendleft(params)
+                    self._discard_slave(slave_rank, f"sin respuesta en {MPI_TASK_TIMEOUT:g} s")
+                continue
+            slave_rank = status.Get_source()
+            result = metrics.recv(self.comm, slave_rank, TAG_SUBPROBLEM, status)
+            if slave_rank not in outstanding:
+                continue  # Respuesta tardía de un esclavo descartado: su subproblema se reenvió
+            outstanding.pop(slave_rank)
+            idle.append(slave_rank)
+            done += 1
+            yield result
+    
+    def receive_job_message(self, deadline=None):
+        """
+        Espera el siguiente mensaje de progreso o resultado de un líder de grupo.
+        
+        Los mensajes con otras etiquetas (respuestas tardías de esclavos
+        descartados) se leen y se ignoran.
+        
+        Args:
+            deadline: Instante límite (time.perf_counter) o None sin plazo
+            
+        Returns:
+            Tupla (tag, contenido, rank de origen) con tag TAG_JOB_PROGRESS o
+            TAG_JOB_RESULT, o None si venció el plazo
+        """
+        status = MPI.Status()
+        while self._wait_message(MPI.ANY_SOURCE, MPI.ANY_TAG, status, deadline):
+            source, tag = status.Get_source(), status.Get_tag()
+            message = self.comm.recv(source=source, tag=tag)
+            if tag in (TAG_JOB_PROGRESS, TAG_JOB_RESULT):
+                return tag, message, source
+        return None
+    
+    def run_slave_loop(self):
+        """
+        Bucle principal de un esclavo: recibe la matriz y evalúa tareas del maestro.
+        
+        Retorna cuando recibe TAG_SHUTDOWN o tras MPI_SLAVE_MAX_ERRORS errores de
+        recepción seguidos. Un error al procesar un mensaje se registra y el
+        esclavo sigue atendiendo (el maestro reenvía la tarea si no responde).
+        
+        Returns:
+            Número de tareas procesadas en el último lote
+        """
+        comm = self.comm
+        rank = self.rank
+        metrics = self.metrics
+        verbose = logger.isEnabledFor(logging.DEBUG)  # Líneas por tarea solo en DEBUG
+        progress = ProgressCounter(logger, "Tareas procesadas")
+        
+        # Variable para almacenar la matriz de distancias
+        dist_matrix = None
+        
+        # Modo híbrido: los bloques de tareas se reparten entre hilos sobre la matriz del rank
+        evaluator = None
+        
+        # Perfilador activo (modo de perfilado del cluster)
+        profiler = None
+        
+        # Rastreador de memoria activo: una muestra por lote de tareas (una generación)
+        memory = None
+        batches = 0
+        
+        # Función de evaluación local
+        def eval_tsp_local(individual):
+            """Evalúa un individuo usando la matriz de distancias recibida."""
+            if dist_matrix is None:
+                return float('inf'),
+            distance = dist_matrix[individual[-1]][individual[0]]
+            for gene1, gene2 in zip(individual[0:-1], individual[1:]):
+                distance += dist_matrix[gene1][gene2]
+            return distance,
+        
+        logger.info("Entrando en bucle de espera de mensajes del maestro...")
+        logger.debug("Esperando mensajes (tag %d: matriz, tag %d: tareas, tag %d: terminación, tag %d: apagado)",
+                     TAG_MATRIX, TAG_TASK, TAG_TERMINATE, TAG_SHUTDOWN)
+        task_count = 0
+        errors = 0  # Errores de recepción seguidos
+        
+        while True:
+            try:
+                status = MPI.Status()
+                try:
+                    message = metrics.recv(comm, 0, MPI.ANY_TAG, status)
+                except Exception as e:
+                    errors += 1
+                    logger.exception("✗ ERROR recibiendo del maestro (%d/%d): %s", errors, MPI_SLAVE_MAX_ERRORS, e)
+                    if errors >= MPI_SLAVE_MAX_ERRORS:
+                        break
+                    continue
+                errors = 0
+                tag_received = status.Get_tag()
+                
+                if tag_received == TAG_SHUTDOWN:
+                    logger.info("Recibida señal de apagado")
+                    break
+                elif tag_received == TAG_TERMINATE:
+                    # Señal de terminación - NO terminar, solo continuar esperando
+                    logger.info("Recibida señal de terminación, esperando siguiente ejecución...")
+                    continue
+                elif tag_received == TAG_MATRIX:
+                    # Matriz de distancias
+                    dist_matrix = message
+                    metrics.reset()  # Nueva ejecución: contar desde aquí
+                    progress.reset()
+                    logger.info("✓ Matriz recibida: %dx%d", len(dist_matrix), len(dist_matrix))
+                    if MPI_HYBRID:
+                        from models.hybrid_worker import ThreadedEvaluator
+                        if evaluator is not None:
+                            evaluator.close()
+                        evaluator = ThreadedEvaluator(dist_matrix, MPI_WORKER_THREADS)
+                        logger.info("Modo híbrido: %d hilos de evaluación", evaluator.threads)
+                    continue
+                elif tag_received == TAG_METRICS_REQUEST:
+                    # Métricas de este rank (envío sin instrumentar para no contarse a sí mismo)
+                    comm.send(metrics.to_dict(rank, self.host), dest=0, tag=TAG_METRICS_REPLY)
+                    if message:
+                        metrics.reset()
+                    continue
+                elif tag_received == TAG_PARTITION:
+                    # Lote de trabajos concurrentes: unirse a un grupo hasta que termine
+                    from models.job_scheduler import run_partition
+                    run_partition(self, message)
+                    continue
+                elif tag_received == TAG_LOCAL_SEARCH:
+                    # Búsqueda local: una cadena en este rank hasta el final de la ejecución
+                    from models.local_search import run_slave_chain
+                    run_slave_chain(self, message)
+                    continue
+                elif tag_received == TAG_PROFILE_START:
+                    import cProfile
+                    profiler = cProfile.Profile()
+                    profiler.enable()
+                    continue
+                elif tag_received == TAG_PROFILE_REQUEST:
+                    reply = None
+                    if profiler is not None:
+                        from utils.profiling import RankProfile
+                        profiler.disable()
+                        reply = RankProfile.from_profiler(profiler, rank, self.host).to_message()
+                        profiler = None
+                    comm.send(reply, dest=0, tag=TAG_PROFILE_REPLY)
+                    continue
+                elif tag_received == TAG_MEMORY_START:
+                    from utils.memory_profiler import MemoryTracker
+                    memory = MemoryTracker()
+                    memory.start()
+                    batches = 0
+                    continue
+                elif tag_received == TAG_MEMORY_REQUEST:
+                    reply = None
+                    if memory is not None:
+                        reply = memory.stop(rank, self.host).to_message()
+                        memory = None
+                    comm.send(reply, dest=0, tag=TAG_MEMORY_REPLY)
+                    continue
+                elif tag_received == TAG_SUBPROBLEM:
+                    # Clúster de la descomposición espacial: camino de la entrada a la salida
+                    from models.decomposition import solve_subproblem
+                    eval_start = time.perf_counter()
+                    result = solve_subproblem(message)
+                    metrics.add_busy(time.perf_counter() - eval_start)
+                    metrics.send(comm, result, 0, TAG_SUBPROBLEM)
+                    continue
+                elif tag_received == TAG_PING:
+                    # Eco para medir la latencia (envío sin instrumentar)
+                    comm.send((self.host, message), dest=0, tag=TAG_PING)
+                    continue
+                elif tag_received == TAG_TASK_BATCH:
+                    # Bloque de tareas consecutivas: una sola respuesta con todos los resultados
+                    task_idx, chunk = message
+                    eval_start = time.perf_counter()
+                    if evaluator is not None:
+                        results = evaluator.evaluate(chunk)
+                    else:
+                        results = [eval_tsp_local(task) for task in chunk]
+                    metrics.add_busy(time.perf_counter() - eval_start)
+                    metrics.send(comm, (task_idx, results), 0, TAG_RESULT)
+                    task_count += len(chunk)
+                    progress.tick(len(chunk))
+                    continue
+                elif tag_received == TAG_TASK:
+                    # Tarea
+                    if isinstance(message, tuple) and len(message) == 2:
+                        task_idx, task = message
+                        if task_idx == -1 and task is None:
+                            # Fin de lote - continuar esperando siguiente ejecución
+                            if verbose:
+                                logger.debug("Fin de lote recibido. Tareas del lote: %d", task_count)
+                            task_count = 0  # Resetear contador para siguiente ejecución
+                            if memory is not None:
+                                memory.sample(batches)
+                                batches += 1
+                            continue
+                        
+                        if dist_matrix is None:
+                            logger.warning("⚠ Recibida tarea pero matriz no disponible")
+                            metrics.send(comm, (task_idx, (float('inf'),)), 0, TAG_RESULT)
+                            continue
+                        
+                        # Procesar tarea
+                        if verbose:
+                            logger.debug("Procesando tarea %d...", task_idx)
+                        eval_start = time.perf_counter()
+                        result = eval_tsp_local(task)
+                        metrics.add_busy(time.perf_counter() - eval_start)
+                        metrics.send(comm, (task_idx, result), 0, TAG_RESULT)
+                        task_count += 1
+                        progress.tick()
+            
+            except Exception as e:
+                # El rank sigue vivo para las siguientes tareas y ejecuciones
+                logger.exception("✗ ERROR en bucle principal: %s", e)
+        
+        if evaluator is not None:
+            evaluator.close()
+        return task_count
@@ -0,0 +1,266 @@
+"""
+Modelo: Métricas de comunicación MPI
+Cuenta mensajes, bytes, tiempos de espera y latencias por rank.
+"""
+import pickle
+import time
+
+# Cubetas del histograma de latencia: la cubeta i agrupa [2^(i-1), 2^i) microsegundos
+LATENCY_BUCKETS = 32
+
+
+def payload_size(obj):
+    """
+    Tamaño en bytes del objeto serializado (lo que mpi4py envía por la red).
+
+    Args:
+        obj: Objeto a enviar
+
+    Returns:
+        Número de bytes del pickle
+    """
+    return len(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+
+class CommMetrics:
+    """Métricas de comunicación de un rank, actualizadas al enviar y recibir."""
+
+    enabled = True
+
+    def __init__(self):
+        """Inicializa los contadores."""
+        self.reset()
+
+    def reset(self):
+        """Pone a cero todos los contadores (inicio de una ejecución)."""
+        self.messages_sent = 0
+        self.messages_recv = 0
+        self.bytes_sent = 0
+        self.bytes_recv = 0
+        self.send_time = 0.0
+        self.recv_wait_time = 0.0
+        self.busy_time = 0.0
+        self.tasks = 0
+        self.latency_hist = [0] * LATENCY_BUCKETS
+        self.latency_sum = 0.0
+        self.started_at = time.perf_counter()
+
+    def send(self, comm, obj, dest, tag):
+        """
+        Envía un mensaje registrando tamaño y tiempo de envío.
+
+        Args:
+            comm: Comunicador MPI
+            obj: Objeto a enviar
+            dest: Rank destino
+            tag: Etiqueta del mensaje
+        """
+        self.bytes_sent += payload_size(obj)
+        start = time.perf_counter()
+        comm.send(obj, dest=dest, tag=tag)
+        self.send_time += time.perf_counter() - start
+        self.messages_sent += 1
+
+    def recv(self, comm, source, tag, status):
+        """
+        Recibe un mensaje registrando el tiempo bloqueado y su tamaño.
+
+        Args:
+            comm: Comunicador MPI
+            source: Rank origen (o MPI.ANY_SOURCE)
+            tag: Etiqueta (o MPI.ANY_TAG)
+            status: MPI.Status a rellenar
+
+        Returns:
+            Objeto recibido
+        """
+        start = time.perf_counter()
+        message = comm.recv(source=source, tag=tag, status=status)
+        self.recv_wait_time += time.perf_counter() - start
+        self.messages_recv += 1
+        self.bytes_recv += payload_size(message)
+        return message
+
+    def add_wait(self, seconds):
+        """Suma tiempo esperando mensajes fuera de recv (sondeo con Iprobe)."""
+        self.recv_wait_time += seconds
+
+    def add_busy(self, seconds, tasks=1):
+        """Suma tiempo de trabajo útil (evaluación) y tareas completadas."""
+        self.busy_time += seconds
+        self.tasks += tasks
+
+    def add_latency(self, seconds):
+        """Registra la latencia de ida y vuelta de una tarea."""
+        micros = int(seconds * 1e6)
+        bucket = min(micros.bit_length(), LATENCY_BUCKETS - 1)
+        self.latency_hist[bucket] += 1
+        self.latency_sum += seconds
+
+    def to_dict(self, rank=0, host=None):
+        """
+        Exporta las métricas como diccionario serializable.
+
+        Args:
+            rank: Rank al que pertenecen
+            host: Nombre del host
+
+        Returns:
+            Diccionario con contadores, tiempos e histograma
+        """
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            'rank': rank,
+            'host': host,
+            'elapsed': elapsed,
+            'messages_sent': self.messages_sent,
+            'messages_recv': self.messages_recv,
+            'bytes_sent': self.bytes_sent,
+            'bytes_recv': self.bytes_recv,
+            'send_time': self.send_time,
+            'recv_wait_time': self.recv_wait_time,
+            'busy_time': self.busy_time,
+            'idle_time': max(elapsed - self.busy_time, 0.0),
+            'tasks': self.tasks,
+            'latency_hist': list(self.latency_hist),
+            'latency_sum': self.latency_sum,
+        }
+
+
+class NullCommMetrics:
+    """Métricas deshabilitadas: envía y recibe sin medir."""
+
+    enabled = False
+
+    def reset(self):
+        pass
+
+    def send(self, comm, obj, dest, tag):
+        comm.send(obj, dest=dest, tag=tag)
+
+    def recv(self, comm, source, tag, status):
+        return comm.recv(source=source, tag=tag, status=status)
+
+    def add_wait(self, seconds):
+        pass
+
+    def add_busy(self, seconds, tasks=1):
+        pass
+
+    def add_latency(self, seconds):
+        pass
+
+    def to_dict(self, rank=0, host=None):
+        return None
+
+
+def create_comm_metrics(enabled=True):
+    """
+    Crea un registro de métricas o su versión deshabilitada.
+
+    Args:
+        enabled: Si False, retorna métricas sin coste
+
+    Returns:
+        CommMetrics o NullCommMetrics
+    """
+    return CommMetrics() if enabled else NullCommMetrics()
+
+
+def latency_percentile(hist, fraction):
+    """
+    Aproxima un percentil de latencia a partir del histograma.
+
+    Args:
+        hist: Conteos por cubeta (ver LATENCY_BUCKETS)
+        fraction: Percentil como fracción (0.95 = p95)
+
+    Returns:
+        Límite superior de la cubeta en segundos, o None si está vacío
+    """
+    total = sum(hist)
+    if total == 0:
+        return None
+    threshold = fraction * total
+    accumulated = 0
+    for bucket, count in enumerate(hist):
+        accumulated += count
+        if accumulated >= threshold:
+            return (2 ** bucket) / 1e6
+    return (2 ** (len(hist) - 1)) / 1e6
+
+
+def summarize_cluster(per_rank):
+    """
+    Resume las métricas de todos los ranks de una ejecución.
+
+    Args:
+        per_rank: Lista de diccionarios de CommMetrics.to_dict (rank 0 primero)
+
+    Returns:
+        Diccionario con totales, percentiles de latencia y detalle por rank
+    """
+    per_rank = [m for m in per_rank if m]
+    if not per_rank:
+        return None
+
+    master = next((m for m in per_rank if m['rank'] == 0), per_rank[0])
+    slaves = [m for m in per_rank if m['rank'] != 0]
+    hist = master['latency_hist']
+    round_trips = sum(hist)
+
+    busy = sum(m['busy_time'] for m in slaves)
+    elapsed = sum(m['elapsed'] for m in slaves)
+
+    return {
+        'messages': sum(m['messages_sent'] for m in per_rank),
+        'bytes': sum(m['bytes_sent'] for m in per_rank),
+        'master_send_time': master['send_time'],
+        'master_wait_time': master['recv_wait_time'],
+        'round_trips': round_trips,
+        'latency_mean': master['latency_sum'] / round_trips if round_trips else None,
+        'latency_p50': latency_percentile(hist, 0.50),
+        'latency_p95': latency_percentile(hist, 0.95),
+        'slave_utilization': busy / elapsed if elapsed > 0 else None,
+        'ranks': [{
+            'rank': m['rank'],
+            'host': m['host'],
+            'tasks': m['tasks'],
+            'busy_time': m['busy_time'],
+            'idle_time': m['idle_time'],
+            'bytes_sent': m['bytes_sent'],
+            'bytes_recv': m['bytes_recv'],
+        } for m in per_rank],
+    }
+
+
+def format_cluster_metrics(summary):
+    """
+    Formatea el resumen de métricas para el panel de información del cluster.
+
+    Args:
+        summary: Resultado de summarize_cluster
+
+    Returns:
+        Texto multilínea
+    """
+    if not summary:
+        return "Métricas MPI: no disponibles"
+
+    def ms(value):
+        return f"{value * 1000:.2f} ms" if value is not None else "-"
+
+    utilization = summary['slave_utilization']
+    lines = [
+        f"Mensajes: {summary['messages']}  ({summary['bytes'] / 1024:.1f} KB)",
+        f"Espera maestro: {summary['master_wait_time']:.2f} s",
+        f"Latencia media/p95: {ms(summary['latency_mean'])} / {ms(summary['latency_p95'])}",
+        f"Uso esclavos: {utilization:.0%}" if utilization is not None else "Uso esclavos: -",
+    ]
+    for rank in summary['ranks']:
+        if rank['rank'] == 0:
+            continue
+        total = rank['busy_time'] + rank['idle_time']
+        share = rank['busy_time'] / total if total > 0 else 0.0
+        lines.append(f"  Rank {rank['rank']} ({rank['host']}): {rank['tasks']} tareas, {share:.0%} ocupado")
+    return "\n".join(lines)
@@ -0,0 +1,171 @@
+"""
+Modelo: Parameter Sweep
+Barridos de parámetros (rejilla o aleatorio) sobre el planificador de trabajos.
+
+Cada combinación de parámetros y repetición es un trabajo independiente con
+su propia semilla (ver spawn_seeds); el planificador los ejecuta en paralelo
+en grupos de ranks MPI o en un pool de procesos.
+"""
+import csv
+import itertools
+import json
+import random
+
+from config.config import DEFAULT_SEED
+from utils.seeds import spawn_seeds
+
+# Parámetros del algoritmo que admite un barrido
+SWEEP_PARAMS = ('pop_size', 'crossover_rate', 'mutation_rate', 'tournament_size', 'generations')
+
+
+def grid_configs(space):
+    """
+    Todas las combinaciones de una rejilla.
+
+    Args:
+        space: Diccionario parámetro -> lista de valores
+
+    Returns:
+        Lista de diccionarios parámetro -> valor
+    """
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_configs(space, samples, seed=DEFAULT_SEED):
+    """
+    Combinaciones muestreadas al azar.
+
+    Args:
+        space: Diccionario parámetro -> lista de valores (se elige uno) o
+               tupla (mínimo, máximo) (uniforme; entero si ambos extremos lo son)
+        samples: Número de combinaciones
+        seed: Semilla del muestreo
+
+    Returns:
+        Lista de diccionarios parámetro -> valor
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for name in sorted(space):
+            values = space[name]
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    config[name] = rng.randint(low, high)
+                else:
+                    config[name] = rng.uniform(low, high)
+            else:
+                config[name] = rng.choice(values)
+        configs.append(config)
+    return configs
+
+
+def build_jobs(configs, base_job, repeats=1, seed=DEFAULT_SEED):
+    """
+    Trabajos del barrido: una por combinación y repetición, cada uno con su semilla.
+
+    Args:
+        configs: Combinaciones de parámetros
+        base_job: Campos comunes (matriz, target, parámetros no barridos)
+        repeats: Repeticiones de cada combinación
+        seed: Semilla base de la que se derivan las semillas de los trabajos
+
+    Returns:
+        Lista de diccionarios de trabajo
+    """
+    seeds = iter(spawn_seeds(seed, len(configs) * repeats))
+    jobs = []
+    for index, config in enumerate(configs):
+        for repeat in range(repeats):
+            job = dict(base_job)
+            job.update(config)
+            job['job_id'] = f"sweep-{index}-{repeat}"
+            job['config'] = index
+            job['seed'] = next(seeds)
+            jobs.append(job)
+    return jobs
+
+
+def result_rows(jobs, results):
+    """
+    Tabla de resultados del barrido, de mejor a peor distancia.
+
+    Args:
+        jobs: Trabajos enviados (ver build_jobs)
+        results: Resultados del planificador
+
+    Returns:
+        Lista de diccionarios con job_id, config, parámetros, seed,
+        best_distance, total_time, time_to_target y curve
+    """
+    by_id = {result['job_id']: result for result in results}
+    rows = []
+    for job in jobs:
+        result = by_id.get(job['job_id'], {'error': 'sin resultado'})
+        row = {'job_id': job['job_id'], 'config': job['config']}
+        row.update({name: job.get(name) for name in SWEEP_PARAMS})
+        row['seed'] = job['seed']
+        row['best_distance'] = result.get('best_distance')
+        row['total_time'] = result.get('total_time')
+        row['time_to_target'] = result.get('time_to_target')
+        row['curve'] = result.get('curve')
+        row['error'] = result.get('error')
+        rows.append(row)
+    rows.sort(key=lambda row: (row['best_distance'] is None, row['best_distance']))
+    return rows
+
+
+def aggregate_by_config(rows):
+    """
+    Resume las repeticiones de cada combinación.
+
+    Args:
+        rows: Filas de result_rows
+
+    Returns:
+        Lista de diccionarios (parámetros, runs, best, mean, mean_time,
+        target_hits), ordenada por distancia media
+    """
+    groups = {}
+    for row in rows:
+        if row['best_distance'] is not None:
+            groups.setdefault(row['config'], []).append(row)
+
+    summary = []
+    for config, group in groups.items():
+        distances = [row['best_distance'] for row in group]
+        entry = {name: group[0][name] for name in SWEEP_PARAMS}
+        entry.update({
+            'config': config,
+            'runs': len(group),
+            'best': min(distances),
+            'mean': sum(distances) / len(distances),
+            'mean_time': sum(row['total_time'] for row in group) / len(group),
+            'target_hits': sum(1 for row in group if row['time_to_target'] is not None),
+        })
+        summary.append(entry)
+    summary.sort(key=lambda entry: entry['mean'])
+    return summary
+
+
+def write_results(rows, csv_path, curves_path=None):
+    """
+    Guarda la tabla del barrido en CSV y, opcionalmente, las curvas de convergencia en JSON.
+
+    Args:
+        rows: Filas de result_rows
+        csv_path: Archivo CSV (sin la columna de curvas)
+        curves_path: Archivo JSON job_id -> mejor distancia por generación
+    """
+    columns = [column for column in rows[0] if column != 'curve'] if rows else []
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+    if curves_path:
+        with open(curves_path, 'w') as f:
+            json.dump({row['job_id']: row['curve'] for row in rows}, f)
@@ -0,0 +1,72 @@
+"""
+Modelo: Pool Handler
+Evaluación paralela en un único nodo usando un pool de procesos.
+"""
+import multiprocessing
+
+
+# Matriz de distancias de cada proceso del pool (se asigna en el inicializador)
+_worker_matrix = None
+
+
+def _init_worker(dist_matrix):
+    """Inicializador de cada proceso del pool: guarda la matriz localmente."""
+    global _worker_matrix
+    _worker_matrix = dist_matrix
+
+
+def _eval_route(route):
+    """Evalúa una ruta con la matriz del proceso (equivalente a eval_tsp_local)."""
+    distance = _worker_matrix[route[-1]][route[0]]
+    for gene1, gene2 in zip(route[0:-1], route[1:]):
+        distance += _worker_matrix[gene1][gene2]
+    return distance,
+
+
+class PoolHandler:
+    """Distribuye evaluaciones entre procesos locales con multiprocessing.Pool."""
+    
+    def __init__(self, processes=None):
+        """
+        Inicializa el handler del pool.
+        
+        Args:
+            processes: Número de procesos (por defecto, número de CPUs)
+        """
+        self.processes = processes or multiprocessing.cpu_count()
+        self.pool = None
+    
+    def create_pool_map(self, dist_matrix, chunksize=None):
+        """
+        Crea una función mapper que evalúa en el pool de procesos.
+        
+        Al igual que el mapper MPI, ignora la función recibida: los procesos
+        del pool evalúan con su propia copia de la matriz.
+        
+        Args:
+            dist_matrix: Matriz de distancias a copiar en cada proceso
+            chunksize: Tareas por mensaje al pool (None = automático)
+            
+        Returns:
+            Función mapper compatible con DEAP
+        """
+        self.close()
+        self.pool = multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                         initargs=(dist_matrix,))
+        pool = self.pool
+        
+        def pool_map(func, tasks):
+            """Evalúa las tareas en el pool y retorna los resultados en orden."""
+            routes = [list(task) for task in tasks]
+            if chunksize:
+                return pool.map(_eval_route, routes, chunksize)
+            return pool.map(_eval_route, routes)
+        
+        return pool_map
+    
+    def close(self):
+        """Cierra el pool de procesos si está abierto."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
@@ -0,0 +1,108 @@
+"""
+Modelo: Replacement
+Estrategias de reemplazo (selección de supervivientes) del algoritmo genético.
+
+- generational: los hijos sustituyen a toda la población (comportamiento original).
+- elitist: como generational, pero los k mejores padres sustituyen a los k
+  peores hijos, así que el mejor recorrido nunca se pierde.
+- plus (μ+λ): sobreviven los μ mejores entre padres e hijos.
+- comma (μ,λ): se generan λ ≥ μ hijos y sobreviven los μ mejores hijos.
+- age (μ,κ,λ): como plus, pero un individuo solo puede sobrevivir κ
+  generaciones (κ = 1 equivale a comma y κ infinito a plus).
+
+Los supervivientes se eligen con np.argpartition sobre el vector de fitness
+(selección parcial O(n)), sin ordenar los individuos.
+"""
+import numpy as np
+
+from config.config import REPLACEMENT_ELITES, REPLACEMENT_LAMBDA_RATIO, REPLACEMENT_MAX_AGE
+
+# Estrategias disponibles (configuración: TSP_REPLACEMENT)
+REPLACEMENTS = ('generational', 'elitist', 'plus', 'comma', 'age')
+
+
+def fitness_vector(individuals):
+    """Fitness de cada individuo en un array NumPy."""
+    return np.fromiter((ind.fitness.values[0] for ind in individuals), dtype=float, count=len(individuals))
+
+
+def best_indices(fits, k):
+    """
+    Índices de los k menores valores (sin orden entre ellos).
+
+    Args:
+        fits: Array de fitness (menor es mejor)
+        k: Número de índices
+
+    Returns:
+        Array de k índices
+    """
+    if k >= len(fits):
+        return np.arange(len(fits))
+    return np.argpartition(fits, k - 1)[:k]
+
+
+class Replacement:
+    """Selección de supervivientes de una estrategia; conserva la edad de cada individuo."""
+
+    def __init__(self, strategy, pop_size, elites=REPLACEMENT_ELITES,
+                 lambda_ratio=REPLACEMENT_LAMBDA_RATIO, max_age=REPLACEMENT_MAX_AGE):
+        """
+        Args:
+            strategy: 'generational', 'elitist', 'plus', 'comma' o 'age'
+            pop_size: Tamaño de la población (μ)
+            elites: Padres conservados en 'elitist' (k)
+            lambda_ratio: λ/μ en 'plus', 'comma' y 'age' (en 'comma', ValueError si λ < μ)
+            max_age: Generaciones que puede sobrevivir un individuo en 'age' (κ)
+        """
+        if strategy not in REPLACEMENTS:
+            raise ValueError(f"Estrategia de reemplazo desconocida: {strategy}")
+        if strategy == 'comma' and round(pop_size * lambda_ratio) < pop_size:
+            raise ValueError(f"El reemplazo 'comma' necesita λ ≥ μ (lambda_ratio {lambda_ratio:g} < 1)")
+        self.strategy = strategy
+        self.pop_size = pop_size
+        self.elites = max(0, min(elites, pop_size))
+        self.max_age = max(1, max_age)
+        if strategy in ('plus', 'comma', 'age'):
+            self.offspring_size = max(1, round(pop_size * lambda_ratio))
+        else:
+            self.offspring_size = pop_size
+        self.ages = None
+
+    def reset(self, population):
+        """Inicio de una ejecución: todos los individuos con edad 0."""
+        self.ages = np.zeros(len(population), dtype=np.int64)
+
+    def select(self, population, offspring):
+        """
+        Población de la siguiente generación.
+
+        Args:
+            population: Padres evaluados (μ)
+            offspring: Hijos evaluados (λ)
+
+        Returns:
+            Lista con los μ supervivientes
+        """
+        if self.strategy == 'generational':
+            return offspring
+        if self.strategy == 'elitist':
+            if self.elites:
+                elites = best_indices(fitness_vector(population), self.elites)
+                worst = best_indices(-fitness_vector(offspring), self.elites)
+                for target, source in zip(worst, elites):
+                    offspring[target] = population[source]
+            return offspring
+        if self.strategy == 'comma':
+            return [offspring[i] for i in best_indices(fitness_vector(offspring), self.pop_size)]
+
+        pool = population + offspring
+        fits = fitness_vector(pool)
+        if self.strategy == 'age':
+            # Los padres envejecen una generación; los que superan κ solo sobreviven si faltan individuos
+            ages = np.concatenate((self.ages + 1, np.zeros(len(offspring), dtype=np.int64)))
+            fits[ages >= self.max_age] = np.inf
+        survivors = best_indices(fits, self.pop_size)
+        if self.strategy == 'age':
+            self.ages = ages[survivors]
+        return [pool[i] for i in survivors]
@@ -0,0 +1,125 @@
+"""
+Modelo: Run Cache
+Memoriza resultados de ejecuciones para no recalcular trabajos idénticos.
+
+La clave combina el hash del contenido de la matriz, los parámetros del
+algoritmo, la semilla y la versión del motor. Los resultados se guardan como
+archivos JSON en un directorio local con un número máximo de entradas
+(se descartan primero las usadas hace más tiempo).
+"""
+import hashlib
+import json
+import os
+import threading
+
+from config.config import ENGINE_VERSION, RUN_CACHE_DIR, RUN_CACHE_MAX_ENTRIES
+
+
+class RunCache:
+    """Almacén de resultados por clave con tamaño acotado (LRU por fecha de uso)."""
+
+    def __init__(self, directory=RUN_CACHE_DIR, max_entries=RUN_CACHE_MAX_ENTRIES):
+        """
+        Inicializa la caché.
+
+        Args:
+            directory: Directorio donde guardar las entradas
+            max_entries: Número máximo de entradas conservadas
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(instance_hash, params, seed, engine_version=ENGINE_VERSION):
+        """
+        Calcula la clave de una ejecución.
+
+        Args:
+            instance_hash: Hash del contenido de la matriz (ver matrix_hash)
+            params: Diccionario con los parámetros que afectan al resultado
+            seed: Semilla del generador aleatorio
+            engine_version: Versión del motor de resolución
+
+        Returns:
+            Cadena hexadecimal SHA-256
+        """
+        payload = json.dumps({
+            'instance': instance_hash,
+            'params': params,
+            'seed': seed,
+            'engine': engine_version,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """
+        Busca un resultado en la caché.
+
+        Args:
+            key: Clave de la ejecución (ver make_key)
+
+        Returns:
+            Diccionario con best_route, best_distance, total_time y stats, o None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                result = json.load(f)
+            os.utime(path)  # Marca de uso para el desalojo LRU
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key, best_route, best_distance, total_time, stats):
+        """
+        Guarda un resultado y desaloja las entradas más antiguas si se supera el límite.
+
+        Args:
+            key: Clave de la ejecución
+            best_route: Mejor ruta encontrada
+            best_distance: Mejor distancia
+            total_time: Tiempo de la ejecución original
+            stats: Estadísticas por generación
+        """
+        result = {
+            'best_route': list(best_route),
+            'best_distance': best_distance,
+            'total_time': total_time,
+            'stats': list(stats),
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)  # Escritura atómica
+        self._evict()
+
+    def _evict(self):
+        """Elimina las entradas usadas hace más tiempo hasta respetar max_entries."""
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if name.endswith('.json')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def hit_rate(self):
+        """Fracción de búsquedas resueltas por la caché (None si no hubo búsquedas)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Barrido de parámetros y portafolio multi-arranque en paralelo.
+
+Ejecuta instancias independientes de GeneticAlgorithmTSP a la vez (grupos de
+ranks MPI o un pool de procesos) y reúne mejor distancia, tiempo hasta el
+objetivo y curvas de convergencia en una tabla.
+
+Uso:
+    python sweep.py --grid pop_size=50,100 crossover_rate=0.7,0.9 tournament_size=2,3,5
+    python sweep.py --random 20 pop_size=30:200 mutation_rate=0.05:0.3 --repeats 3
+    python sweep.py --portfolio 16 --pop-size 100 --generations 200
+    mpirun -np 20 --hostfile hosts python sweep.py --grid pop_size=50,100,200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from config.config import DISTANCIAS_FILE, DEFAULT_SEED
+
+DEFAULT_OUTPUT = "sweep_results.csv"
+DEFAULT_CURVES = "sweep_curves.json"
+
+
+def _parse_value(text):
+    """Convierte un valor de la línea de comandos en int, float o str."""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_space(specs):
+    """
+    Interpreta el espacio de búsqueda de la línea de comandos.
+
+    Args:
+        specs: Lista de "parametro=v1,v2,..." (valores) o "parametro=min:max" (rango)
+
+    Returns:
+        Diccionario parámetro -> lista de valores o tupla (mínimo, máximo)
+    """
+    from models.parameter_sweep import SWEEP_PARAMS
+
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in SWEEP_PARAMS:
+            raise ValueError(f"Parámetro desconocido '{name}' (válidos: {', '.join(SWEEP_PARAMS)})")
+        if ":" in values:
+            low, high = values.split(":")
+            space[name] = (_parse_value(low), _parse_value(high))
+        else:
+            space[name] = [_parse_value(value) for value in values.split(",")]
+    return space
+
+
+def load_matrix(args):
+    """
+    Matriz de la instancia y distancia objetivo (OptDistance del JSON o --target).
+
+    Returns:
+        Tupla (matriz, objetivo o None)
+    """
+    from utils.matrix_loader import MatrixLoader, create_random_matrix
+
+    if args.cities:
+        return create_random_matrix(args.cities, seed=args.matrix_seed), args.target
+
+    path = args.matrix or DISTANCIAS_FILE
+    if not path.endswith('.json'):
+        return MatrixLoader.load_from_file(path), args.target
+    matrix, _ = MatrixLoader.load_from_json(path)
+    with open(path, 'r') as f:
+        target = args.target if args.target is not None else json.load(f).get("OptDistance")
+    return matrix, target
+
+
+def print_table(summary, target):
+    """Imprime el resumen por combinación de parámetros."""
+    header = (f"{'pop':>6}{'cx':>7}{'mut':>7}{'torneo':>8}{'gens':>7}{'runs':>6}"
+              f"{'mejor':>12}{'media':>12}{'t medio (s)':>13}{'objetivo':>10}")
+    print(header)
+    print("-" * len(header))
+    for entry in summary:
+        hits = f"{entry['target_hits']}/{entry['runs']}" if target is not None else "-"
+        print(f"{entry['pop_size']:>6}{entry['crossover_rate']:>7.2f}{entry['mutation_rate']:>7.2f}"
+              f"{entry['tournament_size']:>8}{entry['generations']:>7}{entry['runs']:>6}"
+              f"{entry['best']:>12.2f}{entry['mean']:>12.2f}{entry['mean_time']:>13.3f}{hits:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de parámetros y portafolio del AG TSP")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--grid", nargs="+", metavar="PARAM=V1,V2", help="Rejilla de valores")
+    mode.add_argument("--random", type=int, metavar="N", help="N combinaciones aleatorias del espacio --space")
+    mode.add_argument("--portfolio", type=int, metavar="STARTS",
+                      help="Multi-arranque: mejor recorrido de STARTS ejecuciones (Allreduce MINLOC)")
+    parser.add_argument("--space", nargs="+", default=[], metavar="PARAM=MIN:MAX",
+                        help="Espacio de búsqueda para --random")
+    parser.add_argument("--matrix", default=None, help="Matriz de distancias (por defecto data/distancias.json)")
+    parser.add_argument("--cities", type=int, default=None, help="Usar una instancia aleatoria de N ciudades")
+    parser.add_argument("--matrix-seed", type=int, default=1, help="Semilla de la instancia aleatoria")
+    parser.add_argument("--target", type=float, default=None, help="Distancia objetivo para el tiempo hasta objetivo")
+    parser.add_argument("--pop-size", type=int, default=50)
+    parser.add_argument("--crossover-rate", type=float, default=0.8)
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    parser.add_argument("--tournament-size", type=int, default=3)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=1, help="Repeticiones (semillas) por combinación")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semilla base de los flujos aleatorios")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="Procesos locales cuando no hay esclavos MPI")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="CSV de resultados")
+    parser.add_argument("--curves", default=DEFAULT_CURVES, help="JSON con las curvas de convergencia")
+    args = parser.parse_args()
+
+    from models.mpi_handler import MPIHandler
+    mpi_handler = MPIHandler()
+    if mpi_handler.is_slave():
+        mpi_handler.run_slave_loop()
+        return 0
+
+    from models.job_scheduler import JobScheduler
+    from utils.metrics_exporter import create_metrics_exporter
+    from models.parameter_sweep import (grid_configs, random_configs, build_jobs, result_rows,
+                                        aggregate_by_config, write_results)
+
+    dist_matrix, target = load_matrix(args)
+    base_job = {
+        'dist_matrix': dist_matrix,
+        'pop_size': args.pop_size,
+        'crossover_rate': args.crossover_rate,
+        'mutation_rate': args.mutation_rate,
+        'tournament_size': args.tournament_size,
+        'generations': args.generations,
+        'target': target,
+    }
+
+    metrics = create_metrics_exporter()
+    scheduler = JobScheduler(mpi_handler, processes=args.processes,
+                             on_progress=metrics.observe_job, on_result=metrics.observe_job_result)
+    start = time.perf_counter()
+    try:
+        if args.portfolio:
+            scheduler.submit(dict(base_job, job_id="portfolio", starts=args.portfolio, seed=args.seed))
+            result = scheduler.run_pending()[0]
+            if 'error' in result:
+                print(f"[SWEEP] ✗ Error: {result['error']}")
+                return 1
+            print(f"[SWEEP] Portafolio de {result['starts']} arranques en {time.perf_counter() - start:.2f} s")
+            for run in sorted(result['runs'], key=lambda run: run.get('best_distance', float('inf'))):
+                print(f"  semilla {run['seed']:>12}: {run.get('best_distance', float('nan')):.2f}")
+            print(f"[SWEEP] Mejor distancia: {result['best_distance']:.2f} (semilla {result['seed']})")
+            print(f"[SWEEP] Ruta: {result['best_route']}")
+            return 0
+
+        if args.grid:
+            configs = grid_configs(parse_space(args.grid))
+        else:
+            configs = random_configs(parse_space(args.space), args.random, args.seed)
+        jobs = build_jobs(configs, base_job, args.repeats, args.seed)
+        for job in jobs:
+            scheduler.submit(job)
+        print(f"[SWEEP] {len(configs)} combinaciones x {args.repeats} repeticiones = {len(jobs)} trabajos")
+        results = scheduler.run_pending()
+    finally:
+        metrics.close()
+        if mpi_handler.is_available and mpi_handler.get_size() > 1:
+            mpi_handler.shutdown_slaves()
+
+    rows = result_rows(jobs, results)
+    write_results(rows, args.output, args.curves)
+    print(f"[SWEEP] {len(jobs)} trabajos en {time.perf_counter() - start:.2f} s; "
+          f"resultados en {args.output} y {args.curves}\n")
+    print_table(aggregate_by_config(rows), target)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
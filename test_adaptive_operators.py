@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pruebas del bandido de búsqueda adaptativa: las probabilidades suman 1, no
+bajan de p_min y se desplazan hacia el brazo que sigue recibiendo crédito.
+
+Uso: python -m pytest -q test_adaptive_operators.py  (o python test_adaptive_operators.py)
+"""
+import random
+
+from models.adaptive_operators import ARMS, P_MIN, PursuitBandit
+
+SEED = 5
+GENERATIONS = 60
+APPLICATIONS = 20  # Aplicaciones de operador por generación
+REWARDED = 'eax'
+
+
+def _check_probabilities(bandit):
+    assert abs(sum(bandit.probabilities) - 1.0) < 1e-9, bandit.probabilities
+    assert min(bandit.probabilities) >= bandit.p_min - 1e-12, bandit.probabilities
+
+
+def _run(bandit, rng):
+    """Solo REWARDED mejora a sus hijos; devuelve su probabilidad tras cada generación."""
+    history = []
+    for _ in range(GENERATIONS):
+        for _ in range(APPLICATIONS):
+            arm = bandit.select()
+            bandit.reward(arm, rng.uniform(0.01, 0.05) if arm == REWARDED else 0.0)
+        bandit.update()
+        _check_probabilities(bandit)
+        history.append(bandit.probabilities[bandit.arms.index(REWARDED)])
+    return history
+
+
+def test_probabilities_normalised_and_above_minimum():
+    random.seed(SEED)
+    bandit = PursuitBandit(ARMS['crossover'])
+    _check_probabilities(bandit)
+    _run(bandit, random.Random(SEED))
+    assert bandit.p_min == P_MIN
+
+
+def test_probabilities_move_toward_rewarded_arm():
+    random.seed(SEED)
+    bandit = PursuitBandit(ARMS['crossover'])
+    history = _run(bandit, random.Random(SEED))
+    assert all(later >= earlier for earlier, later in zip(history, history[1:]))
+    assert abs(history[-1] - bandit.p_max) < 1e-6
+    others = [p for arm, p in zip(bandit.arms, bandit.probabilities) if arm != REWARDED]
+    assert all(abs(p - bandit.p_min) < 1e-6 for p in others), others
+
+
+def test_minimum_capped_with_many_arms():
+    random.seed(SEED)
+    bandit = PursuitBandit(range(40))  # 40 × P_MIN > 1: p_min pasa a 1/k
+    assert bandit.p_min == 1.0 / 40
+    for arm in bandit.arms:
+        bandit.reward(arm, random.random())
+    bandit.update()
+    _check_probabilities(bandit)
+
+
+if __name__ == "__main__":
+    test_probabilities_normalised_and_above_minimum()
+    test_probabilities_move_toward_rewarded_arm()
+    test_minimum_capped_with_many_arms()
+    print("[OK] Pruebas de los operadores adaptativos completadas")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los operadores de cruce ERX y EAX: los hijos son permutaciones
+válidas para cualquier tamaño y EAX no produce hijos más largos que ambos
+padres.
+
+Uso: python -m pytest -q test_crossover.py  (o python test_crossover.py)
+"""
+import random
+
+from models.crossover import EAX_NEIGHBORS, cx_eax, cx_erx, eax_batch, erx_batch
+from models.local_search import neighbor_lists, tour_length
+from utils.matrix_loader import create_random_matrix
+
+SIZES = range(1, 41)
+PAIRS = 5  # Pares de padres por tamaño
+SEED = 7
+
+
+def _instances():
+    """Matriz, vecinos y pares de padres aleatorios para cada tamaño."""
+    rng = random.Random(SEED)
+    for n in SIZES:
+        dist = create_random_matrix(n, seed=n)
+        neighbors = neighbor_lists(dist, EAX_NEIGHBORS) if n > 1 else [[]]
+        pairs = [(rng.sample(range(n), n), rng.sample(range(n), n)) for _ in range(PAIRS)]
+        yield dist, neighbors, pairs
+
+
+def _check_permutation(child, n):
+    assert sorted(child) == list(range(n)), f"n={n}: {child} no es una permutación"
+
+
+def test_erx_children_are_permutations():
+    rng = random.Random(SEED)
+    for dist, _, pairs in _instances():
+        n = len(dist)
+        for a, b in pairs:
+            _check_permutation(erx_batch([a], [b], rng)[0].tolist(), n)
+            ind1, ind2 = list(a), list(b)
+            cx_erx(ind1, ind2, rng)
+            _check_permutation(ind1, n)
+            _check_permutation(ind2, n)
+
+
+def test_eax_children_are_permutations():
+    rng = random.Random(SEED)
+    for dist, neighbors, pairs in _instances():
+        n = len(dist)
+        for a, b in pairs:
+            _check_permutation(eax_batch([a], [b], dist, neighbors, rng)[0].tolist(), n)
+            ind1, ind2 = list(a), list(b)
+            cx_eax(ind1, ind2, dist, neighbors, rng)
+            _check_permutation(ind1, n)
+            _check_permutation(ind2, n)
+
+
+def test_eax_child_not_longer_than_both_parents():
+    rng = random.Random(SEED)
+    for dist, neighbors, pairs in _instances():
+        for a, b in pairs:
+            child = eax_batch([a], [b], dist, neighbors, rng)[0].tolist()
+            limit = max(tour_length(a, dist), tour_length(b, dist))
+            assert tour_length(child, dist) <= limit + 1e-9, f"n={len(dist)}: hijo más largo que ambos padres"
+
+
+if __name__ == "__main__":
+    test_erx_children_are_permutations()
+    test_eax_children_are_permutations()
+    test_eax_child_not_longer_than_both_parents()
+    print("[OK] Pruebas de los operadores de cruce completadas")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Prueba de tolerancia a fallos del maestro MPI con esclavos bloqueados.
+
+Cada esclavo de STALLS se bloquea (sin morir) al recibir por n-ésima vez un
+mensaje con cierta etiqueta. El maestro debe descartarlo tras
+TSP_MPI_TASK_TIMEOUT y seguir sin quedarse esperando: evaluación del
+algoritmo genético, recogida de métricas, perfiles, memoria, ping, lotes de
+trabajos concurrentes (incluido un líder de grupo que no responde) y
+subproblemas de la descomposición espacial.
+
+Uso (5 procesos):
+    mpirun -np 5 python3 test_fault_tolerance.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("TSP_MPI_TASK_TIMEOUT", "2")
+
+try:
+    from mpi4py import MPI
+except ImportError:
+    print("ERROR: mpi4py no está instalado")
+    sys.exit(1)
+
+from config.config import MPI_TASK_TIMEOUT
+import models.mpi_handler as mpi_handler_module
+from models.mpi_handler import MPIHandler
+
+# Esclavo -> (etiqueta, número de mensaje con esa etiqueta en el que se bloquea)
+STALLS = {
+    2: (mpi_handler_module.TAG_TASK, 30),                # A mitad del algoritmo genético
+    3: (mpi_handler_module.TAG_METRICS_REQUEST, 2),      # Entre ejecuciones, sin tareas en curso
+    4: (mpi_handler_module.TAG_PARTITION, 1),           # Como líder de su primer trabajo
+    1: (mpi_handler_module.TAG_SUBPROBLEM, 1),           # En la descomposición espacial
+}
+STALL_SECONDS = 2 * MPI_TASK_TIMEOUT + 1
+
+# Margen de cada llamada del maestro sobre el plazo
+MARGIN = 3.0
+
+
+def install_stall(handler, tag, nth):
+    """Hace que el bucle de esclavo se bloquee al recibir el mensaje nth con la etiqueta tag."""
+    original = handler.metrics.recv
+    seen = [0]
+
+    def recv(comm, source, recv_tag, status):
+        message = original(comm, source, recv_tag, status)
+        if status.Get_tag() == tag:
+            seen[0] += 1
+            if seen[0] == nth:
+                print(f"[ESCLAVO Rank {handler.rank}] Bloqueado {STALL_SECONDS:g} s", flush=True)
+                time.sleep(STALL_SECONDS)
+        return message
+
+    handler.metrics.recv = recv
+
+
+def timed(label, func, *args, **kwargs):
+    """Ejecuta una llamada del maestro y comprueba que no espera más del plazo."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    assert elapsed < MPI_TASK_TIMEOUT + MARGIN, f"{label}: {elapsed:.1f} s"
+    print(f"[MAESTRO] {label}: {elapsed:.2f} s, descartados {sorted(handler.failed_ranks)}", flush=True)
+    return result
+
+
+def run_master():
+    from models.genetic_algorithm import GeneticAlgorithmTSP
+    from models.decomposition import DecompositionTSP
+    from models.job_scheduler import JobScheduler
+    from utils.matrix_loader import create_random_matrix, create_random_coordinates
+
+    # Algoritmo genético: el rank 2 se bloquea a mitad; resultado idéntico al serie
+    matrix = create_random_matrix(40, seed=3)
+    serial = GeneticAlgorithmTSP(matrix, pop_size=40, num_generations=15, phase_timing=False).run()[1]
+    ga = GeneticAlgorithmTSP(matrix, pop_size=40, num_generations=15, phase_timing=False,
+                             mpi_map=handler.create_mpi_map(matrix, 1))
+    distance = ga.run()[1]
+    assert distance == serial, f"MPI {distance} != serie {serial}"
+    assert handler.failed_ranks == {2}, handler.failed_ranks
+    print("[MAESTRO] Algoritmo genético idéntico al serie sin el rank 2", flush=True)
+
+    # Métricas: la primera petición la atienden 1 y 3; en la segunda se bloquea el 3
+    assert [m['rank'] for m in timed("gather_metrics", handler.gather_metrics)] == [0, 1, 3, 4]
+    assert [m['rank'] for m in timed("gather_metrics", handler.gather_metrics)] == [0, 1, 4]
+    assert handler.failed_ranks == {2, 3}, handler.failed_ranks
+
+    # Perfiles, memoria y ping solo de los esclavos sanos
+    handler.start_profiling()
+    assert [p.rank for p in timed("collect_profiles", handler.collect_profiles)] == [1, 4]
+    handler.start_memory_tracking()
+    assert [r.rank for r in timed("collect_memory_reports", handler.collect_memory_reports)] == [1, 4]
+    assert [m[0] for m in timed("ping_slaves", handler.ping_slaves, repeats=3)] == [1, 4]
+
+    # Lote con un líder que no responde: su trabajo termina con error y su grupo se descarta
+    scheduler = JobScheduler(handler)
+    for seed in (1, 2):
+        scheduler.submit({'num_cities': 20, 'matrix_seed': seed, 'pop_size': 20, 'generations': 10})
+    results = {result['job_id']: result for result in timed("lote con líder bloqueado", scheduler.run_pending)}
+    assert results['job-1'].get('error') is None, results['job-1']
+    assert 'rank 4' in results['job-2'].get('error', ''), results['job-2']
+    assert handler.failed_ranks == {2, 3, 4}, handler.failed_ranks
+    print("[MAESTRO] Trabajo del líder bloqueado registrado con error", flush=True)
+
+    # Lotes de trabajos: los grupos se forman solo con los esclavos sanos
+    for seed in (1, 2):
+        scheduler.submit({'num_cities': 20, 'matrix_seed': seed, 'pop_size': 20, 'generations': 10})
+    results = timed("lotes de trabajos", scheduler.run_pending)
+    assert [result.get('error') for result in results] == [None, None], results
+    assert [result['ranks'] for result in results] == [1, 1], results
+
+    # Descomposición: el rank 1 se bloquea en su primer subproblema; el maestro resuelve el resto
+    coords = create_random_coordinates(120, seed=5)
+    solver = DecompositionTSP(coords=coords, pop_size=10, num_generations=5, cluster_size=30,
+                              mpi_handler=handler, seed=1)
+    route = timed("descomposición", lambda: solver.run()[0])
+    assert sorted(route) == list(range(len(coords))), "la ruta no es una permutación"
+    assert handler.failed_ranks == {1, 2, 3, 4}, handler.failed_ranks
+    print("[MAESTRO] Descomposición completa en el maestro", flush=True)
+
+
+if __name__ == "__main__":
+    handler = MPIHandler()
+    if handler.size != 5:
+        print("ERROR: ejecutar con mpirun -np 5")
+        sys.exit(1)
+
+    if handler.is_slave():
+        install_stall(handler, *STALLS[handler.rank])
+        handler.run_slave_loop()
+        sys.exit(0)
+
+    try:
+        run_master()
+        print("[MAESTRO] Prueba completada", flush=True)
+    except AssertionError as e:
+        print(f"[MAESTRO] FALLO: {e}", flush=True)
+        handler.shutdown_slaves()
+        MPI.COMM_WORLD.Abort(1)
+    handler.shutdown_slaves()
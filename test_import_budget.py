@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Prueba de los presupuestos de importación del maestro y de los esclavos
+(ver IMPORT_BUDGETS en benchmark.py): falla si una ruta de arranque supera
+su tiempo o carga un paquete pesado que no necesita.
+
+Uso: python -m pytest -q test_import_budget.py  (o python test_import_budget.py)
+"""
+from benchmark import check_import_budgets
+
+
+def test_import_budgets():
+    failures = check_import_budgets()
+    assert not failures, "; ".join(failures)
+
+
+if __name__ == "__main__":
+    test_import_budgets()
+    print("[OK] Importaciones dentro del presupuesto")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las estrategias de reemplazo: número de supervivientes, elitismo,
+límite de edad, error de (μ,λ) con λ < μ y best_indices.
+
+Uso: python -m pytest -q test_replacement.py  (o python test_replacement.py)
+"""
+import random
+
+import numpy as np
+
+from models.replacement import Replacement, best_indices, fitness_vector
+
+MU = 10
+SEED = 3
+
+
+class Fitness:
+    def __init__(self, value):
+        self.values = (value,)
+
+
+class Individual(list):
+    """Individuo mínimo con la interfaz de fitness de DEAP."""
+
+    def __init__(self, value):
+        super().__init__([value])
+        self.fitness = Fitness(value)
+
+
+def _individuals(count, rng):
+    return [Individual(rng.uniform(0, 1000)) for _ in range(count)]
+
+
+def test_best_indices():
+    rng = np.random.default_rng(SEED)
+    fits = rng.random(50)
+    for k in (1, 7, 49):
+        assert set(best_indices(fits, k)) == set(np.argsort(fits)[:k])
+    assert sorted(best_indices(fits, 80)) == list(range(50))
+
+
+def test_survivor_counts():
+    rng = random.Random(SEED)
+    for strategy in ('generational', 'elitist', 'plus', 'comma', 'age'):
+        replacement = Replacement(strategy, MU, elites=2, lambda_ratio=2, max_age=3)
+        population = _individuals(MU, rng)
+        replacement.reset(population)
+        expected_offspring = MU if strategy in ('generational', 'elitist') else 2 * MU
+        assert replacement.offspring_size == expected_offspring, strategy
+        for _ in range(5):
+            population = replacement.select(population, _individuals(replacement.offspring_size, rng))
+            assert len(population) == MU, strategy
+
+
+def test_elitist_keeps_best():
+    rng = random.Random(SEED)
+    replacement = Replacement('elitist', MU, elites=1)
+    population = _individuals(MU, rng)
+    replacement.reset(population)
+    for _ in range(10):
+        best = min(fitness_vector(population))
+        # Hijos peores que cualquier padre: solo el elitismo conserva el mejor
+        offspring = [Individual(2000 + i) for i in range(MU)]
+        population = replacement.select(population, offspring)
+        assert min(fitness_vector(population)) == best
+
+
+def test_age_removes_aged_out():
+    rng = random.Random(SEED)
+    max_age = 3
+    replacement = Replacement('age', MU, lambda_ratio=2, max_age=max_age)
+    population = [Individual(-1.0)] + _individuals(MU - 1, rng)  # Un padre mejor que todo hijo
+    champion = population[0]
+    replacement.reset(population)
+    for generation in range(1, 6):
+        population = replacement.select(population, _individuals(replacement.offspring_size, rng))
+        assert any(ind is champion for ind in population) == (generation < max_age), generation
+        assert replacement.ages.max() < max_age
+
+
+def test_comma_requires_lambda_not_below_mu():
+    try:
+        Replacement('comma', MU, lambda_ratio=0.5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("(μ,λ) con λ < μ no lanzó ValueError")
+    assert Replacement('comma', MU, lambda_ratio=1).offspring_size == MU
+
+
+if __name__ == "__main__":
+    test_best_indices()
+    test_survivor_counts()
+    test_elitist_keeps_best()
+    test_age_removes_aged_out()
+    test_comma_requires_lambda_not_below_mu()
+    print("[OK] Pruebas de las estrategias de reemplazo completadas")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la clave de la caché de ejecuciones: cada parámetro que cambia el
+resultado debe producir otra clave (y por tanto un fallo de caché).
+
+Uso: python -m pytest -q test_run_cache.py  (o python test_run_cache.py)
+"""
+import tempfile
+
+from controllers.app_controller import AppController
+from models.run_cache import RunCache
+
+INSTANCE = "instancia-de-prueba"
+SEED = 42
+
+# Cambios de un solo parámetro respecto a la ejecución base de cada motor
+VARIANTS = {
+    'ga': [('elites', 5), ('lambda_ratio', 3.0), ('max_age', 9), ('replacement', 'plus')],
+    'ils': [('neighbors', 4)],
+    'decomp': [('neighbors', 4), ('boundary_window', 10)],
+}
+
+
+def _key(params):
+    return RunCache.make_key(INSTANCE, AppController.result_params(params), SEED)
+
+
+def _check_misses(engine, changes):
+    base = {'engine': engine}
+    with tempfile.TemporaryDirectory() as directory:
+        cache = RunCache(directory)
+        cache.put(_key(base), [0, 1, 2], 1.0, 0.1, [])
+        assert cache.get(_key(base)) is not None
+        for name, value in changes:
+            assert cache.get(_key(dict(base, **{name: value}))) is None, f"{engine}: {name} no cambia la clave"
+
+
+def test_ga_replacement_params_miss_cache():
+    _check_misses('ga', VARIANTS['ga'])
+
+
+def test_ils_neighbors_miss_cache():
+    _check_misses('ils', VARIANTS['ils'])
+
+
+def test_decomposition_params_miss_cache():
+    _check_misses('decomp', VARIANTS['decomp'])
+
+
+if __name__ == "__main__":
+    for engine, changes in VARIANTS.items():
+        _check_misses(engine, changes)
+    print("[OK] Pruebas de la caché de ejecuciones completadas")
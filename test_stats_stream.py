@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Pruebas del archivo columnar de estadísticas: lo escrito por generación se
+lee igual, también tras varios bloques volcados y al reabrir el archivo
+mientras crece, con tiempos por fase y tasas adaptativas, y con un registro
+final incompleto.
+
+Uso: python -m pytest -q test_stats_stream.py  (o python test_stats_stream.py)
+"""
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from utils.phase_timer import PHASES
+from utils.stats_stream import StatsStreamWriter, load_stats, stats_fields
+
+BLOCK = 16
+GENERATIONS = 3 * BLOCK + 5  # Varios bloques completos y uno a medias
+SEED = 11
+
+
+def _entries(count, rng):
+    entries = []
+    for generation in range(count):
+        best = 1000 - generation + rng.random()
+        entries.append({
+            'generation': generation, 'best': best, 'worst': best + 500 * rng.random(),
+            'avg': best + 100, 'std': 10 * rng.random(), 'elapsed': 0.01 * generation,
+            'timings': {phase: rng.random() for phase in PHASES + ('total',)},
+            'operators': {'crossover_rate': rng.random(), 'mutation_rate': rng.random(),
+                          'tournament_size': 3.0},
+        })
+    return entries
+
+
+def _write(path, entries, metadata=None):
+    writer = StatsStreamWriter(path, stats_fields(timings=True, operators=True), metadata, block_size=BLOCK)
+    try:
+        for entry in entries:
+            writer.append(entry)
+    finally:
+        writer.close()
+
+
+def test_round_trip_across_blocks():
+    entries = _entries(GENERATIONS, random.Random(SEED))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stats.bin")
+        _write(path, entries, {'pop_size': 50})
+        stream = load_stats(path)
+        assert len(stream) == GENERATIONS
+        assert stream.metadata == {'pop_size': 50}
+        assert list(stream.column('generation')) == list(range(GENERATIONS))
+        for name in ('best', 'worst', 'avg', 'std', 'elapsed'):
+            assert np.array_equal(stream.column(name), [entry[name] for entry in entries]), name
+        assert np.array_equal(stream.column('t_evaluate'), [entry['timings']['evaluate'] for entry in entries])
+        assert stream.to_entries(max_points=GENERATIONS) == entries
+        del stream
+
+
+def test_reader_grows_with_the_file():
+    entries = _entries(GENERATIONS, random.Random(SEED))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stats.bin")
+        writer = StatsStreamWriter(path, stats_fields(), block_size=BLOCK)
+        try:
+            for entry in entries[:BLOCK + 3]:
+                writer.append(entry)
+            first = load_stats(path)  # Solo el primer bloque está en disco
+            assert len(first) == BLOCK
+            for entry in entries[BLOCK + 3:]:
+                writer.append(entry)
+        finally:
+            writer.close()
+        stream = load_stats(path)  # Un nuevo mapeo cubre todo el archivo
+        assert len(first) == BLOCK
+        assert len(stream) == GENERATIONS
+        assert np.array_equal(stream.column('best')[:BLOCK], first.column('best'))
+        del first, stream
+
+
+def test_downsample_keeps_envelope():
+    entries = _entries(GENERATIONS, random.Random(SEED))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stats.bin")
+        _write(path, entries)
+        stream = load_stats(path)
+        reduced = stream.downsample(max_points=10)
+        assert len(reduced) == 10
+        assert reduced['generation'][-1] == GENERATIONS - 1
+        assert reduced['best'].min() == min(entry['best'] for entry in entries)
+        assert reduced['worst'].max() == max(entry['worst'] for entry in entries)
+        del stream
+
+
+def test_incomplete_last_record_is_ignored():
+    entries = _entries(GENERATIONS, random.Random(SEED))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stats.bin")
+        _write(path, entries)
+        with open(path, 'ab') as f:
+            f.write(b'\0' * 5)  # Escritura interrumpida a mitad de registro
+        stream = load_stats(path)
+        assert len(stream) == GENERATIONS
+        assert stream.column('best')[-1] == entries[-1]['best']
+        del stream
+
+
+if __name__ == "__main__":
+    test_round_trip_across_blocks()
+    test_reader_grows_with_the_file()
+    test_downsample_keeps_envelope()
+    test_incomplete_last_record_is_ignored()
+    print("[OK] Pruebas del archivo de estadísticas completadas")
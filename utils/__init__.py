@@ -1,11 +1,28 @@
 """
 Módulo de utilidades.
+
+Los nombres exportados se importan en el primer acceso (PEP 562), de modo
+que importar utils.logger no carga NumPy.
 """
-from .matrix_loader import MatrixLoader, create_random_matrix
-from .mpi_config import MPIConfig
+import importlib
+
+_EXPORTS = {
+    'MatrixLoader': '.matrix_loader',
+    'create_random_matrix': '.matrix_loader',
+    'matrix_hash': '.matrix_loader',
+    'MPIConfig': '.mpi_config',
+}
 
-__all__ = ['MatrixLoader', 'create_random_matrix', 'MPIConfig']
+__all__ = list(_EXPORTS)
 
 
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,163 @@
+"""
+Logging del sistema: niveles, prefijo por rank y escritura asíncrona con buffer.
+
+Los mensajes se encolan y un hilo de fondo los escribe en stdout agrupados,
+de modo que el bucle caliente (mapper MPI, bucle de esclavo) no paga una
+escritura síncrona con flush por cada línea. El nivel se controla con la
+variable de entorno TSP_LOG_LEVEL (DEBUG activa las líneas por tarea).
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+LOGGER_NAME = "tsp"
+DEFAULT_LEVEL = os.getenv("TSP_LOG_LEVEL", "INFO").upper()
+FLUSH_INTERVAL = 0.5  # Segundos máximos que una línea INFO/DEBUG puede quedar en el buffer
+
+_listener = None
+
+
+def _detect_rank():
+    """Rank MPI a partir de las variables de entorno del lanzador (sin importar mpi4py)."""
+    for var in ("OMPI_COMM_WORLD_RANK", "PMI_RANK", "PMIX_RANK", "MV2_COMM_WORLD_RANK"):
+        if var in os.environ:
+            return int(os.environ[var])
+    return 0
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler que no hace flush en cada registro.
+
+    Vacía el stream cuando ha pasado FLUSH_INTERVAL desde el último flush o
+    cuando llega un registro de nivel WARNING o superior.
+    """
+
+    def __init__(self, stream=None, flush_interval=FLUSH_INTERVAL):
+        super().__init__(stream)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            now = time.monotonic()
+            if record.levelno >= logging.WARNING or now - self._last_flush >= self.flush_interval:
+                self.flush()
+                self._last_flush = now
+        except Exception:
+            self.handleError(record)
+
+
+def setup_logging(rank=None, level=None, asynchronous=True):
+    """
+    Configura el logger del sistema para este proceso.
+
+    Args:
+        rank: Rank MPI del proceso (por defecto, detectado del entorno)
+        level: Nivel de logging (por defecto, TSP_LOG_LEVEL o INFO)
+        asynchronous: Si True, escribe desde un hilo de fondo con buffer
+
+    Returns:
+        Logger raíz del sistema
+    """
+    global _listener
+
+    if rank is None:
+        rank = _detect_rank()
+    role = "MAESTRO" if rank == 0 else f"ESCLAVO Rank {rank}"
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level or DEFAULT_LEVEL)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    stream_handler = BufferedStreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(f"[{role}] %(message)s"))
+
+    if asynchronous:
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+    else:
+        logger.addHandler(stream_handler)
+
+    return logger
+
+
+def shutdown_logging():
+    """Escribe los mensajes pendientes y detiene el hilo de logging."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    sys.stdout.flush()
+
+
+atexit.register(shutdown_logging)
+
+
+def get_logger(name=None):
+    """
+    Retorna un logger del sistema, configurándolo con valores por defecto si hace falta.
+
+    Args:
+        name: Sufijo del logger (ej: "mpi" -> "tsp.mpi")
+
+    Returns:
+        logging.Logger
+    """
+    root = logging.getLogger(LOGGER_NAME)
+    if not root.handlers:
+        setup_logging()
+    return root.getChild(name) if name else root
+
+
+class ProgressCounter:
+    """
+    Contador de progreso con salida limitada en frecuencia.
+
+    Sustituye a los mensajes por tarea: tick() solo suma y, como mucho una
+    vez cada `interval` segundos, registra el total y la tasa.
+    """
+
+    def __init__(self, logger, label, interval=5.0, level=logging.INFO):
+        """
+        Inicializa el contador.
+
+        Args:
+            logger: Logger donde informar
+            label: Descripción de lo que se cuenta (ej: "Tareas procesadas")
+            interval: Segundos mínimos entre dos mensajes
+            level: Nivel de los mensajes de progreso
+        """
+        self.logger = logger
+        self.label = label
+        self.interval = interval
+        self.level = level
+        self.reset()
+
+    def reset(self):
+        """Reinicia el contador."""
+        self.count = 0
+        self._start = time.monotonic()
+        self._last_report = self._start
+
+    def tick(self, n=1):
+        """Suma n unidades e informa si ha pasado el intervalo."""
+        self.count += n
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            if self.logger.isEnabledFor(self.level):
+                rate = self.count / (now - self._start)
+                self.logger.log(self.level, "%s: %d (%.1f/s)", self.label, self.count, rate)
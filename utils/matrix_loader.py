@@ -1,9 +1,9 @@
 """
 Utilidades para cargar y generar matrices de distancias.
 """
+import hashlib
 import json
 import os
-import numpy as np
 from config.config import DISTANCIAS_FILE
 
 
@@ -80,30 +80,110 @@ class MatrixLoader:
             print(f"Error cargando matriz desde {filepath}: {e}")
             return None
 
+    @staticmethod
+    def load_coordinates(filepath):
+        """
+        Carga coordenadas de ciudades (instancias demasiado grandes para una matriz).
+        
+        Acepta archivos TSPLIB (sección NODE_COORD_SECTION, "id x y") y
+        archivos de texto con una ciudad por línea ("x y" o "id x y").
+        
+        Args:
+            filepath: Ruta al archivo
+            
+        Returns:
+            Array NumPy (n, 2) o None si falla
+        """
+        import numpy as np
+        
+        try:
+            coords = []
+            in_section = True
+            with open(filepath, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    keyword = line.split(':')[0].strip().upper()
+                    if keyword == 'NODE_COORD_SECTION':
+                        coords, in_section = [], True
+                        continue
+                    if keyword == 'EOF':
+                        break
+                    parts = line.split()
+                    try:
+                        values = [float(x) for x in parts]
+                    except ValueError:
+                        in_section = False  # Cabecera TSPLIB (NAME, TYPE, DIMENSION...)
+                        continue
+                    if in_section and len(values) in (2, 3):
+                        coords.append(values[-2:])
+            if len(coords) < 2:
+                print(f"Error: {filepath} no contiene coordenadas")
+                return None
+            return np.asarray(coords, dtype=float)
+        except Exception as e:
+            print(f"Error cargando coordenadas desde {filepath}: {e}")
+            return None
+
+
+def create_random_coordinates(num_cities, seed=None):
+    """
+    Crea coordenadas aleatorias en el cuadrado [0, 1000) x [0, 1000).
+    
+    Args:
+        num_cities: Número de ciudades
+        seed: Semilla para generar instancias reproducibles (opcional)
+        
+    Returns:
+        Array NumPy (num_cities, 2)
+    """
+    import numpy as np
+    
+    rng = np.random.default_rng(seed) if seed is not None else np.random
+    return rng.random((num_cities, 2)) * 1000
+
 
-def create_random_matrix(num_cities):
+def create_random_matrix(num_cities, seed=None):
     """
     Crea una matriz de distancias aleatoria.
     
     Args:
         num_cities: Número de ciudades
+        seed: Semilla para generar instancias reproducibles (opcional)
         
     Returns:
         Matriz de distancias como lista de listas
     """
+    import numpy as np
+    
     # Generar coordenadas aleatorias
-    coords = np.random.rand(num_cities, 2) * 1000
+    coords = create_random_coordinates(num_cities, seed)
     
-    # Calcular matriz de distancias euclidianas
-    matrix = np.zeros((num_cities, num_cities))
-    for i in range(num_cities):
-        for j in range(num_cities):
-            if i != j:
-                dist = np.sqrt(np.sum((coords[i] - coords[j])**2))
-                matrix[i][j] = dist
+    # Calcular matriz de distancias euclidianas (vectorizado)
+    diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+    matrix = np.sqrt(np.sum(diff ** 2, axis=-1))
     
     return matrix.tolist()
 
 
-
-
+def matrix_hash(dist_matrix):
+    """
+    Calcula un hash del contenido de una matriz de distancias.
+    
+    Dos matrices con los mismos valores producen el mismo hash aunque
+    vengan de archivos distintos (JSON, texto o generadas).
+    
+    Args:
+        dist_matrix: Matriz de distancias (lista de listas o array)
+        
+    Returns:
+        Cadena hexadecimal SHA-256
+    """
+    import numpy as np
+    
+    array = np.ascontiguousarray(dist_matrix, dtype=np.float64)
+    digest = hashlib.sha256()
+    digest.update(str(array.shape).encode())
+    digest.update(array.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,203 @@
+"""
+Utilidades para el perfilado de memoria del cluster: tracemalloc y memoria
+residente (RSS) por generación en cada rank, con informe combinado de los
+picos por rank y de los puntos del código que más memoria reservan.
+"""
+import os
+import time
+import tracemalloc
+from array import array
+
+from config.config import MEMORY_TOP_SITES, MEMORY_TRACE_FRAMES
+from utils.metrics_exporter import resident_memory_bytes
+
+
+class MemoryTracker:
+    """Muestras de memoria de un rank (una por generación o lote de tareas)."""
+
+    enabled = True
+
+    def __init__(self, top=MEMORY_TOP_SITES, frames=MEMORY_TRACE_FRAMES):
+        """
+        Args:
+            top: Puntos de reserva incluidos en el informe final
+            frames: Marcos de pila guardados por reserva (más marcos, más coste)
+        """
+        self.top = top
+        self.frames = frames
+        # Series en arrays compactos: no crecen más de 32 bytes por muestra
+        self.generations = array('q')
+        self.current = array('q')
+        self.peak = array('q')
+        self.rss = array('q')
+        self._owns_tracing = False
+
+    def start(self):
+        """Activa tracemalloc (si no estaba activo) y descarta muestras anteriores."""
+        for series in (self.generations, self.current, self.peak, self.rss):
+            del series[:]
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        tracemalloc.reset_peak()
+
+    def sample(self, generation):
+        """
+        Registra la memoria actual y el pico desde la muestra anterior.
+
+        Args:
+            generation: Generación (o número de lote en los esclavos)
+
+        Returns:
+            Diccionario current, peak y rss en bytes
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        rss = resident_memory_bytes()
+        self.generations.append(generation)
+        self.current.append(current)
+        self.peak.append(peak)
+        self.rss.append(rss)
+        return {'current': current, 'peak': peak, 'rss': rss}
+
+    def stop(self, rank, host):
+        """
+        Toma la instantánea final y detiene tracemalloc.
+
+        Args:
+            rank: Rank propietario
+            host: Host del rank
+
+        Returns:
+            MemoryReport serializable
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        sites = [{'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                  'size': stat.size, 'count': stat.count}
+                 for stat in snapshot.statistics('lineno')[:self.top]]
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        rss = resident_memory_bytes()
+        samples = list(zip(self.generations, self.current, self.peak, self.rss))
+        return MemoryReport(rank, host, {
+            'current': current,
+            'peak': max(peak, max(self.peak, default=0)),
+            'rss': rss,
+            'rss_peak': max(rss, max(self.rss, default=0)),
+            'samples': samples,
+            'sites': sites,
+        })
+
+
+class NullMemoryTracker:
+    """Versión deshabilitada: no mide nada."""
+
+    enabled = False
+
+    def start(self):
+        pass
+
+    def sample(self, generation):
+        return None
+
+    def stop(self, rank, host):
+        return None
+
+
+def create_memory_tracker(enabled=False):
+    """
+    Crea un rastreador de memoria o su versión deshabilitada.
+
+    Args:
+        enabled: Si False, retorna un rastreador sin coste
+
+    Returns:
+        MemoryTracker o NullMemoryTracker
+    """
+    return MemoryTracker() if enabled else NullMemoryTracker()
+
+
+class MemoryReport:
+    """Memoria de un rank recibida por MPI."""
+
+    def __init__(self, rank, host, data):
+        """
+        Args:
+            rank: Rank que generó el informe
+            host: Host del rank
+            data: Diccionario current, peak, rss, rss_peak, samples y sites
+        """
+        self.rank = rank
+        self.host = host
+        self.data = data
+
+    def summary(self):
+        """Resumen sin series ni puntos de reserva (para la base de datos)."""
+        return {'rank': self.rank, 'host': self.host,
+                'peak': self.data['peak'], 'rss_peak': self.data['rss_peak'],
+                'current': self.data['current'], 'rss': self.data['rss']}
+
+    def to_message(self):
+        """Diccionario serializable para enviar al maestro."""
+        return {'rank': self.rank, 'host': self.host, 'data': self.data}
+
+    @classmethod
+    def from_message(cls, message):
+        """Reconstruye el informe desde el diccionario recibido."""
+        return cls(message['rank'], message['host'], message['data'])
+
+
+def _mb(size):
+    """Bytes en MB con dos decimales."""
+    return f"{size / (1024 * 1024):.2f} MB"
+
+
+def write_memory_report(reports, output_dir):
+    """
+    Escribe el informe de memoria del cluster.
+
+    Genera un .txt con el pico de cada rank y sus principales puntos de
+    reserva, y un .csv con las muestras por generación de todos los ranks
+    (rank, generacion, actual, pico, rss; en bytes).
+
+    Args:
+        reports: Lista de MemoryReport (maestro y esclavos)
+        output_dir: Directorio donde guardar el informe
+
+    Returns:
+        Tupla (ruta_txt, ruta_csv)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    txt_path = os.path.join(output_dir, f"memory_{stamp}.txt")
+    csv_path = os.path.join(output_dir, f"memory_{stamp}.csv")
+    reports = sorted(reports, key=lambda report: report.rank)
+
+    with open(txt_path, 'w') as f:
+        f.write(f"Memoria del cluster ({len(reports)} ranks)\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(f"{'rank':>4}  {'host':<20} {'pico Python':>14} {'pico RSS':>14} {'RSS final':>14}\n")
+        for report in reports:
+            data = report.data
+            f.write(f"{report.rank:>4}  {str(report.host or 'local'):<20} {_mb(data['peak']):>14} "
+                    f"{_mb(data['rss_peak']):>14} {_mb(data['rss']):>14}\n")
+
+        for report in reports:
+            f.write("\n" + "=" * 80 + "\n")
+            f.write(f"RANK {report.rank}@{report.host or 'local'}: puntos de reserva vivos al final\n")
+            for site in report.data['sites']:
+                f.write(f"{_mb(site['size']):>12} {site['count']:>9} bloques  {site['site']}\n")
+
+    with open(csv_path, 'w') as f:
+        f.write("rank,generacion,actual,pico,rss\n")
+        for report in reports:
+            for generation, current, peak, rss in report.data['samples']:
+                f.write(f"{report.rank},{generation},{current},{peak},{rss}\n")
+
+    return txt_path, csv_path
@@ -0,0 +1,391 @@
+"""
+Exportador de métricas en vivo de las ejecuciones.
+
+Publica el estado de la ejecución en curso (generación, fitness, evaluaciones/s,
+utilización por rank, aciertos de la caché y memoria) en formato de texto de
+Prometheus por un servidor HTTP local (/metrics y /metrics.json) y/o en un
+archivo JSON que se reescribe periódicamente, pensado para ejecuciones sin
+interfaz.
+
+Las actualizaciones desde el bucle generacional solo guardan valores en un
+diccionario bajo un cerrojo; el formateo y la E/S se hacen en hilos propios.
+"""
+import json
+import os
+import threading
+import time
+
+from config.config import METRICS_HOST, METRICS_PORT, METRICS_SNAPSHOT_FILE, METRICS_SNAPSHOT_INTERVAL
+from utils.logger import get_logger
+
+logger = get_logger("metrics")
+
+# Métricas publicadas: nombre -> (tipo de Prometheus, descripción)
+METRICS = {
+    'tsp_run_active': ('gauge', 'Hay una ejecución del AG en curso (1) o no (0)'),
+    'tsp_runs_completed_total': ('counter', 'Ejecuciones del AG completadas'),
+    'tsp_generation': ('gauge', 'Generación actual de la ejecución en curso'),
+    'tsp_generations_planned': ('gauge', 'Generaciones totales de la ejecución en curso'),
+    'tsp_num_cities': ('gauge', 'Ciudades de la instancia en curso'),
+    'tsp_best_distance': ('gauge', 'Mejor distancia de la generación actual'),
+    'tsp_avg_distance': ('gauge', 'Distancia media de la población actual'),
+    'tsp_last_best_distance': ('gauge', 'Mejor distancia de la última ejecución completada'),
+    'tsp_last_run_seconds': ('gauge', 'Duración de la última ejecución completada'),
+    'tsp_evaluations_total': ('counter', 'Evaluaciones de fitness realizadas'),
+    'tsp_evaluations_per_second': ('gauge', 'Evaluaciones por segundo desde la última actualización'),
+    'tsp_mpi_messages_total': ('gauge', 'Mensajes MPI de la ejecución (último resumen)'),
+    'tsp_mpi_bytes_total': ('gauge', 'Bytes MPI enviados en la ejecución (último resumen)'),
+    'tsp_slave_utilization': ('gauge', 'Fracción del tiempo ocupado de los esclavos (último resumen)'),
+    'tsp_rank_utilization': ('gauge', 'Fracción del tiempo ocupado de cada rank (último resumen)'),
+    'tsp_rank_tasks': ('gauge', 'Tareas atendidas por cada rank (último resumen)'),
+    'tsp_run_cache_hits': ('gauge', 'Aciertos de la caché de resultados'),
+    'tsp_run_cache_misses': ('gauge', 'Fallos de la caché de resultados'),
+    'tsp_run_cache_hit_ratio': ('gauge', 'Tasa de aciertos de la caché de resultados'),
+    'tsp_job_generation': ('gauge', 'Generación actual de cada trabajo del planificador'),
+    'tsp_job_best_distance': ('gauge', 'Mejor distancia de cada trabajo del planificador'),
+    'tsp_jobs_completed_total': ('counter', 'Trabajos del planificador completados'),
+    'tsp_jobs_failed_total': ('counter', 'Trabajos del planificador fallidos'),
+    'tsp_process_resident_memory_bytes': ('gauge', 'Memoria residente del proceso maestro'),
+    'tsp_last_update_timestamp_seconds': ('gauge', 'Instante (epoch) de la última actualización'),
+}
+
+
+def resident_memory_bytes():
+    """
+    Memoria residente actual del proceso.
+
+    Returns:
+        Bytes de /proc/self/statm o, si no existe, el pico de getrusage
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _escape(value):
+    """Escapa el valor de una etiqueta del formato de texto de Prometheus."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsExporter:
+    """
+    Registro de métricas con servidor HTTP y archivo de instantáneas opcionales.
+
+    Los métodos observe_* se llaman desde el hilo del AG o del planificador
+    y nunca hacen E/S.
+    """
+
+    enabled = True
+
+    def __init__(self, port=None, snapshot_file=None, interval=METRICS_SNAPSHOT_INTERVAL, host=METRICS_HOST):
+        """
+        Inicializa el exportador (sin arrancar hilos, ver start).
+
+        Args:
+            port: Puerto HTTP (None o 0: sin servidor)
+            snapshot_file: Archivo JSON de instantáneas (None: sin archivo)
+            interval: Segundos entre instantáneas del archivo
+            host: Dirección en la que escucha el servidor
+        """
+        self.port = port
+        self.snapshot_file = snapshot_file
+        self.interval = interval
+        self.host = host
+        self._lock = threading.Lock()
+        self._values = {}  # (nombre, etiquetas) -> valor
+        self._rate_base = None  # (instante, evaluaciones) de la última generación
+        self._server = None
+        self._stop = threading.Event()
+        self._writer = None
+
+    # --- Registro ---
+
+    def _set(self, name, value, labels=()):
+        """Asigna una métrica (con el cerrojo tomado)."""
+        self._values[(name, labels)] = value
+
+    def _inc(self, name, amount=1, labels=()):
+        """Incrementa un contador (con el cerrojo tomado)."""
+        key = (name, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def _touch(self):
+        """Marca el instante de la última actualización (con el cerrojo tomado)."""
+        self._set('tsp_last_update_timestamp_seconds', time.time())
+
+    # --- Fuentes ---
+
+    def observe_run_start(self, num_generations, num_cities):
+        """Inicio de una ejecución del AG."""
+        with self._lock:
+            self._set('tsp_run_active', 1)
+            self._set('tsp_generation', 0)
+            self._set('tsp_generations_planned', num_generations)
+            self._set('tsp_num_cities', num_cities)
+            self._rate_base = None
+            self._touch()
+
+    def observe_generation(self, generation, best, avg, evaluations):
+        """
+        Fin de una generación (llamado desde el callback del AG).
+
+        Args:
+            generation: Número de generación
+            best: Mejor distancia de la generación
+            avg: Distancia media de la población
+            evaluations: Evaluaciones acumuladas en la ejecución
+        """
+        now = time.perf_counter()
+        with self._lock:
+            if self._rate_base is not None:
+                last_time, last_evaluations = self._rate_base
+                self._inc('tsp_evaluations_total', evaluations - last_evaluations)
+                if now > last_time:
+                    self._set('tsp_evaluations_per_second', (evaluations - last_evaluations) / (now - last_time))
+            else:
+                self._inc('tsp_evaluations_total', evaluations)
+            self._rate_base = (now, evaluations)
+            self._set('tsp_generation', generation)
+            self._set('tsp_best_distance', best)
+            self._set('tsp_avg_distance', avg)
+            self._touch()
+
+    def observe_run_end(self, best_distance, total_time):
+        """Fin de una ejecución del AG."""
+        with self._lock:
+            self._set('tsp_run_active', 0)
+            self._inc('tsp_runs_completed_total')
+            self._set('tsp_last_best_distance', best_distance)
+            self._set('tsp_last_run_seconds', total_time)
+            self._touch()
+
+    def observe_cluster(self, summary):
+        """
+        Resumen de métricas MPI (ver summarize_cluster).
+
+        Args:
+            summary: Resultado de summarize_cluster o None
+        """
+        if not summary:
+            return
+        with self._lock:
+            self._set('tsp_mpi_messages_total', summary['messages'])
+            self._set('tsp_mpi_bytes_total', summary['bytes'])
+            if summary['slave_utilization'] is not None:
+                self._set('tsp_slave_utilization', summary['slave_utilization'])
+            for entry in summary['ranks']:
+                labels = (('rank', entry['rank']), ('host', entry['host']))
+                busy, idle = entry['busy_time'], entry['idle_time']
+                if busy + idle > 0:
+                    self._set('tsp_rank_utilization', busy / (busy + idle), labels)
+                self._set('tsp_rank_tasks', entry['tasks'], labels)
+            self._touch()
+
+    def observe_cache(self, run_cache):
+        """
+        Estado de la caché de resultados.
+
+        Args:
+            run_cache: RunCache o None
+        """
+        if run_cache is None:
+            return
+        with self._lock:
+            self._set('tsp_run_cache_hits', run_cache.hits)
+            self._set('tsp_run_cache_misses', run_cache.misses)
+            hit_rate = run_cache.hit_rate()
+            if hit_rate is not None:
+                self._set('tsp_run_cache_hit_ratio', hit_rate)
+            self._touch()
+
+    def observe_job(self, job_id, generation, best, num_generations):
+        """Progreso de un trabajo (misma firma que on_progress del planificador)."""
+        labels = (('job', job_id),)
+        with self._lock:
+            self._set('tsp_job_generation', generation, labels)
+            self._set('tsp_job_best_distance', best, labels)
+            self._touch()
+
+    def observe_job_result(self, job, result):
+        """Resultado de un trabajo (misma firma que on_result del planificador)."""
+        labels = (('job', job['job_id']),)
+        with self._lock:
+            if 'error' in result:
+                self._inc('tsp_jobs_failed_total')
+            else:
+                self._inc('tsp_jobs_completed_total')
+                self._set('tsp_job_best_distance', result['best_distance'], labels)
+            self._touch()
+
+    # --- Salidas ---
+
+    def _collect(self):
+        """Copia de los valores con la memoria residente actualizada."""
+        memory = resident_memory_bytes()
+        with self._lock:
+            self._set('tsp_process_resident_memory_bytes', memory)
+            return dict(self._values)
+
+    def render(self):
+        """
+        Métricas en formato de texto de Prometheus (versión 0.0.4).
+
+        Returns:
+            Texto con HELP, TYPE y una línea por serie
+        """
+        values = self._collect()
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            series = [(labels, value) for (metric, labels), value in values.items() if metric == name]
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series, key=lambda item: str(item[0])):
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """
+        Métricas como diccionario serializable.
+
+        Returns:
+            Diccionario nombre -> valor, o lista de {etiquetas..., value} si tiene etiquetas
+        """
+        result = {}
+        for (name, labels), value in sorted(self._collect().items(), key=lambda item: str(item[0])):
+            if labels:
+                result.setdefault(name, []).append(dict(labels, value=value))
+            else:
+                result[name] = value
+        return result
+
+    def write_snapshot(self):
+        """Reescribe el archivo de instantáneas de forma atómica."""
+        tmp_path = f"{self.snapshot_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=1)
+        os.replace(tmp_path, self.snapshot_file)
+
+    def _snapshot_loop(self):
+        """Hilo del archivo de instantáneas."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.write_snapshot()
+            except OSError as e:
+                logger.warning("No se pudo escribir %s: %s", self.snapshot_file, e)
+
+    def _start_server(self):
+        """Arranca el servidor HTTP en un hilo demonio."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = exporter.render(), 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(exporter.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug("%s %s", self.address_string(), format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info("Métricas en http://%s:%d/metrics", self.host, self._server.server_address[1])
+
+    def start(self):
+        """
+        Arranca el servidor HTTP y el hilo de instantáneas configurados.
+
+        Returns:
+            El propio exportador
+        """
+        if self.port:
+            try:
+                self._start_server()
+            except OSError as e:
+                logger.warning("No se pudo abrir el puerto de métricas %d: %s", self.port, e)
+        if self.snapshot_file:
+            self._writer = threading.Thread(target=self._snapshot_loop, name="metrics-snapshot", daemon=True)
+            self._writer.start()
+            logger.info("Métricas en %s (cada %g s)", self.snapshot_file, self.interval)
+        return self
+
+    def close(self):
+        """Detiene los hilos y escribe la instantánea final."""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+            try:
+                self.write_snapshot()
+            except OSError as e:
+                logger.warning("No se pudo escribir %s: %s", self.snapshot_file, e)
+
+
+class NullMetricsExporter:
+    """Exportador deshabilitado: mismos métodos, sin coste."""
+
+    enabled = False
+
+    def observe_run_start(self, num_generations, num_cities):
+        pass
+
+    def observe_generation(self, generation, best, avg, evaluations):
+        pass
+
+    def observe_run_end(self, best_distance, total_time):
+        pass
+
+    def observe_cluster(self, summary):
+        pass
+
+    def observe_cache(self, run_cache):
+        pass
+
+    def observe_job(self, job_id, generation, best, num_generations):
+        pass
+
+    def observe_job_result(self, job, result):
+        pass
+
+    def close(self):
+        pass
+
+
+def create_metrics_exporter(port=METRICS_PORT, snapshot_file=METRICS_SNAPSHOT_FILE):
+    """
+    Crea y arranca el exportador configurado, o su versión deshabilitada.
+
+    Args:
+        port: Puerto HTTP (0: sin servidor)
+        snapshot_file: Archivo JSON de instantáneas (None: sin archivo)
+
+    Returns:
+        MetricsExporter arrancado o NullMetricsExporter si no hay ninguna salida
+    """
+    if not port and not snapshot_file:
+        return NullMetricsExporter()
+    return MetricsExporter(port, snapshot_file).start()
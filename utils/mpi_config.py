@@ -58,6 +58,49 @@ class MPIConfig:
             print(f"[ERROR] Error generando hostfile local: {e}")
             return None
     
+    @staticmethod
+    def generate_hybrid_hostfile(node_names, hostfile_path="mpi_hostfile_hybrid"):
+        """
+        Genera un hostfile para el modo híbrido: un rank esclavo por nodo.
+        
+        El primer nodo tiene dos slots (maestro y su esclavo); el resto, uno.
+        Cada esclavo usa después todos los núcleos de su nodo con hilos.
+        
+        Args:
+            node_names: Nombres de los nodos (en el orden del hostfile original)
+            hostfile_path: Ruta donde guardar el hostfile
+            
+        Returns:
+            Ruta al archivo hostfile generado o None si falla
+        """
+        try:
+            with open(hostfile_path, 'w') as f:
+                for index, node_name in enumerate(node_names):
+                    f.write(f"{node_name} slots={2 if index == 0 else 1}\n")
+            
+            print(f"[INFO] Hostfile híbrido generado: {hostfile_path} "
+                  f"({len(node_names)} nodos, {len(node_names) + 1} procesos)")
+            return hostfile_path
+        except Exception as e:
+            print(f"[ERROR] Error generando hostfile híbrido: {e}")
+            return None
+    
+    @staticmethod
+    def hybrid_mpirun_args():
+        """
+        Argumentos de mpirun para el modo híbrido.
+        
+        Sin enlazar cada rank a un núcleo (los hilos deben poder usar todo el
+        nodo) y exportando la configuración a los nodos remotos.
+        
+        Returns:
+            Lista de argumentos
+        """
+        args = ["--bind-to", "none", "-x", "TSP_MPI_HYBRID=1"]
+        if os.getenv("TSP_MPI_THREADS"):
+            args += ["-x", "TSP_MPI_THREADS"]
+        return args
+    
     @staticmethod
     def get_total_processes(num_nodes, cores_per_node):
         """
@@ -92,14 +135,19 @@ class MPIConfig:
             
             with open(hostfile_path, 'r') as f:
                 for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            node_name = parts[0]
-                            slots = int(parts[1].split('=')[1])
-                            total_slots += slots
-                            nodes.append({'name': node_name, 'slots': slots})
+                    # Ignorar comentarios (líneas completas o al final de la línea)
+                    line = line.split('#', 1)[0].strip()
+                    if not line:
+                        continue
+                    parts = line.split()
+                    node_name, _, slots = parts[0].partition(':')  # Formato MPICH: host:slots
+                    slots = int(slots) if slots else 1  # Sin 'slots=', Open MPI asigna 1
+                    for option in parts[1:]:
+                        key, _, value = option.partition('=')
+                        if key == 'slots':
+                            slots = int(value)
+                    total_slots += slots
+                    nodes.append({'name': node_name, 'slots': slots})
             
             return {
                 'total_slots': total_slots,
@@ -0,0 +1,133 @@
+"""
+Utilidades para medir el tiempo de cada fase del bucle generacional.
+"""
+import csv
+import time
+
+# Fases instrumentadas en GeneticAlgorithmTSP.run, en orden de ejecución
+PHASES = ('init', 'select', 'clone', 'mate', 'mutate', 'evaluate',
+          'replace', 'hof', 'stats', 'callback')
+
+
+class PhaseTimer:
+    """
+    Acumula tiempos por fase con perf_counter_ns.
+
+    Cada llamada a lap(fase) asigna a esa fase el tiempo transcurrido desde
+    la marca anterior, así que una generación cuesta una lectura de reloj
+    por fase.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        """Inicializa el temporizador."""
+        self._last = 0
+        self._current = {}
+        self.totals = dict.fromkeys(PHASES, 0)
+
+    def start(self):
+        """Marca el inicio de una generación."""
+        self._current = {}
+        self._last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        """
+        Asigna a la fase el tiempo transcurrido desde la marca anterior.
+
+        Args:
+            phase: Nombre de la fase (ver PHASES)
+        """
+        now = time.perf_counter_ns()
+        self._current[phase] = self._current.get(phase, 0) + now - self._last
+        self._last = now
+
+    def snapshot(self):
+        """
+        Retorna los tiempos acumulados de la generación en curso.
+
+        Returns:
+            Diccionario fase -> segundos, con 'total' como suma de las fases
+        """
+        timings = {phase: ns / 1e9 for phase, ns in self._current.items()}
+        timings['total'] = sum(self._current.values()) / 1e9
+        return timings
+
+    def stop(self):
+        """
+        Cierra la generación en curso y la suma a los totales del run.
+
+        Returns:
+            Diccionario fase -> segundos de la generación
+        """
+        for phase, ns in self._current.items():
+            self.totals[phase] = self.totals.get(phase, 0) + ns
+        return self.snapshot()
+
+    def summary(self):
+        """
+        Retorna los totales del run por fase.
+
+        Returns:
+            Diccionario fase -> segundos acumulados
+        """
+        return {phase: ns / 1e9 for phase, ns in self.totals.items()}
+
+
+class NullPhaseTimer:
+    """Temporizador deshabilitado: mismos métodos, sin coste de medición."""
+
+    enabled = False
+
+    def start(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def snapshot(self):
+        return None
+
+    def stop(self):
+        return None
+
+    def summary(self):
+        return {}
+
+
+def create_phase_timer(enabled=True):
+    """
+    Crea un temporizador de fases o su versión deshabilitada.
+
+    Args:
+        enabled: Si False, retorna un temporizador sin coste
+
+    Returns:
+        PhaseTimer o NullPhaseTimer
+    """
+    return PhaseTimer() if enabled else NullPhaseTimer()
+
+
+def export_timings_csv(stats_list, filepath):
+    """
+    Exporta los tiempos por fase de cada generación a un archivo CSV.
+
+    Args:
+        stats_list: Estadísticas retornadas por GeneticAlgorithmTSP.run
+        filepath: Ruta del CSV a escribir
+
+    Returns:
+        Número de generaciones exportadas
+    """
+    columns = list(PHASES) + ['total']
+    rows = 0
+    with open(filepath, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['generation'] + columns)
+        for entry in stats_list:
+            timings = entry.get('timings')
+            if not timings:
+                continue
+            writer.writerow([entry['generation']] + [f"{timings.get(col, 0.0):.9f}" for col in columns])
+            rows += 1
+    return rows
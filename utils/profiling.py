@@ -0,0 +1,127 @@
+"""
+Utilidades para el perfilado del cluster: combina los perfiles cProfile
+de todos los ranks en un único informe.
+"""
+import io
+import os
+import pstats
+import time
+
+
+class RankProfile:
+    """
+    Perfil de un rank recibido por MPI.
+
+    pstats.Stats acepta cualquier objeto con create_stats() y el atributo
+    stats, así que este envoltorio permite cargar el diccionario recibido.
+    """
+
+    def __init__(self, rank, host, stats):
+        """
+        Inicializa el perfil.
+
+        Args:
+            rank: Rank que generó el perfil
+            host: Host del rank
+            stats: Diccionario de cProfile.Profile.stats
+        """
+        self.rank = rank
+        self.host = host
+        self.stats = stats
+
+    def create_stats(self):
+        """Los datos ya están creados (requerido por pstats)."""
+
+    @classmethod
+    def from_profiler(cls, profiler, rank, host):
+        """
+        Construye el perfil a partir de un cProfile.Profile detenido.
+
+        Args:
+            profiler: cProfile.Profile
+            rank: Rank propietario
+            host: Host del rank
+
+        Returns:
+            RankProfile serializable
+        """
+        profiler.create_stats()
+        return cls(rank, host, profiler.stats)
+
+    def to_message(self):
+        """Diccionario serializable para enviar al maestro."""
+        return {'rank': self.rank, 'host': self.host, 'stats': self.stats}
+
+    @classmethod
+    def from_message(cls, message):
+        """Reconstruye el perfil desde el diccionario recibido."""
+        return cls(message['rank'], message['host'], message['stats'])
+
+
+def merge_profiles(profiles):
+    """
+    Combina varios perfiles en un único pstats.Stats.
+
+    Args:
+        profiles: Lista de RankProfile
+
+    Returns:
+        pstats.Stats con la suma de todos los perfiles
+    """
+    merged = pstats.Stats()
+    for profile in profiles:
+        # pstats vacía el diccionario del objeto al cargarlo; se pasa una copia
+        merged.add(RankProfile(profile.rank, profile.host, dict(profile.stats)))
+    return merged
+
+
+def _format_stats(stats, sort_key, limit):
+    """Texto de las funciones más costosas de un pstats.Stats."""
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(sort_key).print_stats(limit)
+    return stream.getvalue()
+
+
+def write_cluster_report(profiles, output_dir, sort_key='cumulative', limit=25):
+    """
+    Escribe el informe de perfilado del cluster.
+
+    Genera un .prof con el perfil combinado (abrible con pstats o snakeviz)
+    y un .txt con el top global y el desglose por host.
+
+    Args:
+        profiles: Lista de RankProfile (maestro y esclavos)
+        output_dir: Directorio donde guardar el informe
+        sort_key: Criterio de ordenación de pstats
+        limit: Número de funciones por sección
+
+    Returns:
+        Tupla (ruta_prof, ruta_txt)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    prof_path = os.path.join(output_dir, f"cluster_{stamp}.prof")
+    txt_path = os.path.join(output_dir, f"cluster_{stamp}.txt")
+
+    merged = merge_profiles(profiles)
+    merged.dump_stats(prof_path)
+
+    by_host = {}
+    for profile in profiles:
+        by_host.setdefault(profile.host or "local", []).append(profile)
+
+    with open(txt_path, 'w') as f:
+        ranks = ", ".join(f"{p.rank}@{p.host}" for p in sorted(profiles, key=lambda p: p.rank))
+        f.write(f"Perfil del cluster ({len(profiles)} ranks: {ranks})\n")
+        f.write("=" * 80 + "\n\n")
+        f.write("GLOBAL\n")
+        f.write(_format_stats(merged, sort_key, limit))
+
+        for host, host_profiles in sorted(by_host.items()):
+            rank_list = ", ".join(str(p.rank) for p in sorted(host_profiles, key=lambda p: p.rank))
+            f.write("\n" + "=" * 80 + "\n")
+            f.write(f"HOST {host} (ranks {rank_list})\n")
+            f.write(_format_stats(merge_profiles(host_profiles), sort_key, limit))
+
+    return prof_path, txt_path
@@ -0,0 +1,24 @@
+"""
+Utilidades: Seeds
+Semillas independientes derivadas de una semilla base, compartidas por los
+arranques de un portafolio, las configuraciones de un barrido y las cadenas
+de la búsqueda local iterada.
+"""
+
+
+def spawn_seeds(seed, count):
+    """
+    Deriva semillas independientes de una semilla base.
+
+    Usa numpy SeedSequence.spawn, de modo que cada arranque tiene su propio
+    flujo aleatorio y el conjunto es reproducible a partir de la semilla base.
+
+    Args:
+        seed: Semilla base
+        count: Número de semillas
+
+    Returns:
+        Lista de enteros
+    """
+    import numpy as np
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
@@ -0,0 +1,210 @@
+"""
+Estadísticas por generación en un archivo columnar de solo añadido.
+
+Formato: cabecera con MAGIC, longitud (uint32) y JSON con los campos y
+metadatos, rellenada hasta múltiplo de 8 bytes; después, registros de ancho
+fijo (un dtype estructurado de NumPy, todos los campos en float64 salvo la
+generación). El escritor acumula registros en un bloque y lo vuelca entero,
+así que la memoria no crece con el número de generaciones; el lector mapea
+el archivo en memoria (np.memmap) e ignora un registro final incompleto.
+"""
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from config.config import STATS_STREAM_BLOCK, STATS_MAX_POINTS
+from utils.phase_timer import PHASES
+
+MAGIC = b"TSPSTAT1"
+
+# Campos de cada generación (además de 'generation')
+BASE_FIELDS = ('best', 'worst', 'avg', 'std', 'elapsed')
+
+# Tasas escalares del modo adaptativo (ver models/adaptive_operators.py)
+OPERATOR_FIELDS = ('crossover_rate', 'mutation_rate', 'tournament_size')
+
+
+def stats_fields(timings=False, operators=False):
+    """
+    Campos de registro según la instrumentación activa.
+
+    Args:
+        timings: Incluir tiempos por fase (columnas t_<fase> y t_total)
+        operators: Incluir las tasas del modo adaptativo (columnas op_<tasa>)
+
+    Returns:
+        Tupla de nombres de campo (sin 'generation')
+    """
+    fields = BASE_FIELDS
+    if timings:
+        fields += tuple(f"t_{phase}" for phase in PHASES + ('total',))
+    if operators:
+        fields += tuple(f"op_{name}" for name in OPERATOR_FIELDS)
+    return fields
+
+
+def _dtype(fields):
+    """dtype estructurado de un registro."""
+    return np.dtype([('generation', '<i8')] + [(name, '<f8') for name in fields])
+
+
+class StatsStreamWriter:
+    """Escritor por bloques de estadísticas por generación."""
+
+    def __init__(self, path, fields=BASE_FIELDS, metadata=None, block_size=STATS_STREAM_BLOCK):
+        """
+        Crea el archivo y escribe la cabecera.
+
+        Args:
+            path: Ruta del archivo (se sobrescribe)
+            fields: Campos de cada registro (ver stats_fields)
+            metadata: Diccionario serializable guardado en la cabecera (parámetros, instancia...)
+            block_size: Registros por bloque volcado a disco
+        """
+        self.path = path
+        self.fields = tuple(fields)
+        self.dtype = _dtype(self.fields)
+        self._block = np.zeros(block_size, dtype=self.dtype)
+        self._used = 0
+        self.count = 0
+        self._start = time.perf_counter()
+
+        header = json.dumps({'fields': self.fields, 'metadata': metadata or {}}).encode('utf-8')
+        padding = -(len(MAGIC) + 4 + len(header)) % 8
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + struct.pack('<I', len(header) + padding) + header + b' ' * padding)
+
+    def append(self, entry):
+        """
+        Añade el registro de una generación.
+
+        Args:
+            entry: Diccionario como los de stats_list (generation, best, ...,
+                   timings y operators opcionales). Si no trae 'elapsed', se
+                   usan los segundos desde la creación del escritor
+        """
+        row = self._block[self._used]
+        row['generation'] = entry['generation']
+        timings = entry.get('timings') or {}
+        operators = entry.get('operators') or {}
+        for name in self.fields:
+            if name.startswith('t_'):
+                value = timings.get(name[2:], 0.0)
+            elif name.startswith('op_'):
+                value = operators.get(name[3:], np.nan)
+            elif name == 'elapsed':
+                value = entry.get('elapsed', time.perf_counter() - self._start)
+            else:
+                value = entry.get(name, np.nan)
+            row[name] = value
+        self._used += 1
+        self.count += 1
+        if self._used == len(self._block):
+            self.flush()
+
+    def flush(self):
+        """Vuelca al archivo los registros del bloque en curso."""
+        if self._used:
+            self._file.write(self._block[:self._used].tobytes())
+            self._file.flush()
+            self._used = 0
+
+    def close(self):
+        """Vuelca lo pendiente y cierra el archivo."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+class StatsStream:
+    """Lectura de un archivo de estadísticas mapeado en memoria."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Archivo escrito por StatsStreamWriter
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} no es un archivo de estadísticas")
+            (header_size,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_size).decode('utf-8'))
+        self.path = path
+        self.fields = tuple(header['fields'])
+        self.metadata = header['metadata']
+        self.dtype = _dtype(self.fields)
+        offset = len(MAGIC) + 4 + header_size
+        count = (os.path.getsize(path) - offset) // self.dtype.itemsize
+        self.records = (np.memmap(path, dtype=self.dtype, mode='r', offset=offset, shape=(count,))
+                        if count else np.zeros(0, dtype=self.dtype))
+
+    def __len__(self):
+        return len(self.records)
+
+    def column(self, name):
+        """Columna completa (vista del memmap, sin copiar)."""
+        return self.records[name]
+
+    def downsample(self, max_points=STATS_MAX_POINTS):
+        """
+        Reduce el número de registros agrupando generaciones consecutivas.
+
+        En cada grupo se conserva la generación y el tiempo del último
+        registro, el mínimo de 'best', el máximo de 'worst' (la envolvente
+        de la gráfica) y la media del resto de campos.
+
+        Args:
+            max_points: Registros máximos del resultado
+
+        Returns:
+            Array estructurado con como mucho max_points registros
+        """
+        count = len(self.records)
+        if count <= max_points:
+            return np.array(self.records)
+        starts = np.linspace(0, count, max_points, endpoint=False).astype(np.int64)
+        ends = np.append(starts[1:], count) - 1
+        sizes = np.diff(np.append(starts, count))
+        result = np.zeros(max_points, dtype=self.dtype)
+        for name in ('generation',) + self.fields:
+            values = self.records[name]
+            if name in ('generation', 'elapsed'):
+                result[name] = values[ends]
+            elif name == 'best':
+                result[name] = np.minimum.reduceat(values, starts)
+            elif name == 'worst':
+                result[name] = np.maximum.reduceat(values, starts)
+            else:
+                result[name] = np.add.reduceat(values, starts) / sizes
+        return result
+
+    def to_entries(self, max_points=STATS_MAX_POINTS):
+        """
+        Registros (reducidos) como diccionarios de stats_list.
+
+        Returns:
+            Lista de diccionarios con generation, best, worst, avg, std, elapsed
+            y, si se registraron, timings y operators
+        """
+        entries = []
+        for record in self.downsample(max_points).tolist():
+            values = dict(zip(('generation',) + self.fields, record))
+            entry = {name: values.pop(name) for name in ('generation',) + BASE_FIELDS if name in values}
+            timings = {name[2:]: value for name, value in values.items() if name.startswith('t_')}
+            operators = {name[3:]: value for name, value in values.items() if name.startswith('op_')}
+            if timings:
+                entry['timings'] = timings
+            if operators:
+                entry['operators'] = operators
+            entries.append(entry)
+        return entries
+
+
+def load_stats(path):
+    """Abre un archivo de estadísticas (ver StatsStream)."""
+    return StatsStream(path)
@@ -6,8 +6,26 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import deque
 import threading
 
+from config.config import (CROSSOVER_OPERATOR, ADAPTIVE_OPERATORS, STATS_MAX_POINTS, AUTOTUNE_ENABLED,
+                           REPLACEMENT_STRATEGY, REPLACEMENT_ELITES)
+
+# Refresco de la interfaz durante una ejecución
+MAX_FPS = 10             # Máximo de redibujados de la gráfica por segundo
+TABLE_MAX_ROWS = 500     # Filas visibles en la tabla de estadísticas (las más recientes)
+
+# Motores de resolución: etiqueta -> valor de params['engine']
+ENGINES = {"Algoritmo genético": "ga", "Búsqueda local iterada": "ils", "Descomposición espacial": "decomp"}
+
+# Operadores de recombinación: etiqueta -> valor de params['crossover_operator']
+CROSSOVER_OPERATORS = {"Orden (OX)": "ox", "Aristas (ERX)": "erx", "Ensamblado de aristas (EAX)": "eax"}
+
+# Estrategias de reemplazo: etiqueta -> valor de params['replacement']
+REPLACEMENT_STRATEGIES = {"Generacional": "generational", "Elitista": "elitist", "(μ+λ)": "plus",
+                          "(μ,λ)": "comma", "Por edad": "age"}
+
 
 class MainWindow:
     """Ventana principal de la aplicación."""
@@ -29,10 +47,21 @@ class MainWindow:
         # Variables de estado
         self.is_running = False
         
-        # Datos para gráfica
+        # Datos para gráfica: como mucho STATS_MAX_POINTS puntos; cada punto agrupa
+        # _plot_stride generaciones (mínimo del mejor, máximo del peor)
         self.generations_data = []
         self.best_fitness_data = []
         self.worst_fitness_data = []
+        self._plot_stride = 1
+        self._plot_last_count = 0
+        
+        # Progreso publicado por el hilo del algoritmo y pendiente de dibujar
+        self._pending_lock = threading.Lock()
+        self._pending_progress = []
+        self._total_generations = 1
+        self._refresh_job = None
+        self._plot_background = None
+        self._table_rows = deque()
         
         # Crear interfaz
         self._create_ui()
@@ -87,6 +116,14 @@ class MainWindow:
                 font=("", 11, "bold")).grid(row=row, column=0, columnspan=2, pady=5)
         row += 1
         
+        # Motor de resolución (en la búsqueda local, las generaciones son rondas de perturbaciones)
+        tk.Label(parent, text="🌷 Motor:", bg="#FFB6C1", fg="#8B008B",
+                font=("", 10)).grid(row=row, column=0, sticky="w", pady=5)
+        self.engine_var = tk.StringVar(value=next(iter(ENGINES)))
+        ttk.Combobox(parent, textvariable=self.engine_var, values=list(ENGINES), state="readonly",
+                     width=20).grid(row=row, column=1, pady=5)
+        row += 1
+        
         # Tamaño de población
         tk.Label(parent, text="🌹 Tamaño de población:", bg="#FFB6C1", fg="#8B008B",
                 font=("", 10)).grid(row=row, column=0, sticky="w", pady=5)
@@ -109,6 +146,34 @@ class MainWindow:
         self.crossover_label.grid(row=row, column=2, padx=5, pady=5)
         row += 1
         
+        # Operador de recombinación
+        tk.Label(parent, text="🌻 Recombinación:", bg="#FFB6C1", fg="#8B008B",
+                font=("", 10)).grid(row=row, column=0, sticky="w", pady=5)
+        default_operator = next((label for label, value in CROSSOVER_OPERATORS.items()
+                                 if value == CROSSOVER_OPERATOR), next(iter(CROSSOVER_OPERATORS)))
+        self.crossover_operator_var = tk.StringVar(value=default_operator)
+        ttk.Combobox(parent, textvariable=self.crossover_operator_var, values=list(CROSSOVER_OPERATORS),
+                     state="readonly", width=20).grid(row=row, column=1, pady=5)
+        row += 1
+        
+        # Estrategia de reemplazo (selección de supervivientes)
+        tk.Label(parent, text="🌻 Reemplazo:", bg="#FFB6C1", fg="#8B008B",
+                font=("", 10)).grid(row=row, column=0, sticky="w", pady=5)
+        default_replacement = next((label for label, value in REPLACEMENT_STRATEGIES.items()
+                                    if value == REPLACEMENT_STRATEGY), next(iter(REPLACEMENT_STRATEGIES)))
+        self.replacement_var = tk.StringVar(value=default_replacement)
+        ttk.Combobox(parent, textvariable=self.replacement_var, values=list(REPLACEMENT_STRATEGIES),
+                     state="readonly", width=20).grid(row=row, column=1, pady=5)
+        row += 1
+        
+        # Padres conservados con reemplazo elitista
+        tk.Label(parent, text="🌻 Élites:", bg="#FFB6C1", fg="#8B008B",
+                font=("", 10)).grid(row=row, column=0, sticky="w", pady=5)
+        self.elites_var = tk.StringVar(value=str(REPLACEMENT_ELITES))
+        ttk.Spinbox(parent, from_=0, to=100, increment=1,
+                    textvariable=self.elites_var, width=10).grid(row=row, column=1, pady=5)
+        row += 1
+        
         # Probabilidad de mutación
         tk.Label(parent, text="🌼 Prob. Mutación:", bg="#FFB6C1", fg="#8B008B",
                 font=("", 10)).grid(row=row, column=0, sticky="w", pady=5)
@@ -131,6 +196,49 @@ class MainWindow:
         generations_entry.grid(row=row, column=1, pady=5)
         row += 1
         
+        # Operadores, tasas y torneo elegidos durante la ejecución (ignora los valores de arriba)
+        self.adaptive_var = tk.BooleanVar(value=ADAPTIVE_OPERATORS)
+        tk.Checkbutton(parent, text="🌷 Operadores adaptativos", variable=self.adaptive_var,
+                       bg="#FFB6C1", fg="#8B008B", font=("", 10)).grid(row=row, column=0, columnspan=2,
+                                                                       sticky="w", pady=5)
+        row += 1
+        
+        # Tiempos por fase en la tabla de estadísticas
+        self.show_timings_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(parent, text="🌷 Mostrar tiempos por fase", variable=self.show_timings_var,
+                       bg="#FFB6C1", fg="#8B008B", font=("", 10),
+                       command=self._update_stats_columns).grid(row=row, column=0, columnspan=2,
+                                                               sticky="w", pady=5)
+        row += 1
+        
+        # Sembrar la población con rutas guardadas de la misma matriz
+        self.warm_start_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(parent, text="🌼 Arranque en caliente", variable=self.warm_start_var,
+                       bg="#FFB6C1", fg="#8B008B", font=("", 10)).grid(row=row, column=0, columnspan=2,
+                                                                       sticky="w", pady=5)
+        row += 1
+        
+        # Ignorar la caché de resultados
+        self.force_recompute_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(parent, text="🌼 Forzar recálculo", variable=self.force_recompute_var,
+                       bg="#FFB6C1", fg="#8B008B", font=("", 10)).grid(row=row, column=0, columnspan=2,
+                                                                       sticky="w", pady=5)
+        row += 1
+        
+        # Perfilado de todos los ranks con cProfile
+        self.profile_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(parent, text="🌻 Perfilar cluster (cProfile)", variable=self.profile_var,
+                       bg="#FFB6C1", fg="#8B008B", font=("", 10)).grid(row=row, column=0, columnspan=2,
+                                                                       sticky="w", pady=5)
+        row += 1
+        
+        # Memoria por generación en todos los ranks (tracemalloc y RSS)
+        self.memory_profile_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(parent, text="🌻 Perfilar memoria (tracemalloc)", variable=self.memory_profile_var,
+                       bg="#FFB6C1", fg="#8B008B", font=("", 10)).grid(row=row, column=0, columnspan=2,
+                                                                       sticky="w", pady=5)
+        row += 1
+        
         # Separador
         tk.Frame(parent, bg="#FF69B4", height=2).grid(row=row, column=0, columnspan=2, sticky="ew", pady=15)
         row += 1
@@ -166,6 +274,12 @@ class MainWindow:
                                                font=("", 9, "italic"))
         self.total_processes_label.grid(row=2, column=0, columnspan=2, pady=5)
         
+        # Elegir serie, pool o MPI, esclavos y rutas por mensaje con micro-benchmarks
+        self.autotune_var = tk.BooleanVar(value=AUTOTUNE_ENABLED)
+        tk.Checkbutton(cluster_config_frame, text="🌼 Autoajustar backend y reparto", variable=self.autotune_var,
+                       bg="#FFB6C1", fg="#8B008B", font=("", 10)).grid(row=3, column=0, columnspan=2,
+                                                                       sticky="w", pady=5)
+        
         # Actualizar etiqueta cuando cambien los valores
         num_nodes_entry.config(command=self._update_total_processes)
         cores_per_node_entry.config(command=self._update_total_processes)
@@ -184,6 +298,27 @@ class MainWindow:
         self.execute_btn.grid(row=row, column=0, columnspan=2, pady=10, sticky="ew")
         row += 1
         
+        # Encolar en el planificador de trabajos concurrentes
+        ttk.Button(parent, text="🌷 Encolar Trabajo 🌷", command=self._on_enqueue).grid(
+            row=row, column=0, columnspan=2, pady=(0, 10), sticky="ew")
+        row += 1
+        
+        # Trabajos encolados y su progreso
+        jobs_frame = tk.LabelFrame(parent, text="🌷 Trabajos 🌷",
+                                   bg="#FFB6C1", fg="#8B008B",
+                                   font=("", 10, "bold"), padx=10, pady=10,
+                                   relief="raised", bd=3)
+        jobs_frame.grid(row=row, column=0, columnspan=2, pady=10, sticky="ew")
+        row += 1
+        
+        job_columns = ("trabajo", "estado", "ranks", "gen", "mejor")
+        self.jobs_table = ttk.Treeview(jobs_frame, columns=job_columns, show="headings", height=5)
+        for col, title, width in zip(job_columns, ("Trabajo", "Estado", "Ranks", "Gen.", "Mejor"),
+                                     (70, 80, 45, 70, 80)):
+            self.jobs_table.heading(col, text=title)
+            self.jobs_table.column(col, width=width, anchor="center")
+        self.jobs_table.pack(fill="x")
+        
         # Información del cluster
         cluster_frame = tk.LabelFrame(parent, text="🌺 Información del Cluster 🌺", 
                                      bg="#FFB6C1", fg="#8B008B", 
@@ -253,7 +388,13 @@ class MainWindow:
         self.ax.tick_params(colors='#8B008B')
         self.ax.grid(True, alpha=0.3, color='#FF69B4')
         
+        # Líneas persistentes: se actualizan con set_data y se dibujan por blitting
+        self.best_line, = self.ax.plot([], [], color='#FF1493', label="Mejor", linewidth=2, animated=True)
+        self.worst_line, = self.ax.plot([], [], color='#FF69B4', label="Peor", linewidth=2, animated=True)
+        self.ax.legend(facecolor='#FFE4E1', edgecolor='#FF69B4')
+        
         self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
         self.canvas.draw()
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
         
@@ -294,7 +435,7 @@ class MainWindow:
         stats_frame.grid(row=1, column=0, sticky="ew", pady=5)
         stats_frame.grid_columnconfigure(0, weight=1)
         
-        columns = ("gen", "mejor", "peor", "promedio", "desv")
+        columns = ("gen", "mejor", "peor", "promedio", "desv", "t_eval", "t_gen")
         self.stats_table = ttk.Treeview(stats_frame, columns=columns, show="headings", height=10)
         
         for col in columns:
@@ -306,6 +447,9 @@ class MainWindow:
         self.stats_table.heading("peor", text="Peor")
         self.stats_table.heading("promedio", text="Promedio")
         self.stats_table.heading("desv", text="Desv. Est.")
+        self.stats_table.heading("t_eval", text="Evaluación (ms)")
+        self.stats_table.heading("t_gen", text="Generación (ms)")
+        self._update_stats_columns()
         
         scrollbar = ttk.Scrollbar(stats_frame, orient="vertical", command=self.stats_table.yview)
         self.stats_table.configure(yscrollcommand=scrollbar.set)
@@ -313,6 +457,13 @@ class MainWindow:
         self.stats_table.grid(row=0, column=0, sticky="ew")
         scrollbar.grid(row=0, column=1, sticky="ns")
     
+    def _update_stats_columns(self):
+        """Muestra u oculta las columnas de tiempos por fase de la tabla."""
+        columns = ("gen", "mejor", "peor", "promedio", "desv")
+        if self.show_timings_var.get():
+            columns += ("t_eval", "t_gen")
+        self.stats_table.configure(displaycolumns=columns)
+    
     def _load_matrix(self):
         """Carga una matriz de distancias desde archivo."""
         filepath = filedialog.askopenfilename(
@@ -322,21 +473,35 @@ class MainWindow:
         if filepath:
             self.controller.load_matrix(filepath)
     
-    def _on_execute(self):
-        """Maneja el evento de ejecutar algoritmo."""
-        if self.is_running:
-            return
-        
-        # Obtener parámetros
-        params = {
+    def _collect_params(self):
+        """Parámetros del algoritmo según el panel de configuración."""
+        return {
             'num_cities': int(self.num_cities_var.get()),
             'pop_size': int(self.pop_size_var.get()),
             'crossover_rate': self.crossover_var.get(),
             'mutation_rate': self.mutation_var.get(),
             'generations': int(self.generations_var.get()),
+            'engine': ENGINES[self.engine_var.get()],
+            'crossover_operator': CROSSOVER_OPERATORS[self.crossover_operator_var.get()],
+            'adaptive': self.adaptive_var.get(),
+            'replacement': REPLACEMENT_STRATEGIES[self.replacement_var.get()],
+            'elites': int(self.elites_var.get()),
             'num_nodes': int(self.num_nodes_var.get()),
-            'cores_per_node': int(self.cores_per_node_var.get())
+            'cores_per_node': int(self.cores_per_node_var.get()),
+            'autotune': self.autotune_var.get(),
+            'profile': self.profile_var.get(),
+            'memory_profile': self.memory_profile_var.get(),
+            'force_recompute': self.force_recompute_var.get(),
+            'warm_start': self.warm_start_var.get()
         }
+    
+    def _on_execute(self):
+        """Maneja el evento de ejecutar algoritmo."""
+        if self.is_running:
+            return
+        
+        # Obtener parámetros
+        params = self._collect_params()
         
         # Limpiar resultados anteriores
         self.clear_results()
@@ -347,30 +512,74 @@ class MainWindow:
         
         thread = threading.Thread(target=self.controller.execute_algorithm, args=(params,), daemon=True)
         thread.start()
+        self.start_refresh()
+    
+    def _on_enqueue(self):
+        """Encola la configuración actual como trabajo del planificador."""
+        self.controller.enqueue_job(self._collect_params())
+    
+    def add_job(self, job_id, num_cities):
+        """
+        Añade un trabajo encolado a la tabla de trabajos.
+        
+        Args:
+            job_id: Identificador del trabajo
+            num_cities: Número de ciudades de su matriz
+        """
+        self.jobs_table.insert("", "end", iid=job_id, values=(job_id, "En cola", "-", "-", f"{num_cities} c."))
+    
+    def update_job(self, job_id, generation, total_generations, best):
+        """Actualiza el progreso de un trabajo en ejecución."""
+        if self.jobs_table.exists(job_id):
+            self.jobs_table.set(job_id, "estado", "Ejecutando")
+            self.jobs_table.set(job_id, "gen", f"{generation}/{total_generations}")
+            self.jobs_table.set(job_id, "mejor", f"{best:.2f}")
+    
+    def finish_job(self, job_id, result):
+        """
+        Marca un trabajo como terminado.
+        
+        Args:
+            job_id: Identificador del trabajo
+            result: Resultado del planificador (best_distance, ranks o error)
+        """
+        if not self.jobs_table.exists(job_id):
+            return
+        if 'error' in result:
+            self.jobs_table.set(job_id, "estado", "Error")
+            return
+        self.jobs_table.set(job_id, "estado", "Terminado")
+        self.jobs_table.set(job_id, "ranks", result.get('ranks', 1))
+        self.jobs_table.set(job_id, "mejor", f"{result['best_distance']:.2f}")
     
     def clear_results(self):
         """Limpia los resultados anteriores."""
+        self._stop_refresh()
+        with self._pending_lock:
+            self._pending_progress.clear()
         self.generations_data.clear()
         self.best_fitness_data.clear()
         self.worst_fitness_data.clear()
+        self._plot_stride = 1
+        self._plot_last_count = 0
         self.stats_table.delete(*self.stats_table.get_children())
+        self._table_rows.clear()
         self.solution_text.config(state="normal")
         self.solution_text.delete("1.0", tk.END)
         self.solution_text.config(state="disabled")
         self.time_label.config(text="0.00 s", bg="#FFB6C1", fg="#8B008B")
         self.progress_var.set(0.0)
-        self.ax.clear()
-        self.ax.set_facecolor('#FFF0F5')
-        self.ax.set_title("Evolución de la Aptitud", color='#8B008B', fontweight='bold')
-        self.ax.set_xlabel("Generación", color='#8B008B')
-        self.ax.set_ylabel("Distancia", color='#8B008B')
-        self.ax.tick_params(colors='#8B008B')
-        self.ax.grid(True, alpha=0.3, color='#FF69B4')
+        self.best_line.set_data([], [])
+        self.worst_line.set_data([], [])
         self.canvas.draw()
     
-    def update_progress(self, generation, best, worst, avg, std_dev, total_generations):
+    def post_progress(self, generation, best, worst, avg, std_dev, total_generations, timings=None):
         """
-        Actualiza el progreso del algoritmo.
+        Publica el progreso de una generación (seguro desde el hilo del algoritmo).
+        
+        Solo encola los datos: el hilo de la interfaz los dibuja en bloque como
+        mucho MAX_FPS veces por segundo, así que la cola de eventos de Tk no
+        crece con el número de generaciones.
         
         Args:
             generation: Número de generación actual
@@ -379,41 +588,124 @@ class MainWindow:
             avg: Promedio de fitness
             std_dev: Desviación estándar
             total_generations: Total de generaciones
+            timings: Tiempos por fase de la generación en segundos (opcional)
         """
-        # Actualizar progreso
-        progress = min(generation / total_generations, 1.0)
-        self.progress_var.set(progress)
+        with self._pending_lock:
+            self._pending_progress.append((generation, best, worst, avg, std_dev, timings))
+            self._total_generations = total_generations
+    
+    def start_refresh(self):
+        """Inicia el refresco periódico de la gráfica y la tabla."""
+        if self._refresh_job is None:
+            self._refresh_job = self.root.after(1000 // MAX_FPS, self._refresh)
+    
+    def _stop_refresh(self):
+        """Detiene el refresco periódico."""
+        if self._refresh_job is not None:
+            self.root.after_cancel(self._refresh_job)
+            self._refresh_job = None
+    
+    def _refresh(self):
+        """Dibuja el progreso pendiente y reprograma el siguiente refresco."""
+        self._refresh_job = None
+        self.update_progress()
+        self.start_refresh()
+    
+    def update_progress(self):
+        """Dibuja todo el progreso pendiente (hilo de la interfaz)."""
+        with self._pending_lock:
+            pending = self._pending_progress
+            self._pending_progress = []
+            total_generations = self._total_generations
+        if not pending:
+            return
+        
+        # Actualizar progreso con el último estado
+        last_generation = pending[-1][0]
+        self.progress_var.set(min(last_generation / total_generations, 1.0))
         
         # Agregar datos para gráfica
-        self.generations_data.append(generation)
-        self.best_fitness_data.append(best)
-        self.worst_fitness_data.append(worst)
-        
-        # Actualizar tabla
-        self.stats_table.insert("", "end", values=(
-            f"{generation}",
-            f"{best:.2f}",
-            f"{worst:.2f}",
-            f"{avg:.2f}",
-            f"{std_dev:.2f}"
-        ))
-        self.stats_table.see(self.stats_table.get_children()[-1])
+        for generation, best, worst, _, _, _ in pending:
+            self._add_plot_point(generation, best, worst)
+        
+        # Actualizar tabla (solo las últimas TABLE_MAX_ROWS filas)
+        for generation, best, worst, avg, std_dev, timings in pending[-TABLE_MAX_ROWS:]:
+            t_eval = f"{timings.get('evaluate', 0.0) * 1000:.2f}" if timings else "-"
+            t_gen = f"{timings['total'] * 1000:.2f}" if timings else "-"
+            self._table_rows.append(self.stats_table.insert("", "end", values=(
+                f"{generation}",
+                f"{best:.2f}",
+                f"{worst:.2f}",
+                f"{avg:.2f}",
+                f"{std_dev:.2f}",
+                t_eval,
+                t_gen
+            )))
+        while len(self._table_rows) > TABLE_MAX_ROWS:
+            self.stats_table.delete(self._table_rows.popleft())
+        self.stats_table.see(self._table_rows[-1])
         
         # Actualizar gráfica
-        self.ax.clear()
-        self.ax.set_facecolor('#FFF0F5')
-        if len(self.generations_data) > 0:
-            self.ax.plot(self.generations_data, self.best_fitness_data, color='#FF1493', 
-                        label="Mejor", linewidth=2)
-            self.ax.plot(self.generations_data, self.worst_fitness_data, color='#FF69B4', 
-                        label="Peor", linewidth=2)
-            self.ax.legend(facecolor='#FFE4E1', edgecolor='#FF69B4')
-        self.ax.set_title("Evolución de la Aptitud", color='#8B008B', fontweight='bold')
-        self.ax.set_xlabel("Generación", color='#8B008B')
-        self.ax.set_ylabel("Distancia", color='#8B008B')
-        self.ax.tick_params(colors='#8B008B')
-        self.ax.grid(True, alpha=0.3, color='#FF69B4')
-        self.canvas.draw()
+        self.best_line.set_data(self.generations_data, self.best_fitness_data)
+        self.worst_line.set_data(self.generations_data, self.worst_fitness_data)
+        self._redraw_plot(total_generations)
+    
+    def _add_plot_point(self, generation, best, worst):
+        """
+        Añade una generación a los datos de la gráfica sin superar STATS_MAX_POINTS.
+        
+        Mientras el último punto agrupe menos de _plot_stride generaciones, la
+        nueva se funde con él; al llenarse la gráfica, los puntos se funden de
+        dos en dos y el paso se duplica.
+        """
+        if self.generations_data and self._plot_last_count < self._plot_stride:
+            self.generations_data[-1] = generation
+            self.best_fitness_data[-1] = min(self.best_fitness_data[-1], best)
+            self.worst_fitness_data[-1] = max(self.worst_fitness_data[-1], worst)
+            self._plot_last_count += 1
+        else:
+            self.generations_data.append(generation)
+            self.best_fitness_data.append(best)
+            self.worst_fitness_data.append(worst)
+            self._plot_last_count = 1
+        
+        if len(self.generations_data) > STATS_MAX_POINTS:
+            if len(self.generations_data) % 2 == 0:
+                self._plot_last_count += self._plot_stride
+            generations, best_data, worst_data = self.generations_data, self.best_fitness_data, self.worst_fitness_data
+            self.generations_data = [generations[min(i + 1, len(generations) - 1)] for i in range(0, len(generations), 2)]
+            self.best_fitness_data = [min(best_data[i:i + 2]) for i in range(0, len(best_data), 2)]
+            self.worst_fitness_data = [max(worst_data[i:i + 2]) for i in range(0, len(worst_data), 2)]
+            self._plot_stride *= 2
+    
+    def _redraw_plot(self, total_generations):
+        """
+        Redibuja las líneas con blitting; solo redibuja la figura completa
+        cuando los datos salen de los límites actuales de los ejes.
+        """
+        x_max = max(total_generations, self.generations_data[-1])
+        y_low = min(self.best_fitness_data)
+        y_high = max(self.worst_fitness_data)
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        
+        if self._plot_background is None or x1 < x_max or y_low < y0 or y_high > y1:
+            margin = (y_high - y_low) * 0.05 or 1.0
+            self.ax.set_xlim(0, x_max)
+            self.ax.set_ylim(y_low - margin, y_high + margin)
+            self.canvas.draw()  # _on_canvas_draw guarda el fondo y dibuja las líneas
+            return
+        
+        self.canvas.restore_region(self._plot_background)
+        self.ax.draw_artist(self.best_line)
+        self.ax.draw_artist(self.worst_line)
+        self.canvas.blit(self.ax.bbox)
+    
+    def _on_canvas_draw(self, event):
+        """Tras un dibujado completo, guarda el fondo y superpone las líneas animadas."""
+        self._plot_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.best_line)
+        self.ax.draw_artist(self.worst_line)
+        self.canvas.blit(self.ax.bbox)
     
     def show_final_results(self, best_route, best_distance, total_time):
         """
@@ -424,6 +716,10 @@ class MainWindow:
             best_distance: Mejor distancia encontrada
             total_time: Tiempo total de ejecución
         """
+        # Dibujar el progreso que quede pendiente y detener el refresco
+        self._stop_refresh()
+        self.update_progress()
+        
         # Actualizar tiempo
         self.time_label.config(text=f"{total_time:.2f} s", bg="#FFB6C1", fg="#8B008B")
         
@@ -451,6 +747,7 @@ class MainWindow:
     
     def show_error(self, message):
         """Muestra un mensaje de error."""
+        self._stop_refresh()
         tk.messagebox.showerror("Error", message)
         self.is_running = False
         self.execute_btn.config(state="normal", text="🌸 Ejecutar Algoritmo 🌸")